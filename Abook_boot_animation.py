@@ -1,8 +1,7 @@
 import pygame
 import sys
 import os
-import random
-import math
+from particles import ParticleField, ease_in_out_cubic, ease_out_quad
 
 DISPLAY_WIDTH = 600
 DISPLAY_HEIGHT = 1024
@@ -70,17 +69,6 @@ LETTERS = {
 }
 
 
-def ease_in_out_cubic(t):
-    if t < 0.5:
-        return 4 * t * t * t
-    else:
-        return 1 - pow(-2 * t + 2, 3) / 2
-
-
-def ease_out_quad(t):
-    return 1 - (1 - t) * (1 - t)
-
-
 def generate_text_positions(word, scale=5, letter_spacing=10):
     positions = []
     x_offset = 0
@@ -125,40 +113,6 @@ def generate_text_positions(word, scale=5, letter_spacing=10):
     return centered_positions
 
 
-class Particle:
-    def __init__(self, start_pos, target_pos):
-        self.start_x = start_pos[0]
-        self.start_y = start_pos[1]
-        self.target_x = target_pos[0]
-        self.target_y = target_pos[1]
-        self.x = self.start_x
-        self.y = self.start_y
-        
-        angle = random.uniform(0, 2 * math.pi)
-        distance = random.uniform(100, 300)
-        self.disperse_x = self.target_x + math.cos(angle) * distance
-        self.disperse_y = self.target_y + math.sin(angle) * distance
-    
-    def update(self, elapsed_time):
-        if elapsed_time < FORMATION_DURATION:
-            t = elapsed_time / FORMATION_DURATION
-            t = ease_in_out_cubic(t)
-            self.x = self.start_x + (self.target_x - self.start_x) * t
-            self.y = self.start_y + (self.target_y - self.start_y) * t
-        elif elapsed_time < FORMATION_DURATION + HOLD_DURATION:
-            self.x = self.target_x
-            self.y = self.target_y
-        else:
-            t = (elapsed_time - FORMATION_DURATION - HOLD_DURATION) / DISPERSE_DURATION
-            t = min(t, 1.0)
-            t = ease_out_quad(t)
-            self.x = self.target_x + (self.disperse_x - self.target_x) * t
-            self.y = self.target_y + (self.disperse_y - self.target_y) * t
-    
-    def draw(self, surface):
-        pygame.draw.circle(surface, PARTICLE_COLOR, (int(self.x), int(self.y)), PARTICLE_SIZE)
-
-
 class BootAnimation:
     def __init__(self):
         pygame.init()
@@ -182,12 +136,12 @@ class BootAnimation:
         if not target_positions:
             target_positions = [(DISPLAY_WIDTH / 2, DISPLAY_HEIGHT / 2)]
         
-        self.particles = []
-        for i in range(NUM_PARTICLES):
-            start_x = random.uniform(0, DISPLAY_WIDTH)
-            start_y = random.uniform(0, DISPLAY_HEIGHT)
-            target_pos = target_positions[i % len(target_positions)]
-            self.particles.append(Particle((start_x, start_y), target_pos))
+        self.particles = ParticleField(
+            target_positions, count=NUM_PARTICLES, radius=PARTICLE_SIZE,
+            area=(DISPLAY_WIDTH, DISPLAY_HEIGHT), disperse_distance=(100, 300),
+            color=PARTICLE_COLOR, formation=FORMATION_DURATION,
+            hold=HOLD_DURATION, disperse=DISPERSE_DURATION,
+            formation_ease=ease_in_out_cubic, disperse_ease=ease_out_quad)
     
     def run(self):
         running = True
@@ -203,9 +157,8 @@ class BootAnimation:
             
             self.screen.fill(BACKGROUND_COLOR)
             
-            for particle in self.particles:
-                particle.update(elapsed_time)
-                particle.draw(self.screen)
+            self.particles.update(elapsed_time)
+            self.particles.draw(self.screen)
             
             pygame.display.flip()
             self.clock.tick(FPS)
@@ -1,5 +1,7 @@
 import pygame
 import os
+from history import History, RegionEdit
+from session_log import get_event_source, tick
 
 # ---------------- CONFIG ----------------
 WIDTH, HEIGHT = 600, 900
@@ -15,7 +17,6 @@ UI_BORDER = (100, 100, 100)
 LINE_GAP = 40
 PEN_RADIUS = 3
 ERASER_RADIUS = 15
-MAX_UNDO = 20
 # ----------------------------------------
 
 
@@ -33,7 +34,9 @@ class PaperAnswerScreen:
         self.writing = False
         self.erase_mode = False
         self.last_pos = None
-        self.undo_stack = []
+        self.pointer = None  # last pen position from motion events
+        self.history = History()
+        self.stroke_edit = None
 
         self.font = pygame.font.SysFont("arial", 14)
 
@@ -60,10 +63,13 @@ class PaperAnswerScreen:
             )
 
     # ---------------- Undo ----------------
-    def save_undo(self):
-        self.undo_stack.append(self.ink_layer.copy())
-        if len(self.undo_stack) > MAX_UNDO:
-            self.undo_stack.pop(0)
+    def begin_stroke(self):
+        self.stroke_edit = RegionEdit(self.ink_layer, "Stroke")
+
+    def end_stroke(self):
+        edit, self.stroke_edit = self.stroke_edit, None
+        if edit and edit.finish():
+            self.history.push(edit)
 
     # ---------------- Drawing ----------------
     def draw_smooth_line(self, surface, color, start, end, radius):
@@ -71,6 +77,13 @@ class PaperAnswerScreen:
         dy = end[1] - start[1]
         distance = int(max(abs(dx), abs(dy)))
 
+        if self.stroke_edit:
+            # Save only the pixels this segment can change
+            x0, y0 = min(start[0], end[0]), min(start[1], end[1])
+            self.stroke_edit.touch(pygame.Rect(
+                x0 - radius - 1, y0 - radius - 1,
+                abs(dx) + 2 * radius + 3, abs(dy) + 2 * radius + 3))
+
         if distance == 0:
             pygame.draw.circle(surface, color, start, radius)
             return
@@ -106,7 +119,7 @@ class PaperAnswerScreen:
 
     def load_page(self):
         self.ink_layer.fill((0, 0, 0, 0))
-        self.undo_stack.clear()
+        self.history = History()
         if os.path.exists(self.page_path()):
             img = pygame.image.load(self.page_path())
             self.ink_layer.blit(img, (0, 0))
@@ -114,7 +127,7 @@ class PaperAnswerScreen:
     # ---------------- Main Loop ----------------
     def run(self):
         while self.running:
-            self.clock.tick(FPS)
+            tick(self.clock, FPS)
             self.screen.fill(PAPER_COLOR)
 
             # Sidebar
@@ -135,7 +148,7 @@ class PaperAnswerScreen:
             self.screen.blit(self.paper_bg, (SIDEBAR_WIDTH, 0))
             self.screen.blit(self.ink_layer, (SIDEBAR_WIDTH, 0))
 
-            for event in pygame.event.get():
+            for event in get_event_source().get():
                 if event.type == pygame.QUIT:
                     self.save_page()
                     self.running = False
@@ -150,8 +163,7 @@ class PaperAnswerScreen:
                         self.erase_mode = True
 
                     elif undo_btn.collidepoint(mx, my):
-                        if self.undo_stack:
-                            self.ink_layer.blit(self.undo_stack.pop(), (0, 0))
+                        self.history.undo(None)
 
                     elif prev_btn.collidepoint(mx, my):
                         if self.page_no > 1:
@@ -169,16 +181,21 @@ class PaperAnswerScreen:
                         self.running = False
 
                     elif mx > SIDEBAR_WIDTH:
-                        self.save_undo()
+                        self.begin_stroke()
                         self.writing = True
                         self.last_pos = (mx - SIDEBAR_WIDTH, my)
+                        self.pointer = event.pos
+
+                elif event.type == pygame.MOUSEMOTION:
+                    self.pointer = event.pos
 
                 elif event.type == pygame.MOUSEBUTTONUP:
                     self.writing = False
                     self.last_pos = None
+                    self.end_stroke()
 
-            if self.writing:
-                mx, my = pygame.mouse.get_pos()
+            if self.writing and self.pointer:
+                mx, my = self.pointer
                 if mx > SIDEBAR_WIDTH:
                     cur = (mx - SIDEBAR_WIDTH, my)
                     if self.erase_mode:
@@ -194,3 +211,4 @@ class PaperAnswerScreen:
                     self.last_pos = cur
 
             pygame.display.flip()
+            get_event_source().view("answer")
@@ -2,6 +2,13 @@ import pygame
 import sys
 import os
 
+# The undo history and session log are ABook's own (repository root);
+# set up here, at the entry point, before paper_answer imports them
+ABOOK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if ABOOK_ROOT not in sys.path:
+    sys.path.append(ABOOK_ROOT)
+
+from session_log import get_event_source, configure_session, tick
 from exam_db import get_connection
 from paper_answer import PaperAnswerScreen
 
@@ -100,7 +107,7 @@ class ExamCodeEntry:
 
     def run(self):
         while self.running:
-            for event in pygame.event.get():
+            for event in get_event_source().get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -108,7 +115,8 @@ class ExamCodeEntry:
                     self.handle_key(event.key)
 
             self.draw()
-            self.clock.tick(30)
+            get_event_source().view("exam_code")
+            tick(self.clock, 30)
 
         return self.exam_id, self.conn
 
@@ -197,7 +205,7 @@ class StudentDetailsScreen:
 
     def run(self):
         while self.running:
-            for e in pygame.event.get():
+            for e in get_event_source().get():
                 if e.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -205,7 +213,8 @@ class StudentDetailsScreen:
                     self.handle_key(e.key, e.unicode)
 
             self.draw()
-            self.clock.tick(30)
+            get_event_source().view("student_details")
+            tick(self.clock, 30)
 
         return self.student_id
 
@@ -259,7 +268,7 @@ class SignatureScreen:
         while self.running:
             clear_btn, ok_btn = self.draw()
 
-            for e in pygame.event.get():
+            for e in get_event_source().get():
                 if e.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -293,13 +302,23 @@ class SignatureScreen:
                         pygame.draw.line(self.canvas, TEXT_BLACK, last_pos, pos, 3)
                     last_pos = pos
 
-            self.clock.tick(FPS)
+            get_event_source().view("signature")
+            tick(self.clock, FPS)
 
 
 # =========================================================
 # ENTRY POINT
 # =========================================================
 def run():
+    import argparse
+    parser = argparse.ArgumentParser(description="ABook exam flow")
+    parser.add_argument('--record', metavar='FILE', help="record the input session to FILE")
+    parser.add_argument('--replay', metavar='FILE', help="replay a recorded input session")
+    parser.add_argument('--fast', action='store_true', help="replay as fast as possible")
+    args = parser.parse_args()
+    if args.record or args.replay:
+        configure_session(args.record, args.replay, args.fast)
+
     pygame.init()
     pygame.mouse.set_visible(False)
 
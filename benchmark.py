@@ -0,0 +1,481 @@
+"""
+Headless benchmark for ABook
+Runs ABookApp under SDL's dummy video driver, replays scripted input
+sessions (or ones recorded with main.py --record) through the app's own
+event handling, and reports frame times,
+operation latency, peak RSS and allocations as JSON.
+
+    python benchmark.py                    # run everything, print JSON
+    python benchmark.py --save-baseline    # store the results as the baseline
+    python benchmark.py --compare          # exit 1 if slower than the baseline
+    python benchmark.py -s strokes -s scroll
+    python benchmark.py --epaper           # add simulated e-paper refresh counts
+    python benchmark.py --session run.absl # replay a recorded session (main.py --record)
+"""
+import os
+
+# Must be set before pygame creates a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import math
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+
+BASELINE_FILE = os.path.join(ROOT, 'benchmark_baseline.json')
+TOLERANCE = 0.25     # Allowed slowdown before a metric counts as a regression
+MIN_DELTA_MS = 1.0   # Ignore differences smaller than this (timer noise)
+
+SAMPLES_PER_FRAME = 8  # Motion events per frame while drawing (~480 Hz pen at 60 FPS)
+FRAME_S = 1 / 60       # Scripted time per frame (e-paper refresh rate limiting)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process, or None if unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def summarize(seconds):
+    """Percentiles (ms) of a list of durations in seconds"""
+    if not seconds:
+        return {'count': 0}
+    ms = sorted(s * 1000 for s in seconds)
+
+    def pct(p):
+        return round(ms[min(len(ms) - 1, int(round(p / 100 * (len(ms) - 1))))], 3)
+
+    return {
+        'count': len(ms),
+        'mean_ms': round(sum(ms) / len(ms), 3),
+        'p50_ms': pct(50),
+        'p90_ms': pct(90),
+        'p99_ms': pct(99),
+        'max_ms': round(ms[-1], 3),
+    }
+
+
+class Skip(Exception):
+    """Raised by a scenario that cannot run here (missing dependency)"""
+
+
+class Bench:
+    """Drives one ABookApp and collects timings"""
+
+    def __init__(self, app):
+        self.app = app
+        self.frames = []   # frame durations of the current scenario
+        self.ops = {}      # operation name -> [seconds]
+        self.now = 0.0     # scripted time, FRAME_S per frame
+
+    # ---- input ----
+    def _lpos(self, pos):
+        return self.app.display.transform.to_landscape(pos)
+
+    def down(self, pos):
+        return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=self._lpos(pos), button=1)
+
+    def move(self, pos):
+        return pygame.event.Event(pygame.MOUSEMOTION, pos=self._lpos(pos), rel=(0, 0), buttons=(1, 0, 0))
+
+    def up(self, pos):
+        return pygame.event.Event(pygame.MOUSEBUTTONUP, pos=self._lpos(pos), button=1)
+
+    def wheel(self, y):
+        return pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=y, flipped=False)
+
+    def key(self, key, mod=0):
+        return pygame.event.Event(pygame.KEYDOWN, key=key, mod=mod, unicode='', scancode=0)
+
+    # ---- frames ----
+    def frame(self, events=(), op=None):
+        """Handle events and render one frame, like one pass of ABookApp.run"""
+        start = time.perf_counter()
+        for event in events:
+            self.app.handle_event(event)
+        self.app.update_frame()
+        self.app.draw_frame()
+        self.app.present_frame(self.app.view_state())
+        elapsed = time.perf_counter() - start
+        self.frames.append(elapsed)
+        self.now += FRAME_S
+        if op:
+            self.ops.setdefault(op, []).append(elapsed)
+
+        # Work done after the frame is shown (timed on its own)
+        start = time.perf_counter()
+        if self.app.idle_work():
+            self.ops.setdefault('idle_work', []).append(time.perf_counter() - start)
+
+    def click(self, pos, op=None):
+        self.frame([self.down(pos), self.up(pos)], op)
+
+    @contextlib.contextmanager
+    def op(self, name):
+        start = time.perf_counter()
+        yield
+        self.ops.setdefault(name, []).append(time.perf_counter() - start)
+
+    def stroke(self, center, radius=60, samples=64):
+        """
+        A looping pen stroke, SAMPLES_PER_FRAME motion events per frame
+        It ends where it started so it is not taken for a swipe gesture.
+        """
+        cx, cy = center
+        points = [(int(cx + radius * math.cos(2 * math.pi * i / samples)),
+                   int(cy + radius * 0.6 * math.sin(4 * math.pi * i / samples)))
+                  for i in range(samples + 1)]
+        self.frame([self.down(points[0])])
+        for i in range(1, len(points), SAMPLES_PER_FRAME):
+            self.frame([self.move(p) for p in points[i:i + SAMPLES_PER_FRAME]])
+        self.frame([self.up(points[-1])], op='pen_up')
+
+    def open_notebook(self, idx=0):
+        app = self.app
+        app.is_locked = False
+        app.active_notebook_idx = idx
+        app.active_layer_idx = 0
+        app.current_view = 'notepad'
+        self.frame()
+
+
+# ---- scenarios ----
+def scenario_lock(b):
+    """Idle lock screen"""
+    b.app.is_locked = True
+    for _ in range(30):
+        b.frame()
+
+
+def scenario_home(b):
+    """Home screen"""
+    b.app.is_locked = False
+    b.app.current_view = 'home'
+    for _ in range(30):
+        b.frame()
+
+
+def scenario_strokes(b):
+    """Pen strokes on a blank notebook"""
+    b.open_notebook()
+    for i in range(20):
+        b.stroke((200 + (i % 3) * 120, 200 + (i // 3) * 110))
+
+
+def scenario_highlighter(b):
+    """Highlighter strokes (scratch mask compositing)"""
+    b.open_notebook()
+    b.app.notepad_view.select_tool('highlighter')
+    for i in range(10):
+        b.stroke((250 + (i % 2) * 150, 250 + (i // 2) * 130), radius=70)
+    b.app.notepad_view.select_tool('pen')
+
+
+def scenario_scroll(b):
+    """Scrolling the notepad canvas"""
+    b.open_notebook()
+    for _ in range(40):
+        b.frame([b.wheel(-1)])
+    for _ in range(40):
+        b.frame([b.wheel(1)])
+
+
+def scenario_layers(b):
+    """Add layers, draw on each, flatten, undo and redo"""
+    b.open_notebook()
+    nv = b.app.notepad_view
+    for i in range(4):
+        nv.show_layer_menu = True
+        b.frame()
+        b.click(nv.add_layer_btn.center, op='add_layer')
+        nv.show_layer_menu = False
+        b.stroke((220 + i * 60, 400 + i * 90))
+    nv.show_layer_menu = True
+    b.frame()
+    b.click(nv.merge_all_btn.center, op='flatten')
+    nv.show_layer_menu = False
+    for _ in range(3):
+        b.frame([b.key(pygame.K_z, pygame.KMOD_LCTRL)], op='undo')
+    for _ in range(3):
+        b.frame([b.key(pygame.K_y, pygame.KMOD_LCTRL)], op='redo')
+
+
+def scenario_templates(b):
+    """Switching page templates"""
+    from templates import TEMPLATES
+    b.open_notebook()
+    for _ in range(2):
+        for template in TEMPLATES:
+            with b.op('apply_template'):
+                b.app.apply_template(template.name)
+            b.frame()
+
+
+def scenario_book(b):
+    """Opening and scrolling a built-in book (lazily painted pages)"""
+    books = [i for i, nb in enumerate(b.app.notebooks) if nb.folder == 'books']
+    if not books:
+        raise Skip("no sample books")
+    with b.op('open_book'):
+        b.open_notebook(books[0])
+    for _ in range(20):
+        b.frame([b.wheel(-1)])
+
+
+def scenario_reader(b):
+    """Reflowable books: opening (a short and a large one), page turns, text size"""
+    from book_reader import Book
+    from sample_books import SAMPLE_BOOKS, book_markdown
+    books = [nb for nb in b.app.notebooks if isinstance(nb, Book)]
+    if not books:
+        raise Skip("no reflowable books")
+    b.app.is_locked = False
+    nv = b.app.reader_view
+    large = Book("Large", book_markdown(SAMPLE_BOOKS[-1]) * 300, markdown=True)  # ~1 MB
+    for book in (books[0], large):
+        with b.op('open_reader'):
+            b.app.open_book(book)
+        b.frame()
+        for _ in range(3):
+            b.frame()  # prefetch the neighbouring pages
+        for _ in range(10):
+            b.click((450, 500), op='page_turn')
+        for _ in range(3):
+            b.click((100, 500), op='page_turn')
+        b.click(nv.size_up_btn.center, op='text_size')
+        b.click((450, 500), op='page_turn')
+        b.click(nv.back_btn.center)
+
+
+def scenario_ocr(b):
+    """Handwriting to text on the strokes drawn so far"""
+    if importlib.util.find_spec('pytesseract') is None:
+        raise Skip("pytesseract not installed")
+    b.open_notebook()
+    with b.op('ocr'):
+        b.app.convert_handwriting_to_text()
+    b.frame()
+
+
+def scenario_save(b):
+    """Saving the notebook to SQLite"""
+    b.open_notebook()
+    for _ in range(3):
+        with b.op('save_db'):
+            b.app.save_to_database()
+
+
+def scenario_pdf(b):
+    """PDF export"""
+    if importlib.util.find_spec('reportlab') is None:
+        raise Skip("reportlab not installed")
+    b.open_notebook()
+    with b.op('export_pdf'):
+        b.app.export_to_pdf()
+
+
+def session_scenario(path):
+    """
+    Scenario replaying a session recorded with main.py --record, as fast as
+    the app handles it; returns the replay's view divergences
+    """
+    def scenario(b):
+        from session_log import SessionReplayer
+        replayer = SessionReplayer(path, b.app.display.transform.to_landscape, realtime=False)
+        # Sessions start from a fresh app: the lock screen
+        b.app.is_locked = True
+        b.app.current_view = 'home'
+        while True:
+            events = replayer.next_frame()
+            if events is None:
+                break
+            b.frame([e for e in events if e.type != pygame.QUIT], op='session_frame')
+            replayer.check_view(b.app.view_state())
+        replayer.report()
+        return {'session': {'frames': len(replayer.frames), 'divergences': replayer.divergences}}
+    return scenario
+
+
+SCENARIOS = {
+    'lock': scenario_lock,
+    'home': scenario_home,
+    'strokes': scenario_strokes,
+    'highlighter': scenario_highlighter,
+    'scroll': scenario_scroll,
+    'layers': scenario_layers,
+    'templates': scenario_templates,
+    'book': scenario_book,
+    'reader': scenario_reader,
+    'ocr': scenario_ocr,
+    'save': scenario_save,
+    'pdf': scenario_pdf,
+}
+
+
+def run_benchmark(names=None, verbose=False, trace_alloc=False, epaper=False, sessions=()):
+    """
+    Run the scenarios (all by default) and return the results dict
+    epaper: also send frames to a simulated e-paper panel and report its
+    refreshes per scenario (frame times then include the conversion)
+    sessions: session logs to replay, each reported as scenario 'session:<file>'
+    (only these run unless names are given too)
+    """
+    scenario_funcs = dict(SCENARIOS)
+    for path in sessions:
+        scenario_funcs[f"session:{os.path.basename(path)}"] = session_scenario(os.path.abspath(path))
+    names = list(names or ()) + [name for name in scenario_funcs if name not in SCENARIOS]
+    names = names or list(SCENARIOS)
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    # Files written by saves/exports go to a scratch directory
+    workdir = tempfile.mkdtemp(prefix='abook_bench_')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with quiet:
+            start = time.perf_counter()
+            from main import ABookApp
+            app = ABookApp()
+            app.deferred_init.drain()
+            startup = time.perf_counter() - start
+        app.show_gesture_tutorial = False  # as if dismissed on first launch
+
+        bench = Bench(app)
+        if epaper:
+            app.enable_epaper(preview=False, clock=lambda: bench.now)
+        scenarios = {}
+        for name in names:
+            bench.frames = []
+            gc.collect()
+            blocks = sys.getallocatedblocks()
+            collections = sum(s['collections'] for s in gc.get_stats())
+            if trace_alloc:
+                tracemalloc.start()
+            result = {}
+            try:
+                with quiet:
+                    extra = scenario_funcs[name](bench)
+                if extra:
+                    result.update(extra)
+            except Skip as e:
+                result['skipped'] = str(e)
+            if trace_alloc:
+                result['alloc_peak_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+                tracemalloc.stop()
+            result['frames'] = summarize(bench.frames)
+            result['alloc_blocks'] = sys.getallocatedblocks() - blocks
+            result['gc_collections'] = sum(s['collections'] for s in gc.get_stats()) - collections
+            if epaper:
+                result['epaper'] = app.epaper.take_stats()
+            scenarios[name] = result
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'machine': platform.machine(),
+            'video_driver': os.environ.get('SDL_VIDEODRIVER'),
+        },
+        'startup_s': round(startup, 3),
+        'scenarios': scenarios,
+        'operations': {name: summarize(times) for name, times in sorted(bench.ops.items())},
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """List of regressions of results against baseline (empty if none)"""
+    regressions = []
+
+    def check(label, new, old, unit='ms', min_delta=MIN_DELTA_MS):
+        if new is None or old is None:
+            return
+        if new > old * (1 + tolerance) and new - old > min_delta:
+            regressions.append(f"{label}: {old:.2f} -> {new:.2f} {unit} (+{(new / old - 1) * 100:.0f}%)"
+                               if old else f"{label}: {old:.2f} -> {new:.2f} {unit}")
+
+    for name, result in results['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name, {}).get('frames', {})
+        for key in ('p50_ms', 'p90_ms', 'p99_ms'):
+            check(f"{name} frame {key[:-3]}", result['frames'].get(key), old.get(key))
+    for name, result in results['operations'].items():
+        old = baseline.get('operations', {}).get(name, {})
+        check(f"{name} mean", result.get('mean_ms'), old.get('mean_ms'))
+    check("startup", results.get('startup_s'), baseline.get('startup_s'), 's', 0.05)
+    check("peak RSS", results.get('peak_rss_mb'), baseline.get('peak_rss_mb'), 'MB', 5)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless ABook benchmark")
+    parser.add_argument('-s', '--scenario', action='append', choices=list(SCENARIOS),
+                        help="run only this scenario (repeatable)")
+    parser.add_argument('-o', '--out', help="write the JSON results to this file")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="store the results as the baseline")
+    parser.add_argument('--compare', action='store_true', help="compare with the baseline, exit 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument('--trace-alloc', action='store_true', help="also record peak traced allocations (slower)")
+    parser.add_argument('--epaper', action='store_true', help="count simulated e-paper refreshes per scenario")
+    parser.add_argument('--session', action='append', default=[], metavar='FILE',
+                        help="replay a recorded input session as a scenario (repeatable)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="show the app's own output")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.scenario, args.verbose, args.trace_alloc, args.epaper, args.session)
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            f.write(text + '\n')
+        print(f"[Bench] Baseline saved: {args.baseline}", file=sys.stderr)
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"[Bench] No baseline at {args.baseline} - run with --save-baseline first", file=sys.stderr)
+            return 2
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"[Bench] REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("[Bench] No regressions", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
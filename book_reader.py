@@ -0,0 +1,372 @@
+"""
+Reflowable e-book reader engine for ABook
+Books are plain text or markdown, laid out a page at a time straight from
+the source text: a page is known by the character offset it starts at.
+Page-break offsets are cached per (book, font, size, page size) in memory
+and on disk, so reopening a book or changing back to a font is instant.
+
+Only the current page is rendered on a page turn; prefetch() renders the
+pages either side and extends the pagination in the time each frame
+leaves over (font rendering has to stay on the main thread).
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from bisect import bisect_right
+import pygame
+from config import (AVAILABLE_FONTS, TEXT_SIZES, BOOKS_DIR, READER_CACHE_DIR, READER_FONT_INDEX,
+                    READER_SIZE_INDEX, READER_PREFETCH_MS)
+from text_cache import get_font
+
+
+LAYOUT_VERSION = 1           # part of the cache key; bump when layout rules change
+PAGE_SIZE = (520, 880)       # text area of a page in portrait pixels
+HEADING_SCALE = 1.4
+TEXT_COLOR = (20, 20, 20)
+BOOK_EXTENSIONS = ('.txt', '.md', '.markdown')
+
+_WORD = re.compile(r'\S+')
+_LIST_ITEM = re.compile(r'[ \t]*([-*+]|\d+[.)])[ \t]')
+_LINK_TARGET = re.compile(r'\]\([^)]*\)')
+_MARKUP = re.compile(r'[*_`\[\]]')
+
+
+class Book:
+    """
+    A reflowable book
+    From a file, the text is only read when the book is opened; position is
+    the offset of the page being read.
+    """
+    folder = 'books'
+
+    def __init__(self, name, text=None, path=None, markdown=False):
+        self.name = name
+        self.path = path
+        self.markdown = markdown
+        self._text = None if text is None else text.replace('\r\n', '\n')
+        self._key = None
+        self.position = 0
+
+    @classmethod
+    def from_file(cls, path):
+        stem, ext = os.path.splitext(os.path.basename(path))
+        name = stem.replace('_', ' ').replace('-', ' ').strip().title()
+        return cls(name, path=path, markdown=ext.lower() != '.txt')
+
+    @property
+    def text(self):
+        if self._text is None:
+            with open(self.path, encoding='utf-8', errors='replace') as f:
+                self._text = f.read().replace('\r\n', '\n')
+        return self._text
+
+    @property
+    def key(self):
+        """Identifies the book's content (file identity, or a hash of the text)"""
+        if self._key is None:
+            if self.path:
+                st = os.stat(self.path)
+                source = f"{os.path.abspath(self.path)}|{st.st_size}|{st.st_mtime_ns}"
+            else:
+                source = self._text
+            self._key = hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+        return self._key
+
+    @property
+    def progress(self):
+        """Fraction read (0 until the book has been opened)"""
+        if self._text is None or not self._text:
+            return 0.0
+        return min(1.0, self.position / len(self._text))
+
+
+def find_books(directory=BOOKS_DIR):
+    """Books for the text and markdown files in directory (none are read yet)"""
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    return [Book.from_file(os.path.join(directory, name)) for name in names
+            if name.lower().endswith(BOOK_EXTENSIONS)]
+
+
+class PaginationCache:
+    """Page-break offsets per layout key, kept in memory and as JSON files"""
+
+    def __init__(self, directory=READER_CACHE_DIR):
+        self.directory = directory
+        self._entries = {}  # key -> (breaks, complete)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def load(self, key):
+        """(breaks, complete), or ([0], False) if nothing is cached"""
+        entry = self._entries.get(key)
+        if entry is None:
+            try:
+                with open(self._path(key)) as f:
+                    data = json.load(f)
+                entry = (data['breaks'], data['complete'])
+            except (OSError, ValueError, KeyError):
+                entry = ([0], False)
+            self._entries[key] = entry
+        breaks, complete = entry
+        return list(breaks), complete
+
+    def store(self, key, breaks, complete):
+        if self._entries.get(key) == (breaks, complete):
+            return
+        self._entries[key] = (list(breaks), complete)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(key), 'w') as f:
+                json.dump({'breaks': breaks, 'complete': complete}, f)
+        except OSError as e:
+            print(f"[Reader] Could not store page breaks: {e}")
+
+
+_cache = None
+
+def get_pagination_cache():
+    global _cache
+    if _cache is None:
+        _cache = PaginationCache()
+    return _cache
+
+
+class BookReader:
+    """
+    Pages of one book in one font, size and page size
+    breaks[i] is the offset page i starts at; pages are laid out in order
+    as far as they are needed (page_count is None until the end is found).
+    """
+
+    def __init__(self, book, font_index=READER_FONT_INDEX, size_index=READER_SIZE_INDEX,
+                 page_size=PAGE_SIZE, cache=None):
+        self.book = book
+        self.text = book.text
+        self.page_size = page_size
+        self.cache = cache or get_pagination_cache()
+        self._surfaces = {}  # page -> rendered surface, current and neighbours only
+        self._widths = {}    # (font, word) -> pixels
+        self.page = 0
+        self.key = None
+        self._saved = True
+        self.set_layout(font_index, size_index)
+
+    # Layout settings
+
+    def set_layout(self, font_index, size_index):
+        """Change font and size, staying at the text being read"""
+        if self.key:
+            self.save()
+            position = self.breaks[self.page]
+        else:
+            position = self.book.position
+        self.font_index = font_index
+        self.size_index = size_index
+        name = AVAILABLE_FONTS[font_index][0]
+        size = TEXT_SIZES[size_index]
+        self.font = get_font(name, size)
+        self.heading_font = get_font(name, round(size * HEADING_SCALE), bold=True)
+        self.key = f"{self.book.key}|{name}|{size}|{self.page_size[0]}x{self.page_size[1]}|{LAYOUT_VERSION}"
+        self.breaks, self.complete = self.cache.load(self.key)
+        self._surfaces = {}
+        self.page = self.find_page(position)
+
+    def save(self):
+        """Store the page breaks found so far and the reading position"""
+        self.cache.store(self.key, self.breaks, self.complete)
+        self.book.position = self.breaks[self.page]
+        self._saved = True
+
+    # Pagination
+
+    @property
+    def page_count(self):
+        return len(self.breaks) if self.complete else None
+
+    def find_page(self, offset):
+        """Page containing offset, laying out pages up to it if needed"""
+        while not self.complete and self.breaks[-1] <= offset:
+            self._paginate()
+        return bisect_right(self.breaks, offset) - 1
+
+    def _paginate(self):
+        """Lay out the page after the last known one"""
+        end = self.layout_page(self.breaks[-1])[1]
+        self._saved = False
+        if end >= len(self.text):
+            self.complete = True
+        else:
+            self.breaks.append(end)
+
+    def _ensure_page(self, index):
+        while not self.complete and len(self.breaks) <= index:
+            self._paginate()
+        return index < len(self.breaks)
+
+    def _line_kind(self, start, end):
+        line = self.text[start:end]
+        if not line.strip():
+            return 'blank'
+        if self.book.markdown:
+            if line.lstrip().startswith('#'):
+                return 'heading'
+            if _LIST_ITEM.match(line):
+                return 'item'
+        return 'text'
+
+    def _skip_blank(self, pos):
+        text, n = self.text, len(self.text)
+        while pos < n:
+            eol = text.find('\n', pos)
+            eol = n if eol < 0 else eol
+            if self._line_kind(pos, eol) != 'blank':
+                break
+            pos = eol + 1
+        return min(pos, n)
+
+    def _paragraph(self, pos):
+        """
+        Kind and words (offset, text) of the paragraph at pos, then
+        (next_pos, None) - lazily, so a long paragraph is only read as far
+        as the page needs. A pos inside a paragraph continues it.
+        """
+        text, n = self.text, len(self.text)
+        at_line_start = pos == 0 or text[pos - 1] == '\n'
+        eol = text.find('\n', pos)
+        eol = n if eol < 0 else eol
+        kind = self._line_kind(pos, eol) if at_line_start else 'text'
+
+        def words():
+            start, end, first = pos, eol, True
+            marker = kind in ('heading', 'item')  # '#' or bullet still to come
+            while start < n:
+                if not first:
+                    end = text.find('\n', start)
+                    end = n if end < 0 else end
+                    if kind == 'heading' or self._line_kind(start, end) != 'text':
+                        break
+                for m in _WORD.finditer(text, start, end):
+                    word = m.group()
+                    if marker:
+                        marker = False
+                        if kind == 'heading':
+                            word = word.lstrip('#')
+                        elif word in ('-', '*', '+'):
+                            word = '•'
+                    if self.book.markdown:
+                        word = _MARKUP.sub('', _LINK_TARGET.sub('', word))
+                        if not word:
+                            continue
+                    yield m.start(), word
+                first = False
+                start = end + 1
+            yield min(start, n), None
+
+        return kind, words()
+
+    def _width(self, font, word):
+        key = (font, word)
+        w = self._widths.get(key)
+        if w is None:
+            w = self._widths[key] = font.size(word)[0]
+        return w
+
+    def layout_page(self, start):
+        """
+        Lines of the page starting at offset start, as [(y, text, font)],
+        and the offset the next page starts at
+        """
+        width, height = self.page_size
+        body_height = self.font.get_linesize()
+        gap = body_height // 2
+        lines = []
+        y = 0
+        pos = self._skip_blank(start)
+        while pos < len(self.text):
+            kind, words = self._paragraph(pos)
+            font = self.heading_font if kind == 'heading' else self.font
+            line_height = font.get_linesize()
+            space = self._width(font, ' ')
+            if lines:
+                y += gap
+            # Headings move to the next page rather than end one
+            if lines and kind == 'heading' and y + line_height + body_height > height:
+                return lines, pos
+
+            # A page that starts inside the paragraph starts at a line's
+            # first word; its first line is found from the paragraph start
+            current, line_start, line_width = [], pos, 0
+            for offset, word in words:
+                if word is None:
+                    pos = offset
+                    break
+                w = self._width(font, word)
+                if current and line_width + space + w > width:
+                    if lines and y + line_height > height:
+                        return lines, line_start
+                    lines.append((y, ' '.join(current), font))
+                    y += line_height
+                    current, line_start = [], offset
+                if not current:
+                    line_width = w
+                else:
+                    line_width += space + w
+                current.append(word)
+            if current:
+                if lines and y + line_height > height:
+                    return lines, line_start
+                lines.append((y, ' '.join(current), font))
+                y += line_height
+            pos = self._skip_blank(pos)
+        return lines, len(self.text)
+
+    # Rendering
+
+    def render_page(self, index):
+        """Surface of page index (cached while it is the current page or next to it)"""
+        surf = self._surfaces.get(index)
+        if surf is None:
+            surf = pygame.Surface(self.page_size)
+            surf.fill((255, 255, 255))
+            # Page text is only drawn once, so it bypasses the shared text cache
+            for y, text, font in self.layout_page(self.breaks[index])[0]:
+                surf.blit(font.render(text, True, TEXT_COLOR), (0, y))
+            self._surfaces[index] = surf
+        return surf
+
+    def current_surface(self):
+        return self.render_page(self.page)
+
+    def turn(self, delta):
+        """Go delta pages forward or back; False at either end of the book"""
+        index = self.page + delta
+        if index < 0 or not self._ensure_page(index):
+            return False
+        self.page = index
+        self._surfaces = {i: s for i, s in self._surfaces.items() if abs(i - index) <= 1}
+        return True
+
+    def prefetch(self, budget_ms=READER_PREFETCH_MS):
+        """
+        Background work for up to budget_ms: render the next and previous
+        pages, then lay out more of the book. True while work remains.
+        """
+        deadline = time.perf_counter() + budget_ms / 1000
+        for index in (self.page + 1, self.page - 1):
+            if index >= 0 and index not in self._surfaces and self._ensure_page(index):
+                self.render_page(index)
+                if time.perf_counter() >= deadline:
+                    return True
+        while not self.complete:
+            self._paginate()
+            if time.perf_counter() >= deadline:
+                return True
+        if not self._saved:
+            self.save()
+        return False
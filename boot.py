@@ -3,9 +3,8 @@ Boot sequence animation for ABook application
 """
 import pygame
 import sys
-import random
-import math
 from config import *
+from particles import ParticleField
 
 
 def generate_logo_positions(scale=8):
@@ -40,61 +39,26 @@ def generate_logo_positions(scale=8):
     return [(p[0] + offset_x, p[1] + offset_y) for p in positions]
 
 
-class Particle:
-    """Particle for boot animation"""
-    def __init__(self, target):
-        # Use portrait dimensions
-        self.start = (random.randint(0, 600), random.randint(0, 1024))
-        self.target = target
-        self.pos = list(self.start)
-        
-        # Calculate dispersion target
-        angle = random.uniform(0, 2 * math.pi)
-        dist = random.randint(300, 600)
-        self.disperse = (
-            target[0] + math.cos(angle) * dist,
-            target[1] + math.sin(angle) * dist
-        )
-
-    def update(self, elapsed):
-        """Update particle position based on elapsed time"""
-        if elapsed < FORMATION_DURATION:
-            # Formation phase
-            t = elapsed / FORMATION_DURATION
-            self.pos = [
-                self.start[i] + (self.target[i] - self.start[i]) * t
-                for i in range(2)
-            ]
-        elif elapsed > FORMATION_DURATION + HOLD_DURATION:
-            # Dispersion phase
-            t = min(1, (elapsed - FORMATION_DURATION - HOLD_DURATION) / DISPERSE_DURATION)
-            self.pos = [
-                self.target[i] + (self.disperse[i] - self.target[i]) * t
-                for i in range(2)
-            ]
-
-    def draw(self, screen):
-        """Draw the particle"""
-        pygame.draw.circle(
-            screen,
-            COLOR_BLACK,
-            (int(self.pos[0]), int(self.pos[1])),
-            4  # Increased from 3 to 4 for better visibility
-        )
-
-
-def run_boot_sequence(screen, clock):
-    """Run the boot animation sequence - rotated 90° counter-clockwise"""
+def run_boot_sequence(screen, clock, deferred_init=None):
+    """
+    Run the boot animation sequence - rotated 90° counter-clockwise
+    deferred_init (startup.DeferredInit) steps run in the time left over
+    each frame and are finished before returning.
+    """
+    if deferred_init:
+        deferred_init.start_background()
+    frame_budget = 1.0 / FPS
+    
     targets = generate_logo_positions()
     # Create more particles for better logo formation
-    particles = [Particle(targets[i % len(targets)]) for i in range(800)]
+    particles = ParticleField(targets, count=800, radius=4, color=COLOR_BLACK,
+                              formation=FORMATION_DURATION, hold=HOLD_DURATION,
+                              disperse=DISPERSE_DURATION)
     start_ticks = pygame.time.get_ticks()
     
-    # Create portrait surface for boot animation
-    portrait_surface = pygame.Surface((600, 1024))
-    
     while True:
-        elapsed = (pygame.time.get_ticks() - start_ticks) / 1000
+        frame_start = pygame.time.get_ticks()
+        elapsed = (frame_start - start_ticks) / 1000
         if elapsed > TOTAL_BOOT_TIME:
             break
         
@@ -102,19 +66,20 @@ def run_boot_sequence(screen, clock):
             if event.type == pygame.QUIT:
                 sys.exit()
         
-        # Draw to portrait surface
-        portrait_surface.fill(COLOR_WHITE)
-        
-        for particle in particles:
-            particle.update(elapsed)
-            particle.draw(portrait_surface)
+        # Particles are drawn straight into the landscape screen,
+        # already rotated 90° counter-clockwise
+        screen.fill(COLOR_WHITE)
+        particles.update(elapsed)
+        particles.draw(screen, rotate=True)
+        pygame.display.flip()
         
-        # Rotate 90° counter-clockwise
-        rotated = pygame.transform.rotate(portrait_surface, 90)
+        # Spend the rest of this frame on pending startup work
+        if deferred_init:
+            spent = (pygame.time.get_ticks() - frame_start) / 1000
+            deferred_init.run_for(frame_budget - spent)
         
-        # After rotation: 1024×600 - perfect fit!
-        screen.fill((0, 0, 0))
-        screen.blit(rotated, (0, 0))
-        pygame.display.flip()
         clock.tick(FPS)
+    
+    if deferred_init:
+        deferred_init.drain()
         
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Brush engine for ABook
+Draws stroke paths for the pen, highlighter and eraser without per-segment
+allocations, and tracks the area each stroke touched.
+"""
+import pygame
+from config import NOTEPAD_INK
+import gray_canvas
+
+
+HIGHLIGHTER_COLOR = (180, 180, 180, 100)  # Light grey, semi-transparent
+ERASE_COLOR = (0, 0, 0, 0)
+
+# On grayscale planes the tools draw coverage values of the pen's ink
+HIGHLIGHTER_COVERAGE = gray_canvas.ink_coverage(HIGHLIGHTER_COLOR)
+
+
+def draw_path(surface, color, points, width):
+    """
+    Polyline with round joins; a single point becomes a dot
+    pygame.draw writes pixels without blending, so overlapping parts of
+    one path never darken each other.
+    """
+    radius = max(1, width // 2)
+    if len(points) == 1:
+        pygame.draw.circle(surface, color, points[0], radius)
+        return
+    pygame.draw.lines(surface, color, False, points, width)
+    if width > 3:
+        # Discs every ~radius/2 pixels (path points are ~2px apart)
+        # fill the gaps at the joints
+        step = max(1, int(radius / 4))
+        for p in points[::step]:
+            pygame.draw.circle(surface, color, p, radius)
+        pygame.draw.circle(surface, color, points[-1], radius)
+
+
+class BrushEngine:
+    """
+    Renders one stroke at a time onto a layer
+    Pen and eraser draw straight into the layer. The highlighter draws
+    into a scratch mask (allocated once, reused for every stroke) that is
+    shown as a preview and composited into the layer once on pen-up, so
+    the whole stroke has one uniform alpha.
+    Layers can be RGBA surfaces or grayscale coverage planes (gray_canvas).
+    """
+
+    def __init__(self, canvas_size):
+        self.canvas_size = canvas_size
+        self._scratch = None
+        self.tool = None
+        self.width = 1
+        self.bbox = None  # area touched by the current stroke
+
+        # Called with a rect just before the layer is changed there (for undo)
+        self.before_change = None
+
+    def scratch_for(self, surface):
+        """Highlighter mask in the same format as the layer"""
+        gray = gray_canvas.is_plane(surface)
+        if self._scratch is None or gray_canvas.is_plane(self._scratch) != gray:
+            if gray:
+                self._scratch = gray_canvas.new_plane(self.canvas_size)
+            else:
+                self._scratch = pygame.Surface(self.canvas_size, pygame.SRCALPHA)
+                self._scratch.fill((0, 0, 0, 0))
+        return self._scratch
+
+    def begin(self, tool, width):
+        self.tool = tool
+        self.width = width
+        self.bbox = None
+
+    def _grow_bbox(self, points):
+        r = self.width // 2 + 2
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        rect = pygame.Rect(min(xs) - r, min(ys) - r, max(xs) - min(xs) + 2 * r, max(ys) - min(ys) + 2 * r)
+        rect = rect.clip(pygame.Rect((0, 0), self.canvas_size))
+        self.bbox = rect if self.bbox is None else self.bbox.union(rect)
+        return rect
+
+    def add(self, surface, points):
+        """Draw the next piece of the stroke path (integer points)"""
+        if not points or self.tool is None:
+            return
+        rect = self._grow_bbox(points)
+        if self.tool != 'highlighter' and self.before_change:
+            self.before_change(rect)
+
+        gray = gray_canvas.is_plane(surface)
+        if self.tool == 'pen':
+            draw_path(surface, gray_canvas.FULL if gray else NOTEPAD_INK, points, self.width)
+        elif self.tool == 'highlighter':
+            draw_path(self.scratch_for(surface), HIGHLIGHTER_COVERAGE if gray else HIGHLIGHTER_COLOR,
+                      points, self.width)
+        else:  # eraser
+            draw_path(surface, 0 if gray else ERASE_COLOR, points, self.width)
+
+    def end(self, surface):
+        """
+        Finish the stroke
+        Returns the rect of the layer the stroke changed, or None.
+        """
+        bbox = self.bbox
+        if self.tool == 'highlighter' and bbox:
+            if self.before_change:
+                self.before_change(bbox)
+            scratch = self.scratch_for(surface)
+            gray_canvas.blend(surface, scratch, bbox)
+            scratch.fill(0 if gray_canvas.is_plane(scratch) else (0, 0, 0, 0), bbox)
+        self.tool = None
+        self.bbox = None
+        return bbox
+
+    def draw_preview(self, target, scroll_offset):
+        """Show the highlighter stroke in progress on the visible canvas"""
+        if self.tool != 'highlighter' or not self.bbox:
+            return
+        view = pygame.Rect(0, scroll_offset, target.get_width(), target.get_height())
+        area = self.bbox.clip(view)
+        if area and gray_canvas.is_plane(self._scratch):
+            gray_canvas.show(target, self._scratch, (area.x, area.y - scroll_offset), area)
+        elif area:
+            target.blit(self._scratch, (area.x, area.y - scroll_offset), area)
@@ -14,6 +14,22 @@ CONTENT_HEIGHT = 1024 # Portrait height (matches old DISPLAY_HEIGHT)
 
 FPS = 60
 
+# Touch calibration for the window (touch_calibration format); used if present
+TOUCH_CALIBRATION_FILE = "touch_calibration.abcal"
+
+# --- FRAME SCHEDULING ---
+# Full FPS only while something moves; otherwise wait for input
+IDLE_FRAME_TIMEOUT_MS = 1000     # Idle redraw interval (keeps the clock current)
+ACTIVE_LINGER_MS = 500           # Stay at full rate this long after the last input
+POWER_SAVE_FPS = 30              # Frame rate cap in power save mode
+POWER_SAVE_IDLE_TIMEOUT_MS = 5000
+
+# --- E-PAPER OUTPUT (main.py --epaper) ---
+EPAPER_REFRESH_INTERVAL_MS = 250  # Minimum time between partial refreshes
+EPAPER_FULL_REFRESH_EVERY = 20    # Full refresh after this many partials (clears ghosting)
+EPAPER_FULL_AREA = 0.5            # Changed fraction of the panel above which a full refresh is used
+EPAPER_WINDOW_GAP = 16            # Changed rows closer than this share one refresh window
+
 # --- COLORS ---
 # Modern, professional color palette (Y Combinator style)
 COLOR_PRIMARY = (45, 55, 72)        # Dark slate
@@ -41,6 +57,10 @@ NOTEPAD_TOOLBAR = (240, 240, 240)   # Light gray toolbar
 NOTEPAD_BUTTON = (50, 50, 50)       # Dark gray buttons
 NOTEPAD_BUTTON_ACTIVE = (0, 0, 0)   # Black for active
 
+# Layer storage: 'gray' = 8-bit ink coverage planes in NOTEPAD_INK, the pen colour
+# (see gray_canvas), 'rgba' = 32-bit colour layers
+CANVAS_MODE = 'gray'
+
 # Legacy compatibility
 COLOR_UI_LIGHT = COLOR_GRAY_100
 COLOR_UI_DARK = COLOR_GRAY_600
@@ -69,4 +89,13 @@ AVAILABLE_FONTS = [
     ('Verdana', 'sans-serif')
 ]
 
-TEXT_SIZES = [12, 14, 16, 18, 20, 24, 28, 32]
\ No newline at end of file
+TEXT_SIZES = [12, 14, 16, 18, 20, 24, 28, 32]
+# --- E-BOOK READER ---
+BOOKS_DIR = 'books'                # .txt / .md files listed in the Books folder
+READER_CACHE_DIR = 'reader_cache'  # page-break offsets per book and layout
+READER_FONT_INDEX = 4              # AVAILABLE_FONTS entry books open in (Georgia)
+READER_SIZE_INDEX = 4              # TEXT_SIZES entry books open in (20)
+READER_PREFETCH_MS = 8             # background page work per frame while reading
+
+# --- WORD COMPLETION ---
+LEARNED_WORDS_FILE = 'learned_words.txt'  # words learned from OCR, one per line
@@ -6,6 +6,8 @@ import sqlite3
 import pickle
 import pygame
 from datetime import datetime
+from config import CANVAS_MODE
+import gray_canvas
 
 
 class NotebookDB:
@@ -32,6 +34,12 @@ class NotebookDB:
             )
         ''')
         
+        # Notebook background template (column added after the first release)
+        cursor.execute('PRAGMA table_info(notebooks)')
+        if 'template_name' not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE notebooks ADD COLUMN template_name TEXT DEFAULT 'Blank'")
+            print("[DB] Added notebooks.template_name column")
+        
         # Layers table  
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS layers (
@@ -45,6 +53,26 @@ class NotebookDB:
             )
         ''')
         
+        # Page of each layer (rows saved before pages belong to page 0)
+        cursor.execute('PRAGMA table_info(layers)')
+        if 'page_num' not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE layers ADD COLUMN page_num INTEGER DEFAULT 0")
+            print("[DB] Added layers.page_num column")
+        
+        # Page index: per-page metadata, readable without the layer data
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                notebook_id INTEGER,
+                page_num INTEGER,
+                template_name TEXT,
+                bbox TEXT,
+                text_hash TEXT,
+                thumbnail BLOB,
+                FOREIGN KEY (notebook_id) REFERENCES notebooks(id) ON DELETE CASCADE
+            )
+        ''')
+        
         self.conn.commit()
     
     def save_notebook(self, notebook):
@@ -59,27 +87,49 @@ class NotebookDB:
         if existing:
             # Update
             nb_id = existing[0]
-            cursor.execute('UPDATE notebooks SET folder=?, updated_at=? WHERE id=?',
-                         (notebook.folder, now, nb_id))
-            cursor.execute('DELETE FROM layers WHERE notebook_id=?', (nb_id,))
+            cursor.execute('UPDATE notebooks SET folder=?, template_name=?, updated_at=? WHERE id=?',
+                         (notebook.folder, notebook.template_name, now, nb_id))
             print(f"[DB] Updated: {notebook.name}")
         else:
             # Insert new
-            cursor.execute('INSERT INTO notebooks (name, folder, created_at, updated_at) VALUES (?, ?, ?, ?)',
-                         (notebook.name, notebook.folder, now, now))
+            cursor.execute('INSERT INTO notebooks (name, folder, template_name, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+                         (notebook.name, notebook.folder, notebook.template_name, now, now))
             nb_id = cursor.lastrowid
             print(f"[DB] Saved: {notebook.name} (ID: {nb_id})")
         
-        # Save layers
-        for i, layer in enumerate(notebook.layers):
-            surface_bytes = self._surface_to_bytes(layer.surf)
-            cursor.execute('''INSERT INTO layers 
-                            (notebook_id, layer_num, template_name, visible, surface_data)
-                            VALUES (?, ?, ?, ?, ?)''',
-                         (nb_id, i, layer.template_name, int(layer.visible), surface_bytes))
+        # Save the pages one at a time; pages that were not in memory are
+        # freed again. New rows go in under -1 - page_num until the end, as
+        # pages not read yet still load from the old rows.
+        layer_count = 0
+        for page_num, page in enumerate(notebook.pages):
+            keep = page is notebook.page or page.loaded
+            layers = page.layers
+            for i, layer in enumerate(layers):
+                surface_bytes = self._layer_to_bytes(layer)
+                cursor.execute('''INSERT INTO layers 
+                                (notebook_id, page_num, layer_num, template_name, visible, surface_data)
+                                VALUES (?, ?, ?, ?, ?, ?)''',
+                             (nb_id, -1 - page_num, i, layer.template_name, int(layer.visible), surface_bytes))
+            layer_count += len(layers)
+            if not keep:
+                page.unload()
+        cursor.execute('DELETE FROM layers WHERE notebook_id=? AND COALESCE(page_num, 0)>=0', (nb_id,))
+        cursor.execute('UPDATE layers SET page_num=-1-page_num WHERE notebook_id=?', (nb_id,))
+        
+        # Page index (metadata of the open page is brought up to date first)
+        notebook.page.bbox = notebook.page.ink_bounds()
+        notebook.page.thumbnail = notebook.page.render_thumbnail()
+        cursor.execute('DELETE FROM pages WHERE notebook_id=?', (nb_id,))
+        for page_num, page in enumerate(notebook.pages):
+            cursor.execute('''INSERT INTO pages
+                            (notebook_id, page_num, template_name, bbox, text_hash, thumbnail)
+                            VALUES (?, ?, ?, ?, ?, ?)''',
+                         (nb_id, page_num, page.template_name,
+                          ' '.join(map(str, page.bbox)) if page.bbox is not None else None,
+                          page.text_hash, self._thumbnail_to_bytes(page.thumbnail)))
         
         self.conn.commit()
-        print(f"[DB] Saved {len(notebook.layers)} layers")
+        print(f"[DB] Saved {len(notebook.pages)} pages ({layer_count} layers)")
         return nb_id
     
     def load_notebook(self, notebook_id):
@@ -87,32 +137,54 @@ class NotebookDB:
         cursor = self.conn.cursor()
         
         # Get notebook
-        cursor.execute('SELECT name, folder FROM notebooks WHERE id=?', (notebook_id,))
+        cursor.execute('SELECT name, folder, template_name FROM notebooks WHERE id=?', (notebook_id,))
         result = cursor.fetchone()
         
         if not result:
             print(f"[DB] Notebook {notebook_id} not found")
             return None
         
-        name, folder = result
+        name, folder, template_name = result
         
-        # Create notebook
-        from models import Notebook, Layer
-        notebook = Notebook(name, folder)
-        notebook.layers = []
-        
-        # Load layers
-        cursor.execute('SELECT template_name, visible, surface_data FROM layers WHERE notebook_id=? ORDER BY layer_num',
-                      (notebook_id,))
+        # Pages from the page index; their layers are read when each page is
+        # first opened. Notebooks saved before pages have one page.
+        from models import Notebook, Page
+        cursor.execute('''SELECT page_num, template_name, bbox, text_hash, thumbnail FROM pages
+                          WHERE notebook_id=? ORDER BY page_num''', (notebook_id,))
+        pages = []
+        for page_num, page_template, bbox, text_hash, thumbnail in cursor.fetchall():
+            page = Page(template_name=page_template or "Blank",
+                        loader=self._page_loader(notebook_id, page_num))
+            page.bbox = pygame.Rect(*map(int, bbox.split())) if bbox else None
+            page.text_hash = text_hash
+            page.thumbnail = self._bytes_to_thumbnail(thumbnail)
+            pages.append(page)
+        if not pages:
+            pages = [Page(template_name=template_name or "Blank", loader=self._page_loader(notebook_id, 0))]
+        notebook = Notebook(name, folder, pages)
         
+        print(f"[DB] Loaded: {name} ({len(pages)} pages)")
+        return notebook
+    
+    def _page_loader(self, notebook_id, page_num):
+        def load(page):
+            return self.load_layers(notebook_id, page_num)
+        return load
+    
+    def load_layers(self, notebook_id, page_num=0):
+        """Read the layers of one page"""
+        from models import Layer
+        cursor = self.conn.cursor()
+        cursor.execute('''SELECT template_name, visible, surface_data FROM layers
+                          WHERE notebook_id=? AND COALESCE(page_num, 0)=? ORDER BY layer_num''',
+                      (notebook_id, page_num))
+        layers = []
         for template_name, visible, surface_data in cursor.fetchall():
             layer = Layer(template_name)
             layer.visible = bool(visible)
-            layer.surf = self._bytes_to_surface(surface_data)
-            notebook.layers.append(layer)
-        
-        print(f"[DB] Loaded: {name} ({len(notebook.layers)} layers)")
-        return notebook
+            self._restore_layer(layer, surface_data)
+            layers.append(layer)
+        return layers or [Layer()]
     
     def list_notebooks(self):
         """List all notebooks"""
@@ -143,19 +215,64 @@ class NotebookDB:
         by_folder = dict(cursor.fetchall())
         return {'total': total, 'by_folder': by_folder}
     
-    def _surface_to_bytes(self, surface):
-        """Convert pygame surface to bytes"""
-        size = surface.get_size()
-        raw_str = pygame.image.tostring(surface, 'RGBA')
-        data = {'size': size, 'data': raw_str}
+    def _layer_to_bytes(self, layer):
+        """Convert the ink area of a layer to bytes (nothing for an empty layer)"""
+        from models import LAYER_WIDTH, LAYER_HEIGHT
+        rect = layer.bounds
+        data = {'size': (LAYER_WIDTH, LAYER_HEIGHT), 'rect': tuple(rect), 'data': b''}
+        if rect.width and rect.height:
+            region = layer.surf.subsurface(rect)
+            if layer.gray:
+                data['data'] = gray_canvas.tobytes(region)
+                data['format'] = 'coverage'
+            else:
+                data['data'] = pygame.image.tostring(region, 'RGBA')
         return pickle.dumps(data)
     
+    def _restore_layer(self, layer, data_bytes):
+        """Fill a new (blank) layer from _layer_to_bytes or older full-surface data"""
+        data = pickle.loads(data_bytes)
+        if 'rect' not in data:
+            layer.surf = self._bytes_to_surface(data_bytes)
+            return
+        rect = pygame.Rect(data['rect'])
+        if not (rect.width and rect.height):
+            return  # empty: the canvas is only allocated once drawn on
+        if data.get('format') == 'coverage':
+            region = gray_canvas.frombytes(data['data'], rect.size)
+        else:
+            region = pygame.image.fromstring(data['data'], rect.size, 'RGBA')
+        surf = layer.surf
+        if layer.gray:
+            pixels = pygame.surfarray.pixels2d(surf)
+            pixels[rect.left:rect.right, rect.top:rect.bottom] = gray_canvas.coverage(region)
+            del pixels
+        elif gray_canvas.is_plane(region):
+            surf.blit(gray_canvas.to_rgba(region), rect.topleft)
+        else:
+            surf.fill((0, 0, 0, 0), rect)
+            surf.blit(region, rect.topleft, special_flags=pygame.BLEND_RGBA_ADD)
+        layer.mark(rect)
+    
+    def _thumbnail_to_bytes(self, thumbnail):
+        if thumbnail is None:
+            return None
+        return pickle.dumps({'size': thumbnail.get_size(), 'data': pygame.image.tostring(thumbnail, 'RGB')})
+    
+    def _bytes_to_thumbnail(self, data_bytes):
+        if not data_bytes:
+            return None
+        data = pickle.loads(data_bytes)
+        return pygame.image.fromstring(data['data'], data['size'], 'RGB')
+    
     def _bytes_to_surface(self, data_bytes):
-        """Convert bytes to pygame surface"""
+        """Convert full-surface layer bytes (saved before ink areas) to a pygame surface"""
         from PIL import Image
         data = pickle.loads(data_bytes)
         size = data['size']
         raw_str = data['data']
+        if data.get('format') == 'coverage':
+            return gray_canvas.frombytes(raw_str, size)
         
         # Create surface
         surface = pygame.Surface(size, pygame.SRCALPHA)
@@ -164,6 +281,9 @@ class NotebookDB:
         # Convert to pygame
         py_img = pygame.image.fromstring(pil_img.tobytes(), size, 'RGBA')
         surface.blit(py_img, (0, 0))
+        if CANVAS_MODE == 'gray':
+            # RGBA layers saved before the grayscale canvas
+            return gray_canvas.from_surface(surface)
         return surface
     
     def close(self):
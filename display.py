@@ -0,0 +1,109 @@
+"""
+Display backend for ABook
+The UI is drawn on a portrait surface (600x1024) and shown on a landscape
+panel (1024x600) rotated 90° counter-clockwise.
+"""
+import pygame
+from touch_calibration import AffineCalibration
+
+
+class DisplayTransform:
+    """
+    Maps between portrait UI coordinates and landscape panel coordinates
+    Portrait pixel (x, y) is shown at landscape pixel (y, W - 1 - x),
+    where W is the portrait width. Input positions can go through a touch
+    calibration (in window coordinates) before the rotation; to_landscape
+    undoes both, so it is the inverse of to_portrait.
+    """
+
+    def __init__(self, portrait_size=(600, 1024), calibration=None):
+        self.portrait_size = portrait_size
+        self.landscape_size = (portrait_size[1], portrait_size[0])
+
+        # Landscape -> portrait as an affine map: (x, y) -> (W - 1 - y, x)
+        self.rotation = AffineCalibration(0, -1, portrait_size[0] - 1, 1, 0, 0)
+        self.set_calibration(calibration)
+
+    def set_calibration(self, calibration):
+        """Touch calibration applied to input positions (None for none)"""
+        self.calibration = calibration
+        self.input_map = calibration.then(self.rotation) if calibration else self.rotation
+        self.output_map = self.input_map.inverse()
+
+    def to_landscape(self, pos):
+        """Portrait UI position -> the window position to_portrait maps to it"""
+        return self.output_map.apply(pos[0], pos[1])
+
+    def to_portrait(self, pos):
+        """Landscape (window/mouse) position -> portrait UI position"""
+        return self.input_map.apply(pos[0], pos[1])
+
+    def rect_to_landscape(self, rect):
+        x, y, w, h = rect
+        return pygame.Rect(y, self.portrait_size[0] - x - w, h, w)
+
+    def rect_to_portrait(self, rect):
+        lx, ly, lw, lh = rect
+        return pygame.Rect(self.portrait_size[0] - ly - lh, lx, lh, lw)
+
+
+class RotatedDisplay:
+    """
+    Presents a portrait back buffer on the landscape screen
+    Regions are copied into the screen already rotated (a transposed NumPy
+    copy through surfarray), so no rotated frame is allocated per frame.
+    Pass dirty rectangles to present() to copy and update only those.
+    """
+
+    def __init__(self, screen, portrait_size=(600, 1024)):
+        self.screen = screen
+        self.transform = DisplayTransform(portrait_size)
+
+        # Same pixel format as the screen so raw pixel values can be copied
+        self.surface = pygame.Surface(portrait_size, 0, screen)
+
+        try:
+            pygame.surfarray.pixels2d(self.surface)
+            pygame.surfarray.pixels2d(self.screen)
+            self.fast_path = True
+        except (ValueError, pygame.error):
+            # e.g. 24-bit surfaces - fall back to transform.rotate per region
+            self.fast_path = False
+            print("[Display] surfarray not usable, rotating with pygame.transform")
+
+        self.full_rect = self.surface.get_rect()
+
+    def _copy_region(self, rect):
+        x0, y0, w, h = rect
+        lrect = self.transform.rect_to_landscape(rect)
+        if self.fast_path:
+            src = pygame.surfarray.pixels2d(self.surface)
+            dst = pygame.surfarray.pixels2d(self.screen)
+            dst[lrect.x:lrect.right, lrect.y:lrect.bottom] = src[x0:x0 + w, y0:y0 + h][::-1, :].T
+            del src, dst
+        else:
+            region = self.surface.subsurface(rect)
+            self.screen.blit(pygame.transform.rotate(region, 90), lrect.topleft)
+        return lrect
+
+    def present(self, dirty_rects=None):
+        """
+        Copy the back buffer to the screen and update the display
+        dirty_rects: portrait rects that changed, or None for the whole frame
+        """
+        if dirty_rects is None:
+            self._copy_region(self.full_rect)
+            pygame.display.flip()
+            return
+
+        updated = []
+        for rect in dirty_rects:
+            rect = pygame.Rect(rect).clip(self.full_rect)
+            if rect.width and rect.height:
+                updated.append(self._copy_region(rect))
+        if updated:
+            pygame.display.update(updated)
+
+    def mouse_pos(self):
+        """Current mouse position in portrait coordinates"""
+        return self.transform.to_portrait(pygame.mouse.get_pos())
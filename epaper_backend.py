@@ -0,0 +1,209 @@
+"""
+E-paper output backend for ABook
+Converts the rendered portrait frame to a packed 1-bit framebuffer
+(ordered dithering), finds the regions that changed since the last
+refresh and sends them to the panel as windowed partial refreshes, with
+a full refresh on view changes and every few partials.
+
+Framebuffer rows are MONO_HLSB like the Pico EPD_2in9 driver: 1 bit per
+pixel, leftmost pixel in the high bit, 1 = white. Windows are
+(x0_byte, y0, x1_byte, y1), inclusive.
+"""
+import time
+import numpy as np
+import pygame
+from config import (EPAPER_REFRESH_INTERVAL_MS, EPAPER_FULL_REFRESH_EVERY, EPAPER_FULL_AREA,
+                    EPAPER_WINDOW_GAP)
+
+
+# Simulated panel timing
+PARTIAL_REFRESH_MS = 300
+FULL_REFRESH_MS = 2000
+SPI_HZ = 20_000_000
+
+
+def bayer_matrix(n=8):
+    """n x n ordered-dither matrix with values 0..n*n-1 (n a power of two)"""
+    m = np.zeros((1, 1), dtype=np.int32)
+    while m.shape[0] < n:
+        m = np.block([[4 * m, 4 * m + 2], [4 * m + 3, 4 * m + 1]])
+    return m
+
+
+_thresholds = {}
+
+
+def _threshold_map(height, width):
+    """Per-pixel grey thresholds (y, x) tiled from the Bayer matrix"""
+    key = (height, width)
+    t = _thresholds.get(key)
+    if t is None:
+        b = bayer_matrix(8)
+        levels = ((b * 2 + 1) * 255 // 128).astype(np.uint16)  # centre of each of 64 bands
+        t = np.tile(levels, (height // 8 + 1, width // 8 + 1))[:height, :width]
+        _thresholds[key] = t
+    return t
+
+
+def to_mono(surface):
+    """
+    Packed 1-bit rows (height, width / 8) of a surface
+    Luminance against a fixed Bayer threshold map: pure black and white
+    stay exact, greys become stable patterns (a pixel only changes when
+    its own grey changes, which keeps partial refresh windows small).
+    """
+    w, h = surface.get_size()
+    try:
+        rgb = pygame.surfarray.pixels3d(surface)
+    except (ValueError, pygame.error):
+        rgb = pygame.surfarray.array3d(surface)
+    lum = (rgb[:, :, 0].astype(np.uint16) * 77 + rgb[:, :, 1].astype(np.uint16) * 150
+           + rgb[:, :, 2].astype(np.uint16) * 29) >> 8
+    del rgb
+    bits = lum.T > _threshold_map(h, w)
+    return np.packbits(bits, axis=1)
+
+
+def changed_windows(old, new, gap=EPAPER_WINDOW_GAP):
+    """
+    Windows covering every byte that differs between two packed frames
+    Changed rows closer than gap rows share a window.
+    """
+    diff = old != new
+    rows = np.flatnonzero(diff.any(axis=1))
+    if not rows.size:
+        return []
+    breaks = np.flatnonzero(np.diff(rows) > gap)
+    starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], [rows[-1]]))
+    windows = []
+    for y0, y1 in zip(starts, ends):
+        cols = np.flatnonzero(diff[y0:y1 + 1].any(axis=0))
+        windows.append((int(cols[0]), int(y0), int(cols[-1]), int(y1)))
+    return windows
+
+
+def window_bytes(frame, window):
+    x0, y0, x1, y1 = window
+    return frame[y0:y1 + 1, x0:x1 + 1].tobytes()
+
+
+class EPaperSimulator:
+    """
+    Panel stand-in: applies updates to its image and returns what each
+    costs (refresh waveform plus SPI transfer time)
+    """
+
+    def __init__(self, size=(600, 1024), partial_ms=PARTIAL_REFRESH_MS, full_ms=FULL_REFRESH_MS,
+                 spi_hz=SPI_HZ):
+        w, h = size
+        self.image = np.full((h, w // 8), 0xFF, dtype=np.uint8)
+        self.partial_ms = partial_ms
+        self.full_ms = full_ms
+        self.spi_hz = spi_hz
+        self.partials_since_full = 0  # ghosting builds up with each partial
+        self._surface = None
+
+    def update(self, kind, windows):
+        """Write [(window, data)] into panel RAM and refresh; returns the cost in ms"""
+        nbytes = 0
+        for (x0, y0, x1, y1), data in windows:
+            self.image[y0:y1 + 1, x0:x1 + 1] = np.frombuffer(data, dtype=np.uint8).reshape(
+                y1 - y0 + 1, x1 - x0 + 1)
+            nbytes += len(data)
+        if kind == 'full':
+            self.partials_since_full = 0
+        else:
+            self.partials_since_full += 1
+        self._surface = None
+        return (self.full_ms if kind == 'full' else self.partial_ms) + nbytes * 8 * 1000 / self.spi_hz
+
+    def surface(self):
+        """What the panel shows, as a pygame surface (cached between updates)"""
+        if self._surface is None:
+            grey = np.unpackbits(self.image, axis=1).T * np.uint8(255)  # [x, y]
+            self._surface = pygame.surfarray.make_surface(np.dstack((grey, grey, grey)))
+        return self._surface
+
+
+class EPaperBackend:
+    """
+    Sends frames to an e-paper sink (EPaperSimulator or a driver with the
+    same update(kind, windows) method)
+    Partial refreshes are rate limited: frames in between are not sent,
+    their changes go out with the next refresh (the diff is against what
+    the panel shows).
+    """
+
+    def __init__(self, sink, interval_ms=EPAPER_REFRESH_INTERVAL_MS,
+                 full_every=EPAPER_FULL_REFRESH_EVERY, clock=time.perf_counter):
+        self.sink = sink
+        self.interval_ms = interval_ms
+        self.full_every = full_every
+        self.clock = clock
+        self.shown = None
+        self.view = None
+        self.partials_since_full = 0
+        self.last_refresh = 0.0
+        self.busy_until = 0.0  # the panel is refreshing until then
+        self.stats = {}
+
+    def _count(self, view):
+        s = self.stats.get(view)
+        if s is None:
+            s = self.stats[view] = {'frames': 0, 'deferred': 0, 'partial': 0, 'full': 0,
+                                    'windows': 0, 'bytes': 0, 'refresh_ms': 0.0}
+        return s
+
+    def present(self, surface, view=None):
+        """Send the frame if it is time to; returns 'partial', 'full' or None"""
+        now = self.clock()
+        stats = self._count(view)
+        stats['frames'] += 1
+
+        full = self.shown is None or view != self.view
+        if not full and (now < self.busy_until or
+                         (now - self.last_refresh) * 1000 < self.interval_ms):
+            stats['deferred'] += 1
+            return None
+        self.view = view
+
+        frame = to_mono(surface)
+        if not full:
+            windows = changed_windows(self.shown, frame)
+            if not windows:
+                return None
+            area = sum((x1 - x0 + 1) * (y1 - y0 + 1) for x0, y0, x1, y1 in windows)
+            full = self.partials_since_full >= self.full_every or area > EPAPER_FULL_AREA * frame.size
+
+        if full:
+            kind = 'full'
+            windows = [(0, 0, frame.shape[1] - 1, frame.shape[0] - 1)]
+            self.partials_since_full = 0
+        else:
+            kind = 'partial'
+            self.partials_since_full += 1
+        updates = [(w, window_bytes(frame, w)) for w in windows]
+        cost = self.sink.update(kind, updates)
+
+        self.shown = frame
+        self.last_refresh = now
+        self.busy_until = now + cost / 1000
+        stats[kind] += 1
+        stats['windows'] += len(updates)
+        stats['bytes'] += sum(len(d) for _, d in updates)
+        stats['refresh_ms'] += cost
+        return kind
+
+    def take_stats(self):
+        """Counters per view since the last call"""
+        stats, self.stats = self.stats, {}
+        for s in stats.values():
+            s['refresh_ms'] = round(s['refresh_ms'], 1)
+        return stats
+
+    def report(self):
+        for view, s in sorted(self.stats.items(), key=lambda kv: str(kv[0])):
+            print(f"[EPaper] {view}: {s['partial']} partial, {s['full']} full refreshes "
+                  f"({s['refresh_ms'] / 1000:.1f} s, {s['bytes'] / 1024:.0f} KB) "
+                  f"for {s['frames']} frames")
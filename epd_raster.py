@@ -0,0 +1,129 @@
+"""
+Thick line and disc rasterization for framebuf (MicroPython)
+Shapes are filled one scanline at a time with hline, so a stroke segment
+costs one call per row instead of one pixel() call per covered pixel.
+Each function returns the bounding rect (x, y, w, h) it drew into, ready
+for RefreshScheduler.mark().
+"""
+import math
+
+
+_disc_spans = {}
+
+
+def disc_spans(r):
+    """Half-widths of a radius r disc, one per row from -r to r (cached)"""
+    spans = _disc_spans.get(r)
+    if spans is None:
+        spans = bytes(int(math.sqrt(r * r - dy * dy) + 1e-6) for dy in range(-r, r + 1))
+        _disc_spans[r] = spans
+    return spans
+
+
+def fill_disc(fb, cx, cy, r, c):
+    """Filled disc of radius r around (cx, cy)"""
+    if r <= 0:
+        fb.pixel(cx, cy, c)
+        return cx, cy, 1, 1
+    spans = disc_spans(r)
+    for i in range(len(spans)):
+        h = spans[i]
+        fb.hline(cx - h, cy - r + i, 2 * h + 1, c)
+    return cx - r, cy - r, 2 * r + 1, 2 * r + 1
+
+
+def _capsule_row(y, x0, y0, x1, y1, r, rr, rl):
+    """x range (lo, hi) of the capsule on row y, or None"""
+    lo = hi = None
+
+    # Round caps
+    for cx, cy in ((x0, y0), (x1, y1)):
+        d = y - cy
+        if -r <= d <= r:
+            h = math.sqrt(rr - d * d)
+            if lo is None or cx - h < lo:
+                lo = cx - h
+            if hi is None or cx + h > hi:
+                hi = cx + h
+
+    # Body: within r of the line, between the two ends
+    dx, dy = x1 - x0, y1 - y0
+    ry = y - y0
+    if dy:
+        a = (dx * ry - rl) / dy
+        b = (dx * ry + rl) / dy
+        blo, bhi = (a, b) if a < b else (b, a)
+    elif -r <= ry <= r:
+        blo, bhi = -1e9, 1e9
+    else:
+        return (lo, hi) if lo is not None else None
+    if dx:
+        a = -ry * dy / dx
+        b = (dx * dx + dy * dy - ry * dy) / dx
+        plo, phi = (a, b) if a < b else (b, a)
+    elif 0 <= ry * dy <= dy * dy:
+        plo, phi = -1e9, 1e9
+    else:
+        return (lo, hi) if lo is not None else None
+    blo, bhi = max(blo, plo), min(bhi, phi)
+    if blo <= bhi:
+        if lo is None or x0 + blo < lo:
+            lo = x0 + blo
+        if hi is None or x0 + bhi > hi:
+            hi = x0 + bhi
+    return (lo, hi) if lo is not None else None
+
+
+def thick_line(fb, x0, y0, x1, y1, r, c):
+    """
+    Line of radius r with round ends (a capsule): every pixel within r of
+    the segment, one hline per row
+    """
+    if x0 == x1 and y0 == y1:
+        return fill_disc(fb, x0, y0, r, c)
+    if r <= 0:
+        fb.line(x0, y0, x1, y1, c)
+        return min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1
+
+    rr = r * r + 1e-6
+    rl = r * math.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2) + 1e-6
+    top, bottom = min(y0, y1) - r, max(y0, y1) + r
+    left = right = None
+    for y in range(top, bottom + 1):
+        span = _capsule_row(y, x0, y0, x1, y1, r, rr, rl)
+        if span is None:
+            continue
+        a, b = math.ceil(span[0] - 1e-6), math.floor(span[1] + 1e-6)
+        if a > b:
+            continue
+        fb.hline(a, y, b - a + 1, c)
+        if left is None or a < left:
+            left = a
+        if right is None or b > right:
+            right = b
+    if left is None:
+        return x0, y0, 0, 0
+    return left, top, right - left + 1, bottom - top + 1
+
+
+def union_rect(a, b):
+    """Bounding rect of two (x, y, w, h) rects"""
+    if not a[2] or not a[3]:
+        return b
+    if not b[2] or not b[3]:
+        return a
+    x, y = min(a[0], b[0]), min(a[1], b[1])
+    return (x, y, max(a[0] + a[2], b[0] + b[2]) - x, max(a[1] + a[3], b[1] + b[3]) - y)
+
+
+def polyline(fb, points, r, c):
+    """Connected thick segments through points (round joins)"""
+    if not points:
+        return 0, 0, 0, 0
+    if len(points) == 1:
+        return fill_disc(fb, points[0][0], points[0][1], r, c)
+    rect = (0, 0, 0, 0)
+    for i in range(1, len(points)):
+        (ax, ay), (bx, by) = points[i - 1], points[i]
+        rect = union_rect(rect, thick_line(fb, ax, ay, bx, by, r, c))
+    return rect
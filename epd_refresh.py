@@ -0,0 +1,135 @@
+"""
+Framebuffer diff and refresh scheduling for the e-paper sketch mode (MicroPython)
+Drawing goes into the framebuffer and is marked dirty; poll() pushes it
+to the panel as windowed partial refreshes, at most one per interval,
+with a full refresh every few partials to clear ghosting.
+"""
+import utime
+
+
+REFRESH_INTERVAL_MS = 250   # Minimum time between two partial refreshes
+FULL_REFRESH_EVERY = 20     # Partials before a full refresh clears ghosting
+
+
+def changed_window(old, new, row_bytes, rows, first=0, last=None):
+    """
+    Smallest (x0_byte, y0, x1_byte, y1) window (inclusive) holding every byte
+    that differs between two MONO_HLSB buffers, or None if they are equal
+    first/last: only look at these rows (e.g. the rows drawn into)
+    """
+    end = rows if last is None else min(last + 1, rows)
+    y0 = max(first, 0)
+    while y0 < end:
+        o = y0 * row_bytes
+        if old[o:o + row_bytes] != new[o:o + row_bytes]:
+            break
+        y0 += 1
+    if y0 >= end:
+        return None
+    y1 = end - 1
+    while y1 > y0:
+        o = y1 * row_bytes
+        if old[o:o + row_bytes] != new[o:o + row_bytes]:
+            break
+        y1 -= 1
+
+    x0 = row_bytes - 1
+    x1 = 0
+    for y in range(y0, y1 + 1):
+        o = y * row_bytes
+        for x in range(0, x0):
+            if old[o + x] != new[o + x]:
+                x0 = x
+                break
+        for x in range(row_bytes - 1, x1, -1):
+            if old[o + x] != new[o + x]:
+                x1 = x
+                break
+        if x0 == 0 and x1 == row_bytes - 1:
+            break
+    return x0, y0, x1, y1
+
+
+class RefreshScheduler:
+    """
+    Batches framebuffer changes into bounded-rate refreshes of an EPD_2in9
+    mark() the area drawn into (or invalidate() when unsure), then call
+    poll() every loop iteration and flush() when a stroke ends.
+    """
+
+    def __init__(self, epd, interval_ms=REFRESH_INTERVAL_MS, full_every=FULL_REFRESH_EVERY):
+        self.epd = epd
+        self.interval_ms = interval_ms
+        self.full_every = full_every
+        self.partials_since_full = 0
+        self.last_refresh = None
+        self.rows = None  # (first, last) rows drawn into since the last refresh
+        self.dirty = False
+
+        self.partial_count = 0
+        self.full_count = 0
+        self.empty_count = 0  # refreshes skipped because nothing changed
+
+    def mark(self, x, y, w, h):
+        """Note that the rect x, y, w, h of the framebuffer was drawn into"""
+        first, last = max(y, 0), min(y + h - 1, self.epd.height - 1)
+        if last < first or x + w <= 0 or x >= self.epd.width:
+            return
+        if self.rows is None:
+            self.rows = (first, last)
+        else:
+            self.rows = (min(self.rows[0], first), max(self.rows[1], last))
+        self.dirty = True
+
+    def invalidate(self):
+        """Anything may have changed: diff the whole framebuffer"""
+        self.rows = (0, self.epd.height - 1)
+        self.dirty = True
+
+    def due(self, now=None):
+        if not self.dirty:
+            return False
+        if self.last_refresh is None:
+            return True
+        now = utime.ticks_ms() if now is None else now
+        return utime.ticks_diff(now, self.last_refresh) >= self.interval_ms
+
+    def poll(self, now=None):
+        """Refresh if there are changes and the interval has passed; returns 'partial', 'full' or None"""
+        if not self.due(now):
+            return None
+        return self.flush()
+
+    def flush(self):
+        """Push pending changes now (e.g. on pen-up)"""
+        if not self.dirty:
+            return None
+        if self.partials_since_full >= self.full_every:
+            return self.full()
+
+        epd = self.epd
+        first, last = self.rows
+        self.dirty = False
+        self.rows = None
+        if epd.shown is None:
+            window = None  # panel contents unknown: send everything
+        else:
+            window = changed_window(epd.shown, epd.buffer, epd.row_bytes, epd.height, first, last)
+            if window is None:
+                self.empty_count += 1
+                return None
+        epd.display_Partial(epd.buffer, window)
+        self.last_refresh = utime.ticks_ms()
+        self.partials_since_full += 1
+        self.partial_count += 1
+        return 'partial'
+
+    def full(self):
+        """Full refresh of the framebuffer (clears ghosting)"""
+        self.epd.display_Base(self.epd.buffer)
+        self.last_refresh = utime.ticks_ms()
+        self.partials_since_full = 0
+        self.dirty = False
+        self.rows = None
+        self.full_count += 1
+        return 'full'
@@ -0,0 +1,112 @@
+"""
+Frame scheduling for ABook
+Runs at full rate only while something is moving and blocks on input otherwise
+"""
+import time
+import pygame
+from config import (FPS, IDLE_FRAME_TIMEOUT_MS, ACTIVE_LINGER_MS,
+                    POWER_SAVE_FPS, POWER_SAVE_IDLE_TIMEOUT_MS)
+
+
+class FrameStats:
+    """Frame count, busy time and wall time for one app state"""
+
+    def __init__(self):
+        self.frames = 0
+        self.busy = 0.0
+        self.wall = 0.0
+        self.worst = 0.0
+
+    def add(self, busy, wall):
+        self.frames += 1
+        self.busy += busy
+        self.wall += wall
+        self.worst = max(self.worst, busy)
+
+    @property
+    def avg_frame_ms(self):
+        return self.busy / self.frames * 1000 if self.frames else 0.0
+
+    @property
+    def duty_cycle(self):
+        """Fraction of wall time spent working rather than waiting"""
+        return self.busy / self.wall if self.wall else 0.0
+
+
+class FrameScheduler:
+    """
+    Decides how long to wait between frames
+    Active (strokes, scrolling, animations, recent input): FPS, or
+    POWER_SAVE_FPS in power save mode.
+    Idle: block in pygame.event.wait until input arrives or the idle
+    timeout passes.
+    """
+
+    def __init__(self, clock, active_fps=FPS):
+        self.clock = clock
+        self.active_fps = active_fps
+        self.power_save = False
+
+        self._active_until = 0
+        self._frame_start = time.perf_counter()
+        self._busy_start = self._frame_start
+        self.stats = {}  # state name -> FrameStats
+
+    def set_power_save(self, enabled):
+        self.power_save = enabled
+        print(f"[Frames] Power save {'on' if enabled else 'off'} "
+              f"({self.fps} FPS max, idle redraw every {self.idle_timeout_ms} ms)")
+
+    @property
+    def fps(self):
+        return min(self.active_fps, POWER_SAVE_FPS) if self.power_save else self.active_fps
+
+    @property
+    def idle_timeout_ms(self):
+        return POWER_SAVE_IDLE_TIMEOUT_MS if self.power_save else IDLE_FRAME_TIMEOUT_MS
+
+    def keep_active(self, ms=ACTIVE_LINGER_MS):
+        """Stay at full frame rate for at least `ms` milliseconds"""
+        self._active_until = max(self._active_until, pygame.time.get_ticks() + ms)
+
+    def get_events(self, animating=False):
+        """
+        Wait for the next frame and return its events
+        animating: True while the caller has something moving on screen
+        """
+        active = animating or pygame.time.get_ticks() < self._active_until
+
+        if active:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+        else:
+            first = pygame.event.wait(self.idle_timeout_ms)
+            events = [first] if first.type != pygame.NOEVENT else []
+            events.extend(pygame.event.get())
+            # Keep the clock's frame timing sane after a long wait
+            self.clock.tick()
+
+        if events:
+            self.keep_active()
+
+        self.begin_frame()
+        return events
+
+    def begin_frame(self):
+        """Start timing the work of a frame (get_events does this itself)"""
+        self._busy_start = time.perf_counter()
+
+    def end_frame(self, state):
+        """Record the frame that just finished under app state `state`"""
+        now = time.perf_counter()
+        busy = now - self._busy_start
+        wall = now - self._frame_start
+        self._frame_start = now
+        self.stats.setdefault(state, FrameStats()).add(busy, wall)
+
+    def report(self):
+        """Print per-state frame times and CPU duty cycle"""
+        print("[Frames] state        frames   avg ms  worst ms   duty")
+        for state, s in sorted(self.stats.items()):
+            print(f"[Frames] {state:<12} {s.frames:7d} {s.avg_frame_ms:8.2f} "
+                  f"{s.worst * 1000:9.2f} {s.duty_cycle * 100:5.1f}%")
@@ -6,6 +6,7 @@ Swipe gestures, long press, multi-touch
 import pygame
 import time
 from config import COLOR_BLACK, COLOR_WHITE
+from text_cache import render_text
 
 
 class GestureRecognizer:
@@ -26,10 +27,10 @@ class GestureRecognizer:
         self.last_gesture = None
         self.last_gesture_time = 0
         
-    def start_touch(self, pos):
-        """Register touch start"""
+    def start_touch(self, pos, now=None):
+        """Register touch start (now: event time in seconds, default the clock)"""
         self.touch_start_pos = pos
-        self.touch_start_time = time.time()
+        self.touch_start_time = time.time() if now is None else now
         self.is_long_press = False
         
     def update_touch(self, pos):
@@ -50,7 +51,7 @@ class GestureRecognizer:
         
         return None, None
     
-    def end_touch(self, pos):
+    def end_touch(self, pos, now=None):
         """Detect gesture on touch end"""
         if not self.touch_start_pos:
             return None, None
@@ -60,7 +61,7 @@ class GestureRecognizer:
         dy = pos[1] - self.touch_start_pos[1]
         distance = (dx**2 + dy**2) ** 0.5
         
-        elapsed = time.time() - self.touch_start_time
+        elapsed = (time.time() if now is None else now) - self.touch_start_time
         
         # Long press (already handled in update)
         if self.is_long_press:
@@ -182,7 +183,7 @@ class GestureIndicator:
         }
         
         text = gesture_icons.get(self.gesture_type, self.gesture_type)
-        text_surf = self.font_m.render(text, True, (50, 50, 50))
+        text_surf = render_text(self.font_m, text, True, (50, 50, 50))
         text_x = 150 + (300 - text_surf.get_width()) // 2
         screen.blit(text_surf, (text_x, y + 15))
 
@@ -208,7 +209,7 @@ class GestureTutorial:
         pygame.draw.rect(screen, (100, 100, 100), panel_rect, 3, border_radius=15)
         
         # Title
-        title = self.font_l.render("Smart Touch Gestures", True, COLOR_BLACK)
+        title = render_text(self.font_l, "Smart Touch Gestures", True, COLOR_BLACK)
         screen.blit(title, (100, 230))
         
         # Gestures
@@ -224,15 +225,15 @@ class GestureTutorial:
         y = 300
         for gesture, action in gestures:
             # Gesture
-            gesture_text = self.font_m.render(gesture, True, (50, 50, 50))
+            gesture_text = render_text(self.font_m, gesture, True, (50, 50, 50))
             screen.blit(gesture_text, (80, y))
             
             # Separator
-            sep_text = self.font_m.render("→", True, (150, 150, 150))
+            sep_text = render_text(self.font_m, "→", True, (150, 150, 150))
             screen.blit(sep_text, (280, y))
             
             # Action
-            action_text = self.font_m.render(action, True, (100, 100, 100))
+            action_text = render_text(self.font_m, action, True, (100, 100, 100))
             screen.blit(action_text, (320, y))
             
             y += 60
@@ -240,7 +241,7 @@ class GestureTutorial:
         # Close button
         close_btn = pygame.Rect(200, 720, 200, 50)
         pygame.draw.rect(screen, (80, 80, 80), close_btn, border_radius=10)
-        close_text = self.font_l.render("Got It!", True, COLOR_WHITE)
+        close_text = render_text(self.font_l, "Got It!", True, COLOR_WHITE)
         screen.blit(close_text, (240, 730))
         
         return close_btn
\ No newline at end of file
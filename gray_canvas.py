@@ -0,0 +1,164 @@
+"""
+Grayscale canvas planes for ABook
+In grayscale mode a layer is an 8-bit surface of ink coverage (0 = no
+ink, 255 = solid ink): a quarter of the bytes of an RGBA layer. The
+plane's palette gives the ink colour over white, so it only becomes RGB
+when it is shown, as a multiply blit onto what is below it.
+"""
+import numpy as np
+import pygame
+from config import NOTEPAD_INK
+
+
+INK = NOTEPAD_INK  # the pen's colour, for every plane (drawn, painted or loaded)
+FULL = 255         # coverage of solid ink
+
+
+def _lum(r, g, b):
+    return (r * 77 + g * 150 + b * 29) >> 8
+
+
+def coverage_palette(ink=INK):
+    """Colour of each coverage value, white to ink"""
+    return [tuple(255 + (c - 255) * v // 255 for c in ink) for v in range(256)]
+
+
+def ink_of(plane):
+    return tuple(plane.get_palette_at(255))[:3]
+
+
+def ink_coverage(color, ink=INK):
+    """Coverage that darkens white paper as much as an RGB(A) colour does"""
+    alpha = color[3] if len(color) > 3 else 255
+    return min(FULL, (255 - _lum(*color[:3])) * alpha // (255 - _lum(*ink)))
+
+
+def new_plane(size, ink=INK):
+    """Blank coverage plane"""
+    plane = pygame.Surface(size, 0, 8)
+    plane.set_palette(coverage_palette(ink))
+    plane.fill(0)
+    return plane
+
+
+def is_plane(surface):
+    return surface.get_bytesize() == 1
+
+
+_scratch = None  # RGB copy of the plane area being shown
+
+
+def show(target, plane, dest=(0, 0), area=None):
+    """
+    Composite a plane onto an RGB(A) surface: the plane's colours
+    multiply what is there (ink over the page, white leaves it as is)
+    """
+    global _scratch
+    area = plane.get_rect() if area is None else pygame.Rect(area).clip(plane.get_rect())
+    if not area.width or not area.height:
+        return
+    w, h = area.size
+    if (_scratch is None or _scratch.get_width() < w or _scratch.get_height() < h
+            or _scratch.get_bitsize() != target.get_bitsize()):
+        sw = max(w, _scratch.get_width()) if _scratch else w
+        sh = max(h, _scratch.get_height()) if _scratch else h
+        _scratch = pygame.Surface((sw, sh), 0, target)
+    # Palette lookup and multiply are both SDL fast paths; a multiply
+    # blit straight from the 8-bit plane is ~20x slower
+    _scratch.blit(plane, (0, 0), area)
+    target.blit(_scratch, dest, pygame.Rect(0, 0, w, h), special_flags=pygame.BLEND_RGB_MULT)
+
+
+def coverage(surface, rect=None, ink=INK):
+    """
+    Ink coverage of rect as a uint8 array indexed [x, y]
+    For RGB(A) surfaces: how much the pixel darkens white paper, relative
+    to solid ink (see ink_coverage).
+    """
+    rect = surface.get_rect() if rect is None else pygame.Rect(rect)
+    xs, ys = slice(rect.left, rect.right), slice(rect.top, rect.bottom)
+    if is_plane(surface):
+        return pygame.surfarray.pixels2d(surface)[xs, ys].copy()
+    rgb = pygame.surfarray.pixels3d(surface)[xs, ys]
+    dark = 255 - _lum(rgb[:, :, 0].astype(np.uint32), rgb[:, :, 1].astype(np.uint32),
+                      rgb[:, :, 2].astype(np.uint32))
+    del rgb
+    if surface.get_flags() & pygame.SRCALPHA:
+        alpha = pygame.surfarray.pixels_alpha(surface)[xs, ys]
+        dark = dark * alpha // 255
+        del alpha
+    return np.minimum(dark * 255 // (255 - _lum(*ink)), FULL).astype(np.uint8)
+
+
+def luminance(plane):
+    """Grey level of every pixel as a uint8 array indexed [y, x] (e.g. for OCR)"""
+    lut = np.array([_lum(*c[:3]) for c in plane.get_palette()], dtype=np.uint8)
+    return np.ascontiguousarray(lut[pygame.surfarray.pixels2d(plane)].T)
+
+
+def blend(dst, src, rect, opaque=False):
+    """
+    Draw src over dst inside rect (same position in both)
+    Works for any mix of planes and RGBA surfaces; onto a plane, coverage
+    combines like alpha: c = d + s - d * s / 255 (opaque: c = s).
+    """
+    rect = pygame.Rect(rect).clip(dst.get_rect()).clip(src.get_rect())
+    if not rect.width or not rect.height:
+        return
+    if is_plane(dst):
+        s = coverage(src, rect, ink_of(dst))
+        d = pygame.surfarray.pixels2d(dst)[rect.left:rect.right, rect.top:rect.bottom]
+        if opaque:
+            d[...] = s
+        else:
+            s = s.astype(np.uint32)
+            d[...] = 255 - ((255 - d.astype(np.uint32)) * (255 - s) + 127) // 255
+        del d
+    elif is_plane(src):
+        dst.blit(to_rgba(src, rect), rect.topleft)
+    else:
+        dst.blit(src, rect.topleft, rect)
+
+
+def to_rgba(plane, rect=None):
+    """SRCALPHA surface of rect: ink colour with the coverage as alpha"""
+    rect = plane.get_rect() if rect is None else pygame.Rect(rect)
+    out = pygame.Surface(rect.size, pygame.SRCALPHA)
+    out.fill((*ink_of(plane), 0))
+    alpha = pygame.surfarray.pixels_alpha(out)
+    alpha[...] = coverage(plane, rect)
+    del alpha
+    return out
+
+
+def from_surface(surface, ink=INK):
+    """Plane with the coverage of an RGB(A) surface (painted pages, RGBA layers)"""
+    plane = new_plane(surface.get_size(), ink)
+
+    # Only the rows with something on them need converting
+    if surface.get_flags() & pygame.SRCALPHA:
+        blank = pygame.surfarray.pixels_alpha(surface) == 0
+    else:
+        blank = pygame.surfarray.pixels2d(surface) == surface.map_rgb((255, 255, 255))
+    rows = np.flatnonzero(~blank.all(axis=0))
+    del blank
+    if len(rows):
+        top, bottom = int(rows[0]), int(rows[-1]) + 1
+        pixels = pygame.surfarray.pixels2d(plane)
+        pixels[:, top:bottom] = coverage(surface, (0, top, surface.get_width(), bottom - top), ink)
+        del pixels
+    return plane
+
+
+def tobytes(plane):
+    """Coverage bytes, row by row"""
+    return pygame.image.tostring(plane, 'P')
+
+
+def frombytes(data, size, ink=INK):
+    plane = new_plane(size, ink)
+    w, h = size
+    pixels = pygame.surfarray.pixels2d(plane)
+    pixels[...] = np.frombuffer(data, dtype=np.uint8).reshape(h, w).T
+    del pixels
+    return plane
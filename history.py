@@ -0,0 +1,301 @@
+"""
+Undo/redo history for ABook
+Edits record only the tiles they touched (zlib-compressed), and layer
+operations record the layers they add or remove, under a memory budget.
+"""
+import itertools
+import zlib
+import numpy as np
+import pygame
+from gray_canvas import is_plane
+
+
+TILE_SIZE = 64
+HISTORY_BUDGET = 8 * 1024 * 1024  # bytes of compressed undo data per history (or shared group)
+COMPRESS_LEVEL = 1                # fast; ink tiles are mostly transparent anyway
+
+
+def read_region(surface, rect):
+    """Raw RGBA (or plane coverage) bytes of rect, zlib-compressed"""
+    if is_plane(surface):
+        pixels = pygame.surfarray.pixels2d(surface)[rect.left:rect.right, rect.top:rect.bottom]
+        return zlib.compress(pixels.tobytes(), COMPRESS_LEVEL)
+    return zlib.compress(pygame.image.tostring(surface.subsurface(rect), 'RGBA'), COMPRESS_LEVEL)
+
+
+def write_region(surface, rect, data):
+    """Restore bytes from read_region exactly (no alpha blending)"""
+    if is_plane(surface):
+        pixels = pygame.surfarray.pixels2d(surface)
+        pixels[rect.left:rect.right, rect.top:rect.bottom] = np.frombuffer(
+            zlib.decompress(data), dtype=np.uint8).reshape(rect.size)
+        del pixels
+        return
+    pixels = pygame.image.frombuffer(zlib.decompress(data), rect.size, 'RGBA')
+    surface.fill((0, 0, 0, 0), rect)
+    surface.blit(pixels, rect.topleft, special_flags=pygame.BLEND_RGBA_ADD)
+
+
+def ink_rect(surface):
+    """
+    Bounding rect of the non-transparent pixels (zero-size if none)
+    Same result as Surface.get_bounding_rect(), ~10x faster on a full page.
+    On grayscale planes: the pixels with any ink coverage.
+    """
+    if is_plane(surface):
+        alpha = pygame.surfarray.pixels2d(surface)  # indexed [x, y]
+    else:
+        alpha = pygame.surfarray.pixels_alpha(surface)
+    rows = np.flatnonzero(alpha.any(axis=0))
+    if not len(rows):
+        return pygame.Rect(0, 0, 0, 0)
+    top, bottom = int(rows[0]), int(rows[-1]) + 1
+    cols = np.flatnonzero(alpha[:, top:bottom].any(axis=1))
+    del alpha
+    return pygame.Rect(int(cols[0]), top, int(cols[-1]) + 1 - int(cols[0]), bottom - top)
+
+
+class RegionEdit:
+    """
+    Pixel edit of one layer, stored tile by tile
+    Call touch(rect) before drawing into rect; the tiles it covers are
+    saved the first time they are touched (copy-on-write). finish() then
+    stores the new contents of those tiles for redo.
+
+    layer can be a models.Layer or a plain SRCALPHA surface or plane.
+    """
+
+    def __init__(self, layer, label="Edit"):
+        self.layer = layer
+        self.label = label
+        self.before = {}  # (tx, ty) -> compressed bytes
+        self.after = {}
+
+    @property
+    def surface(self):
+        if isinstance(self.layer, pygame.Surface):
+            return self.layer
+        return self.layer.surf
+
+    def _tile_rect(self, tx, ty, bounds):
+        return pygame.Rect(tx * TILE_SIZE, ty * TILE_SIZE, TILE_SIZE, TILE_SIZE).clip(bounds)
+
+    def touch(self, rect):
+        surf = self.surface
+        bounds = surf.get_rect()
+        rect = pygame.Rect(rect).clip(bounds)
+        if not rect.width or not rect.height:
+            return
+        for ty in range(rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE + 1):
+            for tx in range(rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE + 1):
+                if (tx, ty) not in self.before:
+                    self.before[(tx, ty)] = read_region(surf, self._tile_rect(tx, ty, bounds))
+
+    def finish(self):
+        surf = self.surface
+        bounds = surf.get_rect()
+        for tx, ty in self.before:
+            self.after[(tx, ty)] = read_region(surf, self._tile_rect(tx, ty, bounds))
+        return bool(self.before)
+
+    def _apply(self, tiles):
+        surf = self.surface
+        bounds = surf.get_rect()
+        for (tx, ty), data in tiles.items():
+            rect = self._tile_rect(tx, ty, bounds)
+            write_region(surf, rect, data)
+            if hasattr(self.layer, 'mark'):
+                self.layer.mark(rect)
+        if hasattr(self.layer, 'modified'):
+            self.layer.modified = True
+
+    def undo(self, notebook):
+        self._apply(self.before)
+
+    def redo(self, notebook):
+        self._apply(self.after)
+
+    @property
+    def size(self):
+        return sum(map(len, self.before.values())) + sum(map(len, self.after.values()))
+
+
+class PackedLayer:
+    """
+    A layer taken out of a notebook, with its inked pixels compressed
+    rect: the layer's current ink bounds, if the caller already has them
+    """
+
+    def __init__(self, layer, rect=None):
+        self.layer = layer
+        self.data = None
+        self.rect = None
+        if layer.loaded:
+            if rect is None:
+                rect = layer.bounds
+            if rect.width and rect.height:
+                self.rect = rect
+                self.data = read_region(layer.surf, rect)
+            layer.surf = None  # frees the pixels until the layer comes back
+
+    def unpack(self):
+        layer = self.layer
+        if self.data is not None:
+            layer.surf = None
+            write_region(layer.surf, self.rect, self.data)  # onto a fresh blank canvas
+            layer.mark(self.rect)
+            self.data = None
+        return layer
+
+    @property
+    def size(self):
+        return len(self.data) if self.data else 0
+
+
+class LayerListEdit:
+    """
+    Change to a notebook's layer list (add, delete, reorder, merge)
+    Layers that are not in the current list are kept packed.
+    bounds: optional {id(layer): ink rect} for the layers removed now
+    """
+
+    def __init__(self, notebook, before, after, label="Layers", bounds=None):
+        self.label = label
+        self.before = list(before)
+        self.after = list(after)
+        self._packed = {}  # id(layer) -> PackedLayer
+        self._pack_missing(self.after, bounds or {})
+
+    def _pack_missing(self, current, bounds=None):
+        current_ids = {id(l) for l in current}
+        for layer in self.before + self.after:
+            if id(layer) not in current_ids and id(layer) not in self._packed:
+                rect = bounds.get(id(layer)) if bounds else None
+                self._packed[id(layer)] = PackedLayer(layer, rect)
+
+    def _restore(self, notebook, layers):
+        for layer in layers:
+            packed = self._packed.pop(id(layer), None)
+            if packed:
+                packed.unpack()
+        notebook.layers = list(layers)
+        self._pack_missing(layers)
+
+    def undo(self, notebook):
+        self._restore(notebook, self.before)
+
+    def redo(self, notebook):
+        self._restore(notebook, self.after)
+
+    @property
+    def size(self):
+        return sum(p.size for p in self._packed.values())
+
+
+class TemplateEdit:
+    """Change of a notebook's background template"""
+    size = 0
+
+    def __init__(self, before, after, label="Template"):
+        self.label = label
+        self.before = before
+        self.after = after
+
+    def undo(self, notebook):
+        notebook.template_name = self.before
+
+    def redo(self, notebook):
+        notebook.template_name = self.after
+
+
+class CompoundEdit:
+    """Several edits undone and redone as one step"""
+
+    def __init__(self, edits, label="Edit"):
+        self.edits = list(edits)
+        self.label = label
+
+    def undo(self, notebook):
+        for edit in reversed(self.edits):
+            edit.undo(notebook)
+
+    def redo(self, notebook):
+        for edit in self.edits:
+            edit.redo(notebook)
+
+    @property
+    def size(self):
+        return sum(e.size for e in self.edits)
+
+
+class History:
+    """
+    Undo/redo stacks for one notebook page, limited to max_bytes
+    Histories that share() one list (the pages of a notebook) also share
+    the budget: the oldest edits of any of them are dropped first.
+    """
+    _pushes = itertools.count()
+
+    def __init__(self, max_bytes=HISTORY_BUDGET):
+        self.max_bytes = max_bytes
+        self.done = []
+        self.undone = []
+        self.stamps = []  # push order of the done edits
+        self.group = [self]
+
+    def share(self, group):
+        """Join group (a list of histories) and its budget"""
+        group.append(self)
+        self.group = group
+
+    def push(self, edit):
+        self.done.append(edit)
+        self.stamps.append(next(History._pushes))
+        self.undone.clear()
+        self._trim()
+
+    def _trim(self):
+        """Drop the oldest edits once over budget (always keep the newest)"""
+        used = sum(h.memory_used for h in self.group)
+        while used > self.max_bytes:
+            older = [h for h in self.group if h.done and (h is not self or len(h.done) > 1)]
+            if older:
+                h = min(older, key=lambda h: h.stamps[0])
+                h.stamps.pop(0)
+                used -= h.done.pop(0).size
+                continue
+            # Then the redo steps left on other pages
+            others = [h for h in self.group if h is not self and h.undone]
+            if not others:
+                break
+            for h in others:
+                used -= sum(e.size for e in h.undone)
+                h.undone.clear()
+
+    def can_undo(self):
+        return bool(self.done)
+
+    def can_redo(self):
+        return bool(self.undone)
+
+    def undo(self, notebook):
+        if not self.done:
+            return None
+        edit = self.done.pop()
+        self.stamps.pop()
+        edit.undo(notebook)
+        self.undone.append(edit)
+        return edit
+
+    def redo(self, notebook):
+        if not self.undone:
+            return None
+        edit = self.undone.pop()
+        edit.redo(notebook)
+        self.done.append(edit)
+        self.stamps.append(next(History._pushes))
+        return edit
+
+    @property
+    def memory_used(self):
+        return sum(e.size for e in self.done) + sum(e.size for e in self.undone)
@@ -4,6 +4,8 @@ Modern grayscale icons for Notes, Books, and Tests
 """
 import pygame
 from config import *
+from text_cache import render_text
+from book_reader import Book
 
 
 def draw_modern_notes_icon(screen, x, y, size=60):
@@ -105,7 +107,7 @@ class HomeView:
         self.draw_status_bar(screen)
         
         # Title
-        title = self.font_l.render("ABook", True, COLOR_BLACK)
+        title = render_text(self.font_l, "ABook", True, COLOR_BLACK)
         title_x = (600 - title.get_width()) // 2
         screen.blit(title, (title_x, 50))
         
@@ -141,7 +143,7 @@ class HomeView:
             icon_func(screen, icon_x, icon_y, icon_size)
             
             # Draw folder label below icon
-            label_text = self.font_l.render(label, True, COLOR_BLACK)
+            label_text = render_text(self.font_l, label, True, COLOR_BLACK)
             label_x = rect.centerx - label_text.get_width() // 2
             label_y = rect.y + 140
             screen.blit(label_text, (label_x, label_y))
@@ -156,18 +158,18 @@ class HomeView:
         # Back button - GRAYSCALE
         self.back_btn = pygame.Rect(10, 40, 70, 40)
         pygame.draw.rect(screen, (200, 200, 200), self.back_btn, border_radius=20)  # Light grey
-        back_text = self.font_s.render("< Back", True, COLOR_BLACK)
+        back_text = render_text(self.font_s, "< Back", True, COLOR_BLACK)
         screen.blit(back_text, (20, 50))
         
         # Folder title
         folder_names = {'notes': 'Notes', 'books': 'Books', 'tests': 'Tests'}
-        title = self.font_l.render(folder_names.get(self.current_folder, 'Files'), True, COLOR_BLACK)
+        title = render_text(self.font_l, folder_names.get(self.current_folder, 'Files'), True, COLOR_BLACK)
         screen.blit(title, (100, 45))
         
         # New notebook button - FOR PORTRAIT - GRAYSCALE
         self.new_btn = pygame.Rect(450, 45, 120, 40)  # Portrait positioning
         pygame.draw.rect(screen, (100, 100, 100), self.new_btn, border_radius=20)  # Dark grey
-        btn_text = self.font_s.render("+ New", True, COLOR_WHITE)
+        btn_text = render_text(self.font_s, "+ New", True, COLOR_WHITE)
         screen.blit(btn_text, (self.new_btn.centerx - 25, self.new_btn.centery - 10))
         
         # Filter notebooks by folder
@@ -187,8 +189,13 @@ class HomeView:
             # Draw notebook icon/preview area with enhanced icon
             icon_rect = pygame.Rect(rect.x + 10, rect.y + 10, 80, 90)
             
-            # Use appropriate icon based on folder
-            if self.current_folder == 'notes':
+            # First page as last seen, else an icon based on folder
+            thumbnail = None if isinstance(nb, Book) else nb.pages[0].thumbnail
+            if thumbnail is not None:
+                thumb_rect = thumbnail.get_rect(center=icon_rect.center)
+                screen.blit(thumbnail, thumb_rect)
+                pygame.draw.rect(screen, (180, 180, 180), thumb_rect, 1)
+            elif self.current_folder == 'notes':
                 draw_modern_notes_icon(screen, icon_rect.x, icon_rect.y, 70)
             elif self.current_folder == 'books':
                 draw_modern_books_icon(screen, icon_rect.x, icon_rect.y, 70)
@@ -202,16 +209,20 @@ class HomeView:
                 # Editing mode
                 pygame.draw.rect(screen, COLOR_WHITE, name_rect, border_radius=5)
                 pygame.draw.rect(screen, COLOR_BLACK, name_rect, 1, border_radius=5)
-                txt = self.font_m.render(temp_name + "|", True, COLOR_BLACK)
+                txt = render_text(self.font_m, temp_name + "|", True, COLOR_BLACK)
             else:
                 # Display mode
-                txt = self.font_m.render(nb.name, True, COLOR_BLACK)
+                txt = render_text(self.font_m, nb.name, True, COLOR_BLACK)
             
             screen.blit(txt, (name_rect.x + 10, name_rect.y + 20))
             
-            # Add page count indicator
-            page_count = len(nb.layers)
-            pages_text = self.font_s.render(f"{page_count} {'page' if page_count == 1 else 'pages'}", True, (120, 120, 120))
+            # Add page count indicator (reflowable books: how far they have been read)
+            if isinstance(nb, Book):
+                info = f"{nb.progress:.0%} read"
+            else:
+                page_count = len(nb.pages)
+                info = f"{page_count} {'page' if page_count == 1 else 'pages'}"
+            pages_text = render_text(self.font_s, info, True, (120, 120, 120))
             screen.blit(pages_text, (name_rect.x + 10, name_rect.y + 48))
             
             self.nb_rects.append((rect, name_rect, actual_idx))
@@ -224,7 +235,7 @@ class HomeView:
             ]
             y = 400
             for line in msg_lines:
-                msg = self.font_m.render(line, True, (120, 120, 120))
+                msg = render_text(self.font_m, line, True, (120, 120, 120))
                 msg_x = (600 - msg.get_width()) // 2
                 screen.blit(msg, (msg_x, y))
                 y += 35
@@ -241,16 +252,16 @@ class HomeView:
         # Time (center)
         import datetime
         time_str = datetime.datetime.now().strftime("%H:%M")
-        time_surface = self.font_s.render(time_str, True, COLOR_WHITE)
+        time_surface = render_text(self.font_s, time_str, True, COLOR_WHITE)
         time_x = (600 - time_surface.get_width()) // 2
         screen.blit(time_surface, (time_x, 5))
         
         # WiFi icon (left)
-        wifi_text = self.font_s.render("WiFi", True, COLOR_WHITE)
+        wifi_text = render_text(self.font_s, "WiFi", True, COLOR_WHITE)
         screen.blit(wifi_text, (10, 5))
         
         # Battery (right)
-        battery_text = self.font_s.render("85%", True, COLOR_WHITE)
+        battery_text = render_text(self.font_s, "85%", True, COLOR_WHITE)
         screen.blit(battery_text, (545, 5))
     
     def draw(self, screen, notebooks, keyboard, renaming_idx, temp_name):
@@ -4,6 +4,7 @@ Improved UI Components with better icons and grayscale design
 import pygame
 from datetime import datetime
 from config import *
+from text_cache import render_text, get_font
 
 
 def draw_improved_status_bar(screen, font_s):
@@ -14,7 +15,7 @@ def draw_improved_status_bar(screen, font_s):
     
     # Time - CENTERED
     time_str = datetime.now().strftime("%H:%M")
-    time_surface = font_s.render(time_str, True, (40, 40, 40))
+    time_surface = render_text(font_s, time_str, True, (40, 40, 40))
     time_x = (bar_width - time_surface.get_width()) // 2
     screen.blit(time_surface, (time_x, 4))
     
@@ -151,7 +152,7 @@ class ImprovedKeyboard:
     """Improved on-screen keyboard with better design - GRAYSCALE"""
     def __init__(self, font):
         self.font = font
-        self.font_key = pygame.font.SysFont('Arial', 18, bold=True)
+        self.font_key = get_font('Arial', 18, bold=True)
         self.visible = False
         self.shift_active = False
         
@@ -164,6 +165,10 @@ class ImprovedKeyboard:
             ['Space', '.', '-', '_', 'Done']
         ]
         self.key_rects = []
+        
+        # Word completions shown above the keys
+        self.suggestions = []
+        self.suggestion_rects = []
     
     def draw(self, screen):
         """Draw improved keyboard - GRAYSCALE"""
@@ -183,6 +188,8 @@ class ImprovedKeyboard:
         # Top border
         pygame.draw.line(screen, (150, 150, 150), (0, panel_y), (600, panel_y), 2)
         
+        self._draw_suggestions(screen, panel_y)
+        
         self.key_rects = []
         y = panel_y + 15
         
@@ -225,7 +232,7 @@ class ImprovedKeyboard:
                 if key.isalpha() and not self.shift_active:
                     display_key = key.lower()
                 
-                txt = self.font_key.render(display_key, True, text_color)
+                txt = render_text(self.font_key, display_key, True, text_color)
                 screen.blit(txt, 
                           (rect.centerx - txt.get_width() // 2,
                            rect.centery - txt.get_height() // 2))
@@ -235,6 +242,30 @@ class ImprovedKeyboard:
             
             y += 52
     
+    def _draw_suggestions(self, screen, panel_y):
+        """Draw completion chips in a strip above the keyboard"""
+        self.suggestion_rects = []
+        if not self.suggestions:
+            return
+        
+        strip_y = panel_y - 44
+        pygame.draw.rect(screen, (245, 245, 245), (0, strip_y, 600, 44))
+        pygame.draw.line(screen, (200, 200, 200), (0, strip_y), (600, strip_y), 1)
+        
+        x = 10
+        for word in self.suggestions:
+            txt = render_text(self.font, word, True, (40, 40, 40))
+            w = txt.get_width() + 24
+            if x + w > 590:
+                break
+            rect = pygame.Rect(x, strip_y + 6, w, 32)
+            pygame.draw.rect(screen, (255, 255, 255), rect, border_radius=16)
+            pygame.draw.rect(screen, (170, 170, 170), rect, 1, border_radius=16)
+            screen.blit(txt, (rect.centerx - txt.get_width() // 2,
+                              rect.centery - txt.get_height() // 2))
+            self.suggestion_rects.append((rect, word))
+            x += w + 8
+    
     def _get_key_width(self, key):
         """Get width for specific key"""
         if key == 'Space':
@@ -251,6 +282,10 @@ class ImprovedKeyboard:
         if not self.visible:
             return None
         
+        for rect, word in self.suggestion_rects:
+            if rect.collidepoint(pos):
+                return ('suggestion', word)
+        
         for rect, key in self.key_rects:
             if rect.collidepoint(pos):
                 if key == '⇧':
@@ -0,0 +1,87 @@
+"""
+Layer operations for ABook
+Merge and flatten composite only the inked part of each layer, leave
+hidden layers out, never change what is drawn, and return one undoable
+edit.
+"""
+import pygame
+from history import RegionEdit, LayerListEdit, CompoundEdit
+from gray_canvas import blend
+
+
+def ink_bounds(layer):
+    """Rect containing the layer's ink, or None if it is empty"""
+    return None if layer.empty else layer.bounds
+
+
+def merge_layers(notebook, indices, label="Merge Layers"):
+    """
+    Merge the layers at `indices` into one, bottom to top
+    The upper layers are composited into the lowest one, inside the union
+    of their ink bounds only, and the merged layer takes the place of the
+    topmost merged one; all other layers keep their order. Layers in
+    between must be hidden, so the page looks the same after the merge.
+    Returns (edit, index of the merged layer), or (None, None) if there
+    are fewer than two layers to merge or a visible layer lies between them.
+    """
+    indices = sorted(set(indices))
+    if len(indices) < 2:
+        return None, None
+
+    before = list(notebook.layers)
+    merged = set(indices)
+    if any(before[i].visible for i in range(indices[0], indices[-1]) if i not in merged):
+        return None, None
+
+    base = before[indices[0]]
+    upper = [(before[i], ink_bounds(before[i])) for i in indices[1:]]
+    edits = []
+
+    areas = [rect for _, rect in upper if rect]
+    if areas:
+        area = areas[0].unionall(areas[1:])
+        pixels = RegionEdit(base, label)
+        pixels.touch(area)
+        for layer, rect in upper:
+            if rect:
+                blend(base.surf, layer.surf, rect, layer.opaque)
+        pixels.finish()
+        base.mark(area)
+        base.modified = True
+        edits.append(pixels)
+
+    after = []
+    for i, layer in enumerate(before):
+        if i == indices[-1]:
+            after.append(base)
+        elif i not in merged:
+            after.append(layer)
+    notebook.layers = after
+    # Removed layers are packed from the bounds found above
+    bounds = {id(layer): rect or pygame.Rect(0, 0, 0, 0) for layer, rect in upper}
+    edits.append(LayerListEdit(notebook, before, after, label, bounds))
+
+    print(f"[Layers] {label}: {len(indices)} layers into 1")
+    return CompoundEdit(edits, label), after.index(base)
+
+
+def merge_down(notebook, index):
+    """Merge layer `index` into the nearest visible layer below it"""
+    layers = notebook.layers
+    if not 0 <= index < len(layers) or not layers[index].visible:
+        return None, None
+    below = [i for i in range(index) if layers[i].visible]
+    if not below:
+        return None, None
+    return merge_layers(notebook, [below[-1], index], "Merge Down")
+
+
+def merge_selected(notebook, indices):
+    """Merge a set of layers with no visible layer between them"""
+    return merge_layers(notebook, indices, "Merge Layers")
+
+
+def flatten(notebook):
+    """Merge all visible layers; hidden layers stay as they are"""
+    visible = [i for i, layer in enumerate(notebook.layers) if layer.visible]
+    return merge_layers(notebook, visible, "Flatten")
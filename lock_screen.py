@@ -4,6 +4,7 @@ Swipe right to unlock
 """
 import pygame
 from config import *
+from text_cache import render_text, get_font
 
 
 class LockScreen:
@@ -11,8 +12,9 @@ class LockScreen:
     
     def __init__(self, fonts):
         self.font_s, self.font_m, self.font_l = fonts
-        self.font_xl = pygame.font.SysFont('Arial', 48, bold=True)
-        self.font_xxl = pygame.font.SysFont('Arial', 64, bold=True)
+        self.font_xl = get_font('Arial', 48, bold=True)
+        self.font_xxl = get_font('Arial', 64, bold=True)
+        self.font_brand = get_font('Arial', 42)
         
         # Swipe state
         self.swipe_start_x = None
@@ -31,24 +33,22 @@ class LockScreen:
         time_str = now.strftime("%H:%M")
         date_str = now.strftime("%A, %B %d")
         
-        time_text = self.font_xxl.render(time_str, True, (255, 255, 255))
+        time_text = render_text(self.font_xxl, time_str, True, (255, 255, 255))
         time_x = (600 - time_text.get_width()) // 2
         screen.blit(time_text, (time_x, 200))
         
-        date_text = self.font_m.render(date_str, True, (180, 180, 180))
+        date_text = render_text(self.font_m, date_str, True, (180, 180, 180))
         date_x = (600 - date_text.get_width()) // 2
         screen.blit(date_text, (date_x, 280))
         
         # ABook branding with lowercase 'b'
-        abook_font = pygame.font.SysFont('Arial', 42, bold=False)
-        
         # Draw "ABook" with capital A and lowercase b
-        abook_text = abook_font.render("ABook", True, (255, 255, 255))
+        abook_text = render_text(self.font_brand, "ABook", True, (255, 255, 255))
         abook_x = (600 - abook_text.get_width()) // 2
         screen.blit(abook_text, (abook_x, 350))
         
         # Subtitle
-        subtitle_text = self.font_s.render("Digital Notebook Reimagined", True, (150, 150, 150))
+        subtitle_text = render_text(self.font_s, "Digital Notebook Reimagined", True, (150, 150, 150))
         subtitle_x = (600 - subtitle_text.get_width()) // 2
         screen.blit(subtitle_text, (subtitle_x, 400))
         
@@ -80,12 +80,12 @@ class LockScreen:
         
         # Instruction text
         if not self.is_swiping:
-            instruction = self.font_m.render("Swipe up to unlock", True, (180, 180, 180))
+            instruction = render_text(self.font_m, "Swipe up to unlock", True, (180, 180, 180))
             instruction_x = (600 - instruction.get_width()) // 2
             screen.blit(instruction, (instruction_x, swipe_y - 50))
         
         # "Powered by ABook" at bottom
-        footer_text = self.font_s.render("Powered by Abook™", True, (100, 100, 100))
+        footer_text = render_text(self.font_s, "Powered by Abook™", True, (100, 100, 100))
         footer_x = (600 - footer_text.get_width()) // 2
         screen.blit(footer_text, (footer_x, 980))
     
@@ -2,17 +2,25 @@
 ABook - Digital Notebook Application
 Main application file - FULLY UPDATED
 """
+from startup import get_startup_profiler, DeferredInit, lazy_import
 import pygame
 import sys
 from config import *
 from boot import run_boot_sequence
+from display import RotatedDisplay
+from touch_calibration import AffineCalibration
+from frame_scheduler import FrameScheduler
 from improved_ui_components import ImprovedKeyboard
 from models import Notebook
+from history import RegionEdit, LayerListEdit, TemplateEdit
+from layer_ops import flatten, merge_down
+from sample_books import create_sample_books
 from home_view import HomeView
-from notepad_view import NotepadView
-from text_view import TextView
-from text_processor import TextProcessor
+from book_reader import Book, find_books
 from lock_screen import LockScreen
+from text_cache import render_text, get_font
+from word_completion import get_word_completer
+from session_log import get_event_source, configure_session
 
 # New UI components
 try:
@@ -23,60 +31,74 @@ except ImportError:
     ENHANCED_UI_AVAILABLE = False
     print("[Info] Enhanced UI components not available")
 
+# Not needed to reach the lock screen: imported when first used
+notepad_module = lazy_import('notepad_view')
+text_module = lazy_import('text_view')
+reader_module = lazy_import('reader_view')
+text_processor_module = lazy_import('text_processor')
+
 
 class ABookApp:
     """Main application class"""
     def __init__(self):
-        pygame.init()
-        
-        # Display setup - LANDSCAPE WINDOW with PORTRAIT CONTENT
-        # Physical window is 1024x600 (landscape)
-        self.screen = pygame.display.set_mode((1024, 600))
-        
-        # Virtual portrait surface (600x1024) that we'll rotate and display
-        self.portrait_surface = pygame.Surface((600, 1024))
-        
-        pygame.display.set_caption("ABook")
-        self.clock = pygame.time.Clock()
-        
-        # Fonts
-        self.font_s = pygame.font.SysFont('Arial', 16)
-        self.font_m = pygame.font.SysFont('Arial', 20)
-        self.font_l = pygame.font.SysFont('Arial', 32, bold=True)
-        fonts = (self.font_s, self.font_m, self.font_l)
-        
-        # Lock screen
-        self.lock_screen = LockScreen(fonts)
-        self.is_locked = True  # Start with lock screen
-        
-        # Views
-        self.home_view = HomeView(fonts)
-        self.notepad_view = NotepadView(fonts)
-        self.text_view = TextView(fonts)
-        self.current_view = 'home'
-        
-        # Text processor
-        self.text_processor = TextProcessor()
-        
-        # Data - Create sample notebooks in different folders
-        self.notebooks = [
-            Notebook("My First Note", folder='notes'),
-        ]
-        
-        # Add Atomic Habits study notebook with chapter structure
-        atomic_habits = self._create_atomic_habits_book()
-        self.notebooks.append(atomic_habits)
+        self.startup = get_startup_profiler()
+        self.startup.mark("modules imported")
+        
+        with self.startup.phase("display"):
+            pygame.init()
+            
+            # Display setup - LANDSCAPE WINDOW with PORTRAIT CONTENT
+            # Physical window is 1024x600 (landscape)
+            self.screen = pygame.display.set_mode((1024, 600))
+            
+            # Virtual portrait surface (600x1024), presented rotated
+            # 90° counter-clockwise by the display backend
+            self.display = RotatedDisplay(self.screen, (600, 1024))
+            self.portrait_surface = self.display.surface
+            self.load_touch_calibration()
+            
+            pygame.display.set_caption("ABook")
+            self.clock = pygame.time.Clock()
+            self.frame_scheduler = FrameScheduler(self.clock)
+            self.epaper = None  # EPaperBackend, see enable_epaper()
+        
+        with self.startup.phase("fonts and views"):
+            # Fonts
+            self.font_s = get_font('Arial', 16)
+            self.font_m = get_font('Arial', 20)
+            self.font_l = get_font('Arial', 32, bold=True)
+            fonts = self.fonts = (self.font_s, self.font_m, self.font_l)
+            
+            # Lock screen
+            self.lock_screen = LockScreen(fonts)
+            self.is_locked = True  # Start with lock screen
+            
+            # Views - the rest are built when first shown (see notepad_view etc.)
+            self.home_view = HomeView(fonts)
+            self._notepad_view = None
+            self._text_view = None
+            self._reader_view = None
+            self.reader_busy = False  # the reader has pages to prepare
+            self.current_view = 'home'
         
-        # Add a story book for reading and highlighting
-        story_book = self._create_story_book()
-        self.notebooks.append(story_book)
+        # Text processor - created by a deferred step (or on first use)
+        self._text_processor = None
         
-        # Add 50-page sample book
-        sample_book = self._create_sample_book()
-        self.notebooks.append(sample_book)
+        with self.startup.phase("sample books"):
+            # Data - Create sample notebooks in different folders
+            self.notebooks = [
+                Notebook("My First Note", folder='notes'),
+            ]
+            
+            # Built-in books - pages are painted when first viewed - and
+            # text / markdown books from BOOKS_DIR (read when opened)
+            self.notebooks.extend(create_sample_books())
+            self.notebooks.extend(find_books())
         
         self.active_notebook_idx = 0
         self.active_layer_idx = 0
+        self.stroke_edit = None  # Undo record of the stroke being drawn
+        self.event_time = None   # Recorded time of the event being handled (replay)
         
         # UI components - Use improved keyboard
         self.keyboard = ImprovedKeyboard(self.font_s)
@@ -109,442 +131,285 @@ class ABookApp:
         
         # Processing state
         self.processing = False
-    
-    def _create_atomic_habits_book(self):
-        """Create Atomic Habits study notebook with chapter structure"""
-        from models import Layer
         
-        print("[Setup] Creating Atomic Habits study notebook...")
-        
-        book = Notebook("Atomic Habits", "books")
-        book.layers = []
-        
-        # Chapter structure and key concepts
-        chapter_pages = [
-            ["ATOMIC HABITS", "", "by James Clear", "", "", "", "A study notebook"],
-            ["", "INTRODUCTION", "", "The Surprising Power", "of Atomic Habits", "", "", "Notes:"],
-            
-            # THE FUNDAMENTALS
-            ["", "PART I", "THE FUNDAMENTALS", "", "Why Tiny Changes", "Make a Big Difference"],
-            ["", "Chapter 1", "The Surprising Power", "of Atomic Habits", "", "", "Key Points:", ""],
-            ["", "Chapter 2", "How Your Habits", "Shape Your Identity", "(and Vice Versa)", "", "Key Points:", ""],
-            ["", "Chapter 3", "How to Build", "Better Habits", "in 4 Simple Steps", "", "Key Points:", ""],
-            
-            # THE 1ST LAW: MAKE IT OBVIOUS
-            ["", "PART II", "THE 1ST LAW", "Make It Obvious", "", "", ""],
-            ["", "Chapter 4", "The Man Who Didn't", "Look Right", "", "Implementation", "Intentions", ""],
-            ["", "Chapter 5", "The Best Way to", "Start a New Habit", "", "Habit Stacking", "", ""],
-            ["", "Chapter 6", "Motivation Is", "Overrated;", "Environment Often", "Matters More", "", ""],
-            ["", "Chapter 7", "The Secret to", "Self-Control", "", "Make Bad Habits", "Invisible", ""],
-            
-            # THE 2ND LAW: MAKE IT ATTRACTIVE
-            ["", "PART III", "THE 2ND LAW", "Make It Attractive", "", "", ""],
-            ["", "Chapter 8", "How to Make a", "Habit Irresistible", "", "Temptation", "Bundling", ""],
-            ["", "Chapter 9", "The Role of Family", "and Friends in", "Shaping Your Habits", "", "", ""],
-            ["", "Chapter 10", "How to Find and", "Fix the Causes", "of Your Bad Habits", "", "", ""],
-            
-            # THE 3RD LAW: MAKE IT EASY
-            ["", "PART IV", "THE 3RD LAW", "Make It Easy", "", "", ""],
-            ["", "Chapter 11", "Walk Slowly, but", "Never Backward", "", "Two-Minute Rule", "", ""],
-            ["", "Chapter 12", "The Law of", "Least Effort", "", "Prime Your", "Environment", ""],
-            ["", "Chapter 13", "How to Stop", "Procrastinating by", "Using the", "Two-Minute Rule", "", ""],
-            ["", "Chapter 14", "How to Make Good", "Habits Inevitable", "and Bad Habits", "Impossible", "", ""],
-            
-            # THE 4TH LAW: MAKE IT SATISFYING
-            ["", "PART V", "THE 4TH LAW", "Make It Satisfying", "", "", ""],
-            ["", "Chapter 15", "The Cardinal Rule", "of Behavior Change", "", "What Is Immediately", "Rewarded Is Repeated", ""],
-            ["", "Chapter 16", "How to Stick with", "Good Habits", "Every Day", "", "Habit Tracking", ""],
-            ["", "Chapter 17", "How an", "Accountability Partner", "Can Change", "Everything", "", ""],
-            
-            # ADVANCED TACTICS
-            ["", "PART VI", "ADVANCED TACTICS", "", "How to Go from", "Being Merely Good", "to Being Truly Great"],
-            ["", "Chapter 18", "The Truth About", "Talent", "(When Genes Matter", "and When They Don't)", "", ""],
-            ["", "Chapter 19", "The Goldilocks Rule:", "How to Stay", "Motivated in Life", "and Work", "", ""],
-            ["", "Chapter 20", "The Downside of", "Creating Good Habits", "", "Keep Your Identity", "Small", ""],
-            
-            # CONCLUSION
-            ["", "CONCLUSION", "", "The Secret to", "Results That Last", "", "", ""],
-            
-            # Personal Notes Pages
-            ["", "MY HABITS", "TO BUILD", "", "", "", "", ""],
-            ["", "MY HABITS", "TO BREAK", "", "", "", "", ""],
-            ["", "HABIT TRACKER", "", "Month: _______", "", "", "", ""],
-            ["", "IDENTITY", "STATEMENT", "", "I am someone who...", "", "", ""],
-            ["", "KEY TAKEAWAYS", "", "", "", "", "", ""],
-            ["", "ACTION PLAN", "", "", "", "", "", ""],
-            ["", "PROGRESS NOTES", "", "", "", "", "", ""],
-            ["", "REFLECTIONS", "", "", "", "", "", ""],
-        ]
-        
-        # Create pages with proper formatting
-        for page_lines in chapter_pages:
-            layer = Layer("Blank")
-            layer.surf.fill((255, 255, 255))  # White background
-            
-            # Draw the text
-            font_title = pygame.font.SysFont('Arial', 26, bold=True)
-            font_content = pygame.font.SysFont('Arial', 22)
-            
-            y = 50
-            line_spacing = 45
-            
-            for line in page_lines:
-                if line:
-                    # Detect if it's a title (all caps or specific keywords)
-                    if line.isupper() or line in ["PART I", "PART II", "PART III", "PART IV", "PART V", "PART VI"]:
-                        text_surf = font_title.render(line, True, (0, 0, 0))
-                        x = (layer.surf.get_width() - text_surf.get_width()) // 2
-                    else:
-                        text_surf = font_content.render(line, True, (0, 0, 0))
-                        x = 40  # Left aligned for regular text
-                    
-                    layer.surf.blit(text_surf, (x, y))
-                
-                y += line_spacing
-                
-                # Handle overflow (shouldn't happen with our content)
-                if y > layer.surf.get_height() - 100:
-                    break
-            
-            book.layers.append(layer)
-        
-        print(f"[Setup] Created Atomic Habits book with {len(book.layers)} pages")
-        return book
+        # Work that can wait until the boot animation is playing
+        self.deferred_init = DeferredInit(self.startup)
+        self.deferred_init.add("notepad view", lambda: self.notepad_view)
+        self.deferred_init.add("text processor", lambda: self.text_processor)
+        self.deferred_init.add("word completion index", get_word_completer, thread_safe=True)
     
+    @property
+    def text_processor(self):
+        if self._text_processor is None:
+            self._text_processor = text_processor_module.TextProcessor()
+        return self._text_processor
     
-    def _create_story_book(self):
-        """Create a short story for reading and highlighting"""
-        from models import Layer
-        
-        print("[Setup] Creating storybook 'The Little Star'...")
+    @property
+    def notepad_view(self):
+        if self._notepad_view is None:
+            self._notepad_view = notepad_module.NotepadView(self.fonts)
+        return self._notepad_view
+    
+    @property
+    def text_view(self):
+        if self._text_view is None:
+            self._text_view = text_module.TextView(self.fonts)
+        return self._text_view
+    
+    @property
+    def reader_view(self):
+        if self._reader_view is None:
+            self._reader_view = reader_module.ReaderView(self.fonts)
+        return self._reader_view
+    
+    def active_layer(self):
+        """The layer strokes currently go to"""
+        return self.notebooks[self.active_notebook_idx].layers[self.active_layer_idx]
+    
+    def is_animating(self):
+        """True while something on screen needs full frame rate"""
+        if self.is_locked:
+            return self.lock_screen.is_swiping
+        if self.processing:
+            return True
+        if self.current_view == 'notepad' and self.notepad_view.drawing:
+            return True
+        if self.current_view == 'reader' and self.reader_busy:
+            return True  # neighbouring pages still to be prepared
+        return bool(self.gesture_indicator and self.gesture_indicator.active)
+    
+    def load_touch_calibration(self):
+        """Use the window touch calibration file, if there is one"""
+        try:
+            calibration = AffineCalibration.load(TOUCH_CALIBRATION_FILE)
+        except OSError:
+            return
+        except ValueError as e:
+            print(f"[Display] Ignoring {TOUCH_CALIBRATION_FILE}: {e}")
+            return
+        self.display.transform.set_calibration(calibration)
+        print(f"[Display] Touch calibration loaded from {TOUCH_CALIBRATION_FILE}")
+    
+    def live_events(self):
+        """Events for the next frame - sleeps until input arrives unless something is animating"""
+        return self.frame_scheduler.get_events(self.is_animating())
+    
+    def run(self, skip_boot=False):
+        """Main application loop"""
+        if skip_boot:
+            self.deferred_init.drain()
+        else:
+            # Show boot animation (on landscape screen)
+            run_boot_sequence(self.screen, self.clock, self.deferred_init)
+        lock_screen_shown = False
+        self.frame_scheduler.keep_active()
         
-        book = Notebook("The Little Star", "books")
-        book.layers = []
+        # Live input, or a recorded session (see session_log)
+        self.event_source = get_event_source()
         
-        # Simple story - each page is one layer
-        story_pages = [
-            # Title page
-            "THE LITTLE STAR\n\n\nA Tale of Dreams\nand Discovery",
-            
-            # Chapter 1
-            "CHAPTER 1\nThe Lonely Sky\n\nHigh above the Earth, in the vast\nexpanse of space, there lived a little\nstar named Stella.\n\nUnlike the other stars who shone\nbrightly and confidently, Stella felt\nsmall and insignificant.",
-            
-            "Every night, she watched the Moon\nglow softly, admired by everyone below.\n\nShe saw planets with their rings and\nmoons, celebrated for their beauty.\n\n\"What am I here for?\" Stella wondered,\nher light flickering softly. \"I'm just one\ntiny star among billions.\"",
-            
-            # Chapter 2
-            "CHAPTER 2\nThe Wish\n\nOne clear night, a child named Luna sat\nby her window, gazing at the sky.\n\nShe had moved to a new city and felt\nlonely, far from her old friends.\n\n\"I wish I had someone to talk to,\"\nLuna whispered to the darkness.",
-            
-            "Stella heard the wish. It traveled\nthrough space like a gentle melody,\nreaching her heart.\n\nFor the first time in her long existence,\nsomeone had noticed her light.\n\n\"Maybe I can be her friend,\" thought\nStella. She began to shine a little\nbrighter, sending her light toward Luna.",
-            
-            "Luna noticed a star that seemed to\ntwinkle just for her.\n\nIt wasn't the brightest star, but there\nwas something special about it.\nSomething warm.\n\n\"Hello, little star,\" Luna said softly.\n\"Are you saying hello back?\"",
-            
-            # Chapter 3
-            "CHAPTER 3\nThe Connection\n\nNight after night, Luna returned to her\nwindow. She would tell Stella about her\nday, her worries, her dreams.\n\nAnd Stella would listen, her light\nsteady and true.",
-            
-            "Stella realized something wonderful:\nshe didn't need to be the biggest or\nbrightest.\n\nShe just needed to be there, constant\nand caring.\n\nHer purpose wasn't to outshine others,\nbut to provide comfort to one lonely girl.",
-            
-            "\"You're my favorite star,\" Luna told her\none night. \"Not because you're the\nbrightest, but because you're mine.\"\n\nStella glowed with happiness.\n\nShe understood now that every star, no\nmatter how small, can light up someone's\ndarkness.",
-            
-            # Chapter 4
-            "CHAPTER 4\nNew Friends\n\nAs weeks passed, Luna made friends at\nher new school.\n\nShe was less lonely now, but she never\nforgot to check on Stella each night.\n\n\"I have friends now,\" Luna told the star.\n\"But you're still special to me.\"",
+        # Main loop
+        while True:
+            events = self.event_source.get(self.live_events)
+            if self.event_source.replayer:
+                self.frame_scheduler.begin_frame()
             
-            "Stella noticed something else too.\nOther children had started looking at\nthe sky, following Luna's gaze.\n\nSoon, many people were looking up,\nfinding their own stars, making their\nown wishes.\n\nStella had inspired others simply by\nbeing herself.",
+            for event in events:
+                self.handle_event(event)
             
-            # Chapter 5  
-            "CHAPTER 5\nThe Truth\n\nYears passed. Luna grew up, but she\nnever stopped looking for her special\nstar.\n\nEven when life got busy, even when\nclouds covered the sky, she knew\nStella was there.",
+            self.update_frame()
+            self.draw_frame()
             
-            "On Luna's eighteenth birthday, she sat\nby the same window, now with her own\ndaughter.\n\n\"See that star?\" Luna pointed. \"That's\nmy friend Stella. She taught me that\nI'm never alone.\"\n\nThe little girl's eyes widened.",
+            # Copy the portrait frame to the landscape screen, rotated
+            # 90° counter-clockwise - buttons on LEFT side
+            state = self.view_state()
+            self.present_frame(state)
+            self.idle_work()
             
-            "\"Just look up and find one that speaks\nto your heart,\" Luna smiled.\n\nStella watched the scene, her light\nwarm with contentment.\n\nShe had found her purpose: to remind\nothers that they matter, that they're\nseen, that they're loved.",
+            if not lock_screen_shown:
+                lock_screen_shown = True
+                self.startup.mark("first frame after boot")
+                self.startup.report()
             
-            # Epilogue
-            "EPILOGUE\n\n\nEvery star has a story.\n\nEvery heart has a light.\n\nAnd somewhere in the universe,\nthey find each other.\n\n\nTHE END",
-        ]
-        
-        # Create each page as a layer
-        font_text = pygame.font.SysFont('Georgia', 22)
+            self.event_source.view(state)
+            self.frame_scheduler.end_frame(state)
+    
+    def idle_work(self):
+        """
+        Work for after the frame is shown (reader: pages either side of
+        this one); True if there was any
+        """
+        if self.current_view == 'reader' and self.reader_busy:
+            self.reader_busy = self.reader_view.prefetch()
+            return True
+        return False
+    
+    def view_state(self):
+        return 'locked' if self.is_locked else self.current_view
+    
+    def enable_epaper(self, preview=True, clock=None):
+        """
+        Also send every frame to a simulated e-paper panel (epaper_backend)
+        preview: show what the panel displays instead of the rendered frame
+        """
+        from epaper_backend import EPaperBackend, EPaperSimulator
+        sink = EPaperSimulator(self.portrait_surface.get_size())
+        self.epaper = EPaperBackend(sink, clock=clock) if clock else EPaperBackend(sink)
+        self.epaper_preview = preview
+    
+    def present_frame(self, state):
+        """Show the rendered portrait frame (and refresh the e-paper panel if enabled)"""
+        if self.epaper:
+            self.epaper.present(self.portrait_surface, state)
+            if self.epaper_preview:
+                self.portrait_surface.blit(self.epaper.sink.surface(), (0, 0))
+        self.display.present()
+    
+    def handle_event(self, event):
+        """Handle one pygame event"""
+        # Recorded time of replayed events, so input timing does not depend on replay speed
+        self.event_time = getattr(event, 'session_time', None)
+        
+        mouse_pos = None
+        if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP):
+            # Use each event's own position (portrait, see display.DisplayTransform)
+            mouse_pos = self.display.transform.to_portrait(event.pos)
+        
+        if event.type == pygame.QUIT:
+            if self._reader_view:
+                self._reader_view.close()
+            self.frame_scheduler.report()
+            if self.epaper:
+                self.epaper.report()
+            pygame.quit()
+            sys.exit()
+        
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            # Handle lock screen
+            if self.is_locked:
+                self.lock_screen.handle_mouse_down(mouse_pos)
+            else:
+                self.handle_mouse_down(mouse_pos)
         
-        for page_text in story_pages:
-            layer = Layer("Blank")
-            layer.surf.fill((255, 255, 255))  # White background
-            
-            # Draw text lines
-            lines = page_text.split('\n')
-            y = 60
-            
-            for line in lines:
-                if line.strip():
-                    text_surf = font_text.render(line, True, (20, 20, 20))
-                    x = 50  # Left margin
-                    layer.surf.blit(text_surf, (x, y))
-                y += 32  # Line spacing
-            
-            book.layers.append(layer)
+        elif event.type == pygame.MOUSEMOTION:
+            # Handle lock screen swipe
+            if self.is_locked:
+                self.lock_screen.handle_mouse_motion(mouse_pos)
+            elif self.current_view == 'notepad' and self.notepad_view.drawing:
+                # Only recorded here - drawn once per frame below
+                self.notepad_view.add_stroke_point(mouse_pos, self.event_time)
         
-        print(f"[Setup] Created 'The Little Star' with {len(book.layers)} pages")
-        return book
-    
-    def _create_sample_book(self):
-        """Create a 50-page sample storybook"""
-        from models import Layer
-        
-        print("[Setup] Creating sample storybook...")
-        
-        book = Notebook("The Digital Adventure", "books")
-        book.layers = []
-        
-        # Story content - A simple adventure story
-        story_pages = [
-            # Page 1-5: Introduction
-            ["THE DIGITAL ADVENTURE", "", "By ABook", "", "", "A tale of technology", "and creativity"],
-            ["Chapter 1", "The Beginning", "", "Once upon a time,", "in a small town,", "there lived a student", "named Alex."],
-            ["Alex loved to take", "notes and draw,", "but traditional notebooks", "were getting expensive.", "", "One day, Alex discovered", "ABook!"],
-            ["It was perfect!", "Alex could write, draw,", "and organize everything", "in one place.", "", "This was the beginning", "of an amazing journey."],
-            ["Chapter 2", "Discovery", "", "Alex explored every", "feature.", "", "The pen tool felt natural,", "like real paper."],
-            
-            # Page 6-10
-            ["Templates were amazing!", "Grid paper for math,", "lined paper for essays,", "blank pages for art.", "", "Each template made", "work easier."],
-            ["The layer system was", "brilliant.", "", "Alex could separate", "notes from diagrams,", "text from drawings.", "", "Very organized!"],
-            ["Chapter 3", "Creating", "", "Alex started creating", "more and more.", "", "Book reports,", "study guides,", "and sketches."],
-            ["The OCR feature was", "magical!", "", "Handwritten notes became", "searchable text", "instantly.", "", "No more retyping!"],
-            ["Templates helped Alex", "work faster.", "", "Math on graph paper,", "essays on lined paper,", "sketches on blank.", "", "Perfect every time."],
-            
-            # Continue with more readable pages
-            ["Chapter 4", "Sharing", "", "Alex wanted to share", "work with classmates.", "", "The PDF export was", "perfect for this."],
-            ["Teachers were impressed.", "Clean, organized", "submissions.", "", "Easy to read", "and grade.", "", "Classmates asked", "for tips!"],
-            ["The database feature", "was genius.", "", "Automatic backups meant", "never losing work.", "", "Everything saved", "safely."],
-            ["Chapter 5", "Organization", "", "Alex organized notebooks", "into folders.", "", "Notes for daily work,", "Books for projects."],
-            ["Each notebook could", "have multiple layers.", "", "Rough drafts on one,", "final work on another.", "", "Perfect separation!"],
-            
-            # More pages
-            ["The word search helped", "with vocabulary.", "", "Look up any word,", "see definitions and", "synonyms instantly.", "", "Learning was easier."],
-            ["Chapter 6", "Creativity", "", "Alex started drawing", "more.", "", "Sketches, diagrams,", "and comics."],
-            ["Different pen sizes", "for different effects.", "", "Thin lines for details,", "thick lines for bold.", "", "Every drawing looked", "great!"],
-            ["Colors stayed clean.", "Black ink on white,", "just like a real", "notebook.", "", "Simple, professional,", "beautiful."],
-            ["Templates inspired", "creativity.", "", "Graph paper for", "geometric art,", "blank pages for", "freeform drawing."],
-            
-            # Pages 21-30
-            ["Chapter 7", "Advanced Features", "", "Alex discovered more.", "", "Layer merging,", "reordering,", "visibility controls."],
-            ["Moving layers changed", "the composition.", "", "Hide and show parts,", "perfect for", "presentations.", "", "So much control!"],
-            ["The search feature", "found anything", "instantly.", "", "Notes from months ago,", "specific topics.", "", "Everything findable."],
-            ["Chapter 8", "Productivity", "", "Alex became more", "productive.", "", "Work finished faster,", "quality improved."],
-            ["No more lost papers.", "No more messy erasures.", "No more running out", "of pages.", "", "Everything digital,", "everything perfect."],
-            ["Homework took less", "time.", "", "Notes were clearer.", "Studies were more", "effective.", "", "Grades improved!"],
-            ["Teachers noticed", "the change.", "", "Better organization,", "clearer submissions,", "more creativity.", "", "Alex was thriving."],
-            ["Chapter 9", "Helping Others", "", "Alex taught friends", "to use ABook.", "", "Showed them all", "the features."],
-            ["Study groups became", "better.", "", "Everyone had", "organized notes.", "Sharing was easier.", "", "Teams improved."],
-            ["The whole class", "improved.", "", "Better grades,", "better organization,", "better creativity.", "", "ABook helped everyone."],
-            
-            # Pages 31-40
-            ["Chapter 10", "Achievement", "", "At the end of the year,", "Alex looked back.", "", "Hundreds of pages,", "dozens of projects."],
-            ["All in one place.", "All organized.", "All accessible.", "", "This was the power", "of digital notebooks.", "", "Truly amazing!"],
-            ["The science fair", "project was entirely", "in ABook.", "", "Research, diagrams,", "calculations,", "sketches."],
-            ["Alex won first place!", "", "The judges were", "impressed by the", "organization.", "", "ABook made it", "possible."],
-            ["Chapter 11", "The Future", "", "Alex planned to use", "ABook forever.", "", "High school, college,", "career."],
-            ["New features were", "coming.", "", "Cloud sync,", "collaboration tools,", "more templates.", "", "The future was bright."],
-            ["Mobile apps would", "arrive.", "", "Take notes anywhere,", "on phone or tablet.", "", "Perfect for", "on-the-go!"],
-            ["Alex dreamed of", "becoming a developer.", "", "Creating tools", "like ABook,", "helping others learn.", "", "Technology for good."],
-            ["Chapter 12", "Reflection", "", "What made ABook", "special?", "", "The freedom it gave", "to create and learn."],
-            ["Digital didn't mean", "impersonal.", "", "It meant powerful,", "flexible, accessible.", "", "Best of both worlds."],
-            
-            # Pages 41-50
-            ["Alex wrote in ABook", "daily.", "", "Thoughts, ideas,", "dreams.", "", "Everything preserved,", "organized."],
-            ["Friends and family", "saw the transformation.", "", "More organized,", "more creative,", "more successful.", "", "Thanks to ABook."],
-            ["Chapter 13", "Gratitude", "", "Alex was grateful", "for discovering ABook.", "", "It changed", "everything."],
-            ["Every notebook told", "a story.", "", "Math problems solved,", "essays written,", "art created.", "", "All preserved forever."],
-            ["The journey continued.", "", "New notebooks,", "new layers,", "new pages every day.", "", "Always growing,", "always learning."],
-            ["Chapter 14", "Inspiration", "", "Alex inspired others.", "", "Teachers, students,", "artists.", "", "Everyone could benefit."],
-            ["ABook became", "essential.", "", "Not just for school,", "but for life.", "", "Planning, creating,", "organizing, dreaming."],
-            ["The Digital Adventure", "continued every day.", "", "New challenges,", "new projects,", "new achievements.", "", "All in ABook."],
-            ["Epilogue", "", "And so the story", "continues.", "", "With ABook,", "anything is possible.", "", "Your adventure awaits!"],
-            ["THE END", "", "", "Thank you for reading!", "", "", "Start your own", "Digital Adventure", "today!", "", "- ABook Team"]
-        ]
-        
-        # Create pages with better rendering
-        for page_num, content in enumerate(story_pages, 1):
-            layer = Layer("Blank")
-            
-            # Fill with white to ensure clean background
-            layer.surf.fill((255, 255, 255))
-            
-            # Page number - smaller, top right
-            try:
-                page_font = pygame.font.SysFont("Arial", 14)
-                page_text = page_font.render(f"Page {page_num}", True, (150, 150, 150))
-                layer.surf.blit(page_text, (layer.surf.get_width() - 100, 25))
-            except:
-                pass
-            
-            # Content - PROPER SPACING
-            try:
-                content_font = pygame.font.SysFont("Arial", 22)
-                title_font = pygame.font.SysFont("Arial", 26, bold=True)
-            except:
-                content_font = pygame.font.SysFont(None, 22)
-                title_font = pygame.font.SysFont(None, 26)
-            
-            y = 90
-            line_spacing = 32  # Fixed spacing between lines
-            
-            for line in content:
-                if not line:  # Empty line
-                    y += line_spacing
-                    continue
-                
-                # Choose font
-                if line.startswith("Chapter") or line == "THE DIGITAL ADVENTURE" or line == "THE END" or line == "Epilogue":
-                    font = title_font
-                    color = (0, 0, 0)
-                else:
-                    font = content_font
-                    color = (60, 60, 60)
-                
-                # Render with anti-aliasing
-                text_surface = font.render(line, True, color)
-                layer.surf.blit(text_surface, (50, y))
-                y += line_spacing
+        elif event.type == pygame.MOUSEBUTTONUP:
+            # Handle lock screen unlock
+            if self.is_locked:
+                if self.lock_screen.handle_mouse_up(mouse_pos):
+                    self.is_locked = False
+                    print("[Lock Screen] Unlocked!")
+            else:
+                # Detect gestures
+                if self.gesture_recognizer:
+                    gesture, data = self.gesture_recognizer.end_touch(mouse_pos, self.event_time)
+                    if gesture:
+                        self.handle_gesture(gesture, data)
                 
-                # Don't overflow page
-                if y > layer.surf.get_height() - 50:
-                    break
-            
-            book.layers.append(layer)
-        
-        print(f"[Setup] ✓ Storybook created with {len(book.layers)} pages")
-        return book
+                if self.current_view == 'notepad' and self.notepad_view.drawing:
+                    self.end_stroke()
+        
+        elif event.type == pygame.KEYDOWN:
+            # Ctrl+Z undo, Ctrl+Y / Ctrl+Shift+Z redo
+            if (not self.is_locked and self.current_view == 'notepad'
+                    and event.mod & pygame.KMOD_CTRL):
+                if event.key == pygame.K_z and event.mod & pygame.KMOD_SHIFT:
+                    self.redo()
+                elif event.key == pygame.K_z:
+                    self.undo()
+                elif event.key == pygame.K_y:
+                    self.redo()
+            # Page Up / Page Down turn pages
+            elif not self.is_locked and self.current_view == 'notepad':
+                if event.key == pygame.K_PAGEUP:
+                    self.turn_page(-1)
+                elif event.key == pygame.K_PAGEDOWN:
+                    self.turn_page(1)
+            elif not self.is_locked and self.current_view == 'reader':
+                if event.key in (pygame.K_PAGEUP, pygame.K_LEFT):
+                    self.reader_view.turn(-1)
+                elif event.key in (pygame.K_PAGEDOWN, pygame.K_RIGHT, pygame.K_SPACE):
+                    self.reader_view.turn(1)
+                self.reader_busy = True
+        
+        elif event.type == pygame.MOUSEWHEEL:
+            # Handle scrolling in notepad and text views (only when unlocked)
+            if not self.is_locked:
+                if self.current_view == 'notepad':
+                    self.notepad_view.handle_scroll(event.y)
+                elif self.current_view == 'text':
+                    self.text_view.handle_scroll(event.y)
     
-    def run(self):
-        """Main application loop"""
-        # Show boot animation (on landscape screen)
-        run_boot_sequence(self.screen, self.clock)
-        
-        # Main loop
-        while True:
-            # Get mouse position in landscape window coordinates
-            landscape_mouse_pos = pygame.mouse.get_pos()
-            
-            # Transform to portrait coordinates for 90° counter-clockwise rotation
-            # Portrait is 600 wide x 1024 tall
-            # After 90° CCW: portrait (0,0) -> landscape (0, 600)
-            # Formula: portrait_x = 600 - landscape_y
-            #          portrait_y = landscape_x
-            portrait_mouse_pos = (
-                600 - landscape_mouse_pos[1],    # Portrait X = 600 - landscape Y
-                landscape_mouse_pos[0]            # Portrait Y = landscape X
-            )
-            mouse_pos = portrait_mouse_pos
-            
-            # Event handling
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+    def update_frame(self):
+        """Per-frame work that is not drawing"""
+        # Draw the stroke samples collected this frame in one go
+        if self.current_view == 'notepad' and self.notepad_view.drawing:
+            layer = self.active_layer()
+            if self.notepad_view.render_stroke(layer.surf):
+                # Make sure the surface is marked as modified
+                layer.modified = True
+    
+    def draw_frame(self):
+        """Render the current state to the portrait surface"""
+        # Render to PORTRAIT surface (600x1024)
+        if self.is_locked:
+            # Show lock screen
+            self.lock_screen.draw(self.portrait_surface)
+        else:
+            # Render current view
+            if self.current_view == 'home':
+                self.home_view.draw(
+                    self.portrait_surface,
+                    self.notebooks,
+                    self.keyboard,
+                    self.renaming_idx,
+                    self.temp_name
+                )
+            elif self.current_view == 'notepad':
+                notebook = self.notebooks[self.active_notebook_idx]
+                self.notepad_view.draw(self.portrait_surface, notebook, notebook.history)
+            elif self.current_view == 'reader':
+                self.reader_view.draw(self.portrait_surface)
+            elif self.current_view == 'text':
+                self.text_view.draw(self.portrait_surface)
                 
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # Handle lock screen
-                    if self.is_locked:
-                        self.lock_screen.handle_mouse_down(mouse_pos)
-                    else:
-                        self.handle_mouse_down(mouse_pos)
+                # Show processing indicator
+                if self.processing:
+                    overlay = pygame.Surface((600, 1024), pygame.SRCALPHA)
+                    overlay.fill((0, 0, 0, 128))
+                    self.portrait_surface.blit(overlay, (0, 0))
+                    msg = render_text(self.font_l, "Processing...", True, COLOR_WHITE)
+                    self.portrait_surface.blit(msg, (300 - 100, 512))
+            
+            # Draw settings panels on top of everything (NEW!)
+            if ENHANCED_UI_AVAILABLE:
+                if self.show_wifi_panel and self.wifi_panel:
+                    self.wifi_panel.draw(self.portrait_surface)
                 
-                elif event.type == pygame.MOUSEMOTION:
-                    # Handle lock screen swipe
-                    if self.is_locked:
-                        self.lock_screen.handle_mouse_motion(mouse_pos)
-                    elif self.current_view == 'notepad' and self.notepad_view.drawing:
-                        notebook = self.notebooks[self.active_notebook_idx]
-                        layer = notebook.layers[self.active_layer_idx]
-                        # Update the surface with the new stroke
-                        self.notepad_view.draw_stroke(layer.surf, mouse_pos)
-                        # Make sure the surface is marked as modified
-                        layer.modified = True
+                if self.show_battery_panel and self.battery_panel:
+                    self.battery_panel.draw(self.portrait_surface)
                 
-                elif event.type == pygame.MOUSEBUTTONUP:
-                    # Handle lock screen unlock
-                    if self.is_locked:
-                        if self.lock_screen.handle_mouse_up(mouse_pos):
-                            self.is_locked = False
-                            print("[Lock Screen] Unlocked!")
-                    else:
-                        # Detect gestures
-                        if self.gesture_recognizer:
-                            gesture, data = self.gesture_recognizer.end_touch(mouse_pos)
-                            if gesture:
-                                self.handle_gesture(gesture, data)
-                        
-                        if self.current_view == 'notepad':
-                            self.notepad_view.stop_drawing()
+                if self.show_time_panel and self.time_panel:
+                    self.time_panel.draw(self.portrait_surface)
                 
-                elif event.type == pygame.MOUSEWHEEL:
-                    # Handle scrolling in notepad and text views (only when unlocked)
-                    if not self.is_locked:
-                        if self.current_view == 'notepad':
-                            self.notepad_view.handle_scroll(event.y)
-                        elif self.current_view == 'text':
-                            self.text_view.handle_scroll(event.y)
-            
-            # Render to PORTRAIT surface (600x1024)
-            if self.is_locked:
-                # Show lock screen
-                self.lock_screen.draw(self.portrait_surface)
-            else:
-                # Render current view
-                if self.current_view == 'home':
-                    self.home_view.draw(
-                        self.portrait_surface,
-                        self.notebooks,
-                        self.keyboard,
-                        self.renaming_idx,
-                        self.temp_name
-                    )
-                elif self.current_view == 'notepad':
-                    notebook = self.notebooks[self.active_notebook_idx]
-                    self.notepad_view.draw(self.portrait_surface, notebook)
-                elif self.current_view == 'text':
-                    self.text_view.draw(self.portrait_surface)
-                    
-                    # Show processing indicator
-                    if self.processing:
-                        overlay = pygame.Surface((600, 1024), pygame.SRCALPHA)
-                        overlay.fill((0, 0, 0, 128))
-                        self.portrait_surface.blit(overlay, (0, 0))
-                        msg = self.font_l.render("Processing...", True, COLOR_WHITE)
-                        self.portrait_surface.blit(msg, (300 - 100, 512))
+                # Draw gesture indicator
+                if self.gesture_indicator:
+                    self.gesture_indicator.draw(self.portrait_surface)
                 
-                # Draw settings panels on top of everything (NEW!)
-                if ENHANCED_UI_AVAILABLE:
-                    if self.show_wifi_panel and self.wifi_panel:
-                        self.wifi_panel.draw(self.portrait_surface)
-                    
-                    if self.show_battery_panel and self.battery_panel:
-                        self.battery_panel.draw(self.portrait_surface)
-                    
-                    if self.show_time_panel and self.time_panel:
-                        self.time_panel.draw(self.portrait_surface)
-                    
-                    # Draw gesture indicator
-                    if self.gesture_indicator:
-                        self.gesture_indicator.draw(self.portrait_surface)
-                    
-                    # Draw gesture tutorial on first launch
-                    if self.show_gesture_tutorial and self.gesture_tutorial:
-                        self.gesture_tutorial.draw(self.portrait_surface)
-            
-            # Rotate portrait surface 90° counter-clockwise - buttons on LEFT side
-            rotated = pygame.transform.rotate(self.portrait_surface, 90)
-            
-            # After 90° rotation: 1024 wide × 600 tall - perfect fit!
-            self.screen.fill((0, 0, 0))  # Black background
-            self.screen.blit(rotated, (0, 0))
-            
-            pygame.display.flip()
-            self.clock.tick(FPS)
+                # Draw gesture tutorial on first launch
+                if self.show_gesture_tutorial and self.gesture_tutorial:
+                    self.gesture_tutorial.draw(self.portrait_surface)
     
     def handle_mouse_down(self, pos):
         """Handle mouse down events"""
         # Start gesture recognition
         if self.gesture_recognizer:
-            self.gesture_recognizer.start_touch(pos)
+            self.gesture_recognizer.start_touch(pos, self.event_time)
         
         # Check if clicking on settings panels first
         if self.show_wifi_panel and self.wifi_panel:
@@ -592,6 +457,8 @@ class ABookApp:
             self.handle_home_click(pos)
         elif self.current_view == 'notepad':
             self.handle_notepad_click(pos)
+        elif self.current_view == 'reader':
+            self.handle_reader_click(pos)
         elif self.current_view == 'text':
             self.handle_text_click(pos)
     
@@ -600,7 +467,7 @@ class ABookApp:
         if gesture == 'swipe_right' and data == 'back':
             # Go back
             if self.current_view == 'notepad' or self.current_view == 'text':
-                self.current_view = 'home'
+                self.close_notebook()
                 if self.gesture_indicator:
                     self.gesture_indicator.show('swipe_right')
         elif gesture == 'swipe_left':
@@ -630,6 +497,7 @@ class ABookApp:
             print(f"[WiFi] Connecting to: {data}")
         elif action == 'toggle_power_save':
             print(f"[Battery] Power save: {data}")
+            self.frame_scheduler.set_power_save(data)
         elif action == 'toggle_time_format':
             print(f"[Time] 24h format: {data}")
     
@@ -644,13 +512,23 @@ class ABookApp:
                     if self.renaming_idx is not None:
                         self.notebooks[self.renaming_idx].name = self.temp_name
                         self.keyboard.visible = False
+                        self.keyboard.suggestions = []
                         self.renaming_idx = None
                     return
                 elif action == 'backspace':
                     self.temp_name = self.temp_name[:-1]
+                    self.update_rename_suggestions()
                     return
                 elif action == 'char':
                     self.temp_name += data
+                    self.update_rename_suggestions()
+                    return
+                elif action == 'suggestion':
+                    # Replace the partial last word with the chosen completion
+                    head, _, partial = self.temp_name.rpartition(' ')
+                    word = data.capitalize() if partial[:1].isupper() else data
+                    self.temp_name = f"{head} {word}" if head else word
+                    self.keyboard.suggestions = []
                     return
         
         action, data = self.home_view.handle_click(
@@ -665,9 +543,13 @@ class ABookApp:
             # Folder tab clicked
             pass  # Already handled in modern_home
         
+        elif action == 'open_notebook' and isinstance(self.notebooks[data], Book):
+            self.open_book(self.notebooks[data])
+        
         elif action == 'open_notebook':
             self.active_notebook_idx = data
             self.active_layer_idx = 0
+            self.notepad_view.scroll_offset = 0
             self.current_view = 'notepad'
         
         elif action == 'add_notebook':
@@ -707,13 +589,31 @@ class ABookApp:
             self.renaming_idx = data
             self.temp_name = self.notebooks[data].name
             self.keyboard.visible = True
+            self.keyboard.suggestions = []
+    
+    def update_rename_suggestions(self):
+        """Offer completions for the word being typed in the rename field"""
+        partial = self.temp_name.rpartition(' ')[2]
+        if len(partial) < 2:
+            self.keyboard.suggestions = []
+        else:
+            self.keyboard.suggestions = get_word_completer().complete(partial, 4)
     
     def handle_notepad_click(self, pos):
         """Handle clicks on notepad view"""
         action, data = self.notepad_view.handle_click(pos)
         
         if action == 'back':
-            self.current_view = 'home'
+            self.close_notebook()
+        
+        elif action == 'prev_page':
+            self.turn_page(-1)
+        
+        elif action == 'next_page':
+            self.turn_page(1)
+        
+        elif action == 'add_page':
+            self.add_page()
         
         elif action == 'select_pen':
             self.notepad_view.select_tool('pen')
@@ -773,7 +673,9 @@ class ABookApp:
         elif action == 'delete_layer':
             notebook = self.notebooks[self.active_notebook_idx]
             if len(notebook.layers) > 1:  # Don't delete the last layer
+                before = list(notebook.layers)
                 del notebook.layers[self.active_layer_idx]
+                self.record_layer_change(notebook, before, "Delete Layer")
                 # Adjust active layer index
                 if self.active_layer_idx >= len(notebook.layers):
                     self.active_layer_idx = len(notebook.layers) - 1
@@ -824,7 +726,9 @@ class ABookApp:
         elif action == 'add_layer':
             notebook = self.notebooks[self.active_notebook_idx]
             from models import Layer
+            before = list(notebook.layers)
             notebook.layers.append(Layer())
+            self.record_layer_change(notebook, before, "Add Layer")
             self.active_layer_idx = len(notebook.layers) - 1
         
         elif action == 'select_layer':
@@ -838,40 +742,151 @@ class ABookApp:
             notebook = self.notebooks[self.active_notebook_idx]
             if data > 0:
                 # Swap layers
+                before = list(notebook.layers)
                 notebook.layers[data], notebook.layers[data-1] = notebook.layers[data-1], notebook.layers[data]
+                self.record_layer_change(notebook, before, "Move Layer")
         
         elif action == 'move_layer_down':
             notebook = self.notebooks[self.active_notebook_idx]
             if data < len(notebook.layers) - 1:
                 # Swap layers
+                before = list(notebook.layers)
                 notebook.layers[data], notebook.layers[data+1] = notebook.layers[data+1], notebook.layers[data]
+                self.record_layer_change(notebook, before, "Move Layer")
         
         elif action == 'merge_all_layers':
             self.merge_all_visible_layers()
         
+        elif action == 'merge_down':
+            self.merge_layer_down()
+        
         elif action == 'close_search':
             self.notepad_view.show_search_panel = False
         
+        elif action == 'undo':
+            self.undo()
+        
+        elif action == 'redo':
+            self.redo()
+        
         elif action == 'start_drawing':
-            self.notepad_view.start_drawing(data)
+            self.notepad_view.start_drawing(data, self.event_time)
+            # Record the tiles the stroke touches as it is drawn
+            self.stroke_edit = RegionEdit(self.active_layer(), "Stroke")
+            self.notepad_view.brush.before_change = self.stroke_edit.touch
+    
+    def end_stroke(self):
+        """Pen up: finish the stroke on the active layer"""
+        layer = self.active_layer()
+        changed = self.notepad_view.stop_drawing(layer.surf)
+        layer.modified = True
+        if changed:
+            layer.mark(changed)
+            if self.notepad_view.tool == 'eraser':
+                layer.tighten()
+        self.finish_stroke_edit()
+    
+    def close_notebook(self):
+        """Back to the home screen; the open page's pixels are freed"""
+        if self.notepad_view.drawing:
+            self.end_stroke()
+        self.notebooks[self.active_notebook_idx].unload()
+        self.current_view = 'home'
+    
+    def turn_page(self, delta):
+        """Open the page delta pages away from the current one"""
+        notebook = self.notebooks[self.active_notebook_idx]
+        index = max(0, min(notebook.page_idx + delta, len(notebook.pages) - 1))
+        if index == notebook.page_idx:
+            return
+        if self.notepad_view.drawing:
+            self.end_stroke()
+        notebook.open_page(index)
+        self.active_layer_idx = 0
+        self.notepad_view.scroll_offset = 0
+        print(f"[Pages] Page {index + 1}/{len(notebook.pages)}")
+    
+    def add_page(self):
+        """New blank page after the current one"""
+        notebook = self.notebooks[self.active_notebook_idx]
+        if self.notepad_view.drawing:
+            self.end_stroke()
+        notebook.add_page()
+        self.active_layer_idx = 0
+        self.notepad_view.scroll_offset = 0
+        print(f"[Pages] Added page {notebook.page_idx + 1}/{len(notebook.pages)}")
+    
+    def finish_stroke_edit(self):
+        """Push the stroke that just ended onto the notebook's undo history"""
+        self.notepad_view.brush.before_change = None
+        edit, self.stroke_edit = self.stroke_edit, None
+        if edit and edit.finish():
+            self.notebooks[self.active_notebook_idx].history.push(edit)
+    
+    def record_layer_change(self, notebook, before, label):
+        """Push a change to notebook.layers (before = the old list) onto the history"""
+        notebook.history.push(LayerListEdit(notebook, before, notebook.layers, label))
+    
+    def undo(self):
+        """Undo the last edit in the current notebook"""
+        if self.notepad_view.drawing:
+            return
+        notebook = self.notebooks[self.active_notebook_idx]
+        edit = notebook.history.undo(notebook)
+        if edit:
+            self.active_layer_idx = min(self.active_layer_idx, len(notebook.layers) - 1)
+            print(f"[History] Undo {edit.label}")
+    
+    def redo(self):
+        """Redo the last undone edit in the current notebook"""
+        if self.notepad_view.drawing:
+            return
+        notebook = self.notebooks[self.active_notebook_idx]
+        edit = notebook.history.redo(notebook)
+        if edit:
+            self.active_layer_idx = min(self.active_layer_idx, len(notebook.layers) - 1)
+            print(f"[History] Redo {edit.label}")
     
     def apply_template(self, template_name):
-        """Apply a template to the current layer"""
-        from templates import get_template_by_name
-        
+        """Set the notebook's background template (the layers are untouched)"""
         notebook = self.notebooks[self.active_notebook_idx]
-        layer = notebook.layers[self.active_layer_idx]
+        if template_name == notebook.template_name:
+            return
+        notebook.history.push(TemplateEdit(notebook.template_name, template_name))
+        notebook.template_name = template_name
         
-        # Get the template
-        template = get_template_by_name(template_name)
+        print(f"Applied template: {template_name}")
+    
+    def open_book(self, book):
+        """Show a reflowable book in the reader"""
+        self.reader_view.open(book)
+        self.reader_busy = True
+        self.current_view = 'reader'
+    
+    def handle_reader_click(self, pos):
+        """Handle clicks on the reader view"""
+        action, data = self.reader_view.handle_click(pos)
         
-        # Draw template on layer surface
-        template.draw(layer.surf)
+        if action == 'back':
+            self.reader_view.close()
+            self.current_view = 'home'
         
-        # Update layer template name
-        layer.template_name = template_name
+        elif action == 'prev_page':
+            self.reader_view.turn(-1)
         
-        print(f"Applied template: {template_name}")
+        elif action == 'next_page':
+            self.reader_view.turn(1)
+        
+        elif action == 'change_font':
+            self.reader_view.change_font()
+        
+        elif action == 'size_up':
+            self.reader_view.change_size(True)
+        
+        elif action == 'size_down':
+            self.reader_view.change_size(False)
+        
+        self.reader_busy = True
     
     def handle_text_click(self, pos):
         """Handle clicks on text view"""
@@ -909,7 +924,7 @@ class ABookApp:
             
             # First, run OCR to get text
             print("[Spell Check] Running OCR on layer...")
-            text = self.text_processor.extract_text_from_surface(layer.surf)
+            text = self.text_processor.extract_text_from_surface(layer.surf, layer.bounds)
             
             if not text.strip():
                 print("[Spell Check] No text found in layer")
@@ -961,23 +976,16 @@ class ABookApp:
         print(f"Surface format: {surface.get_flags()}")
         
         # Check if there's actually anything drawn
-        try:
-            pixel_data = pygame.surfarray.array3d(surface)
-            import numpy as np
-            
-            # Check if all pixels are the same (likely blank)
-            unique_colors = len(np.unique(pixel_data.reshape(-1, 3), axis=0))
-            print(f"Unique colors in surface: {unique_colors}")
-            
-            if unique_colors <= 2:
-                print("⚠ WARNING: Surface appears to be blank or nearly blank!")
-                print("  Make sure you're drawing on the canvas before converting.")
-        except Exception as e:
-            print(f"Could not analyze surface: {e}")
+        if layer.empty:
+            print("⚠ WARNING: Surface appears to be blank!")
+            print("  Make sure you're drawing on the canvas before converting.")
+        else:
+            print(f"Ink bounds: {layer.bounds}")
         
         # Save a preview of what we're sending to OCR
         try:
-            pygame.image.save(surface, 'debug_layer_surface.png')
+            pygame.image.save(surface if layer.empty else surface.subsurface(layer.bounds),
+                              'debug_layer_surface.png')
             print("✓ Saved layer surface as 'debug_layer_surface.png'")
             print("  Open this file to see what OCR is receiving")
         except Exception as e:
@@ -985,7 +993,7 @@ class ABookApp:
         
         # Extract text
         print("\nCalling OCR...")
-        text = self.text_processor.extract_text_from_surface(surface)
+        text = self.text_processor.extract_text_from_surface(surface, layer.bounds)
         
         # Auto-correct spelling if writing assistant available
         corrections_made = []
@@ -1017,6 +1025,10 @@ class ABookApp:
         except Exception as e:
             print(f"[Auto-Correct] Skipped: {e}")
         
+        # Teach the completion index the user's own vocabulary
+        get_word_completer().add_text(text)
+        notebook.page.set_text(text)
+        
         self.text_view.set_text(text)
         self.text_view.corrections_made = corrections_made
         self.text_view.show_corrections_info = len(corrections_made) > 0
@@ -1049,15 +1061,17 @@ class ABookApp:
         
         # Get current layer surface
         notebook = self.notebooks[self.active_notebook_idx]
-        surface = notebook.layers[self.active_layer_idx].surf
+        layer = notebook.layers[self.active_layer_idx]
         
         # Extract text using OCR
-        text = self.text_processor.extract_text_from_surface(surface)
+        text = self.text_processor.extract_text_from_surface(layer.surf, layer.bounds)
         
         if text and not text.startswith("[No text detected]"):
             # Split into words and clean
             import re
             words = re.findall(r'\b[a-zA-Z]+\b', text)
+            
+            get_word_completer().add_text(text)
             # Remove duplicates and sort
             unique_words = sorted(list(set(words)), key=str.lower)
             self.notepad_view.extracted_words = unique_words[:15]  # Limit to 15 words
@@ -1132,31 +1146,39 @@ class ABookApp:
             traceback.print_exc()
     
     def merge_all_visible_layers(self):
-        """Merge all visible layers into one"""
+        """Flatten the visible layers into one (hidden layers are kept)"""
         notebook = self.notebooks[self.active_notebook_idx]
-        
-        # Get all visible layers
-        visible_layers = [l for l in notebook.layers if l.visible]
-        
-        if len(visible_layers) <= 1:
+        edit, index = flatten(notebook)
+        if edit is None:
             print("[Layers] Need at least 2 visible layers to merge")
             return
-        
-        # Create new merged surface
-        from models import Layer
-        merged = Layer("Blank")
-        
-        # Draw all visible layers onto merged layer
-        for layer in visible_layers:
-            merged.surf.blit(layer.surf, (0, 0))
-        
-        # Replace all layers with just the merged one
-        notebook.layers = [merged]
-        self.active_layer_idx = 0
-        
-        print(f"[Layers] Merged {len(visible_layers)} layers into 1")
-
+        notebook.history.push(edit)
+        self.active_layer_idx = index
+    
+    def merge_layer_down(self):
+        """Merge the active layer into the layer below it"""
+        notebook = self.notebooks[self.active_notebook_idx]
+        edit, index = merge_down(notebook, self.active_layer_idx)
+        if edit is None:
+            print("[Layers] No visible layer below to merge into")
+            return
+        notebook.history.push(edit)
+        self.active_layer_idx = index
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="ABook")
+    parser.add_argument('--record', metavar='FILE', help="record the input session to FILE")
+    parser.add_argument('--replay', metavar='FILE', help="replay a recorded input session")
+    parser.add_argument('--fast', action='store_true', help="replay as fast as possible (skips the boot animation)")
+    parser.add_argument('--epaper', action='store_true', help="show the frames as a simulated e-paper panel would")
+    args = parser.parse_args()
+    
     app = ABookApp()
-    app.run()
\ No newline at end of file
+    if args.epaper:
+        app.enable_epaper()
+    if args.record or args.replay:
+        transform = app.display.transform
+        configure_session(args.record, args.replay, args.fast,
+                          to_portrait=transform.to_portrait, to_window=transform.to_landscape)
+    app.run(skip_boot=bool(args.replay and args.fast))
@@ -0,0 +1,133 @@
+"""
+Simulated 2.9" e-paper panel (SSD1680-style controller)
+Decodes the SPI traffic of EPD_2in9 from the machine trace hook into RAM
+writes and refreshes, keeps the image the panel would show, and adds the
+time each refresh takes to the utime virtual clock.
+"""
+import machine
+import utime
+
+
+FULL_REFRESH_MS = 2000
+PARTIAL_REFRESH_MS = 300
+
+
+class SimPanel:
+    def __init__(self, width=128, height=296, dc_pin=8, cs_pin=9, reset_pin=12):
+        self.width = width
+        self.height = height
+        self.row_bytes = width // 8
+        self.dc_pin = dc_pin
+        self.cs_pin = cs_pin
+        self.reset_pin = reset_pin
+
+        self.ram = bytearray(self.row_bytes * height)       # 0x24, new image
+        self.ram_old = bytearray(self.row_bytes * height)   # 0x26, previous image
+        self.image = bytearray(b'\xff' * (self.row_bytes * height))  # what is shown
+
+        self.dc = 1
+        self.command = None
+        self.params = bytearray()
+        self.window = (0, self.row_bytes - 1, 0, height - 1)  # x0, x1 (bytes), y0, y1
+        self.cursor = [0, 0]
+        self.update_mode = 0xF7
+
+        self.full_refreshes = 0
+        self.partial_refreshes = 0
+        self.partials_since_full = 0  # ghosting builds up with each partial
+        self.refresh_ms = 0
+        self.ram_bytes = 0  # framebuffer bytes written (both RAMs)
+
+    def attach(self):
+        machine.set_trace(self.on_bus)
+        return self
+
+    def detach(self):
+        machine.set_trace(None)
+
+    # Bus decoding
+
+    def on_bus(self, kind, id, data):
+        if kind == 'pin':
+            if id == self.dc_pin:
+                self.dc = data
+            return
+        if self.dc == 0:
+            for cmd in data:
+                self._command(cmd)
+        else:
+            self._data(data)
+
+    def _command(self, cmd):
+        self.command = cmd
+        self.params = bytearray()
+        if cmd == 0x20:
+            self._activate()
+
+    def _data(self, data):
+        cmd = self.command
+        if cmd in (0x24, 0x26):
+            self._write_ram(self.ram if cmd == 0x24 else self.ram_old, data)
+            return
+        self.params.extend(data)
+        p = self.params
+        if cmd == 0x44 and len(p) >= 2:
+            self.window = (p[0], p[1], self.window[2], self.window[3])
+        elif cmd == 0x45 and len(p) >= 4:
+            self.window = (self.window[0], self.window[1], p[0] | (p[1] << 8), p[2] | (p[3] << 8))
+        elif cmd == 0x4E and len(p) >= 1:
+            self.cursor[0] = p[0]
+        elif cmd == 0x4F and len(p) >= 2:
+            self.cursor[1] = p[0] | (p[1] << 8)
+        elif cmd == 0x22 and len(p) >= 1:
+            self.update_mode = p[0]
+
+    def _write_ram(self, ram, data):
+        """Data entry mode 0x03: X then Y increment, wrapping inside the window"""
+        x0, x1, y0, y1 = self.window
+        x, y = self.cursor
+        for b in data:
+            if 0 <= x < self.row_bytes and 0 <= y < self.height:
+                ram[y * self.row_bytes + x] = b
+            x += 1
+            if x > x1:
+                x = x0
+                y += 1
+                if y > y1:
+                    y = y0
+        self.cursor = [x, y]
+        self.ram_bytes += len(data)
+
+    def _activate(self):
+        mode = self.update_mode
+        if mode == 0xF7:
+            self.image[:] = self.ram
+            self.full_refreshes += 1
+            self.partials_since_full = 0
+            cost = FULL_REFRESH_MS
+        elif mode == 0x0F:
+            self.image[:] = self.ram
+            self.partial_refreshes += 1
+            self.partials_since_full += 1
+            cost = PARTIAL_REFRESH_MS
+        else:
+            return  # e.g. 0xC0: loads the LUT, nothing shown
+        self.refresh_ms += cost
+        utime.advance(cost * 1000)
+
+    # Inspection
+
+    def pixel(self, x, y):
+        """1 = white, 0 = black, as shown on the panel"""
+        return (self.image[y * self.row_bytes + (x >> 3)] >> (7 - (x & 7))) & 1
+
+    def shows(self, buffer):
+        return self.image == bytearray(buffer)
+
+    def stats(self):
+        return {
+            'full_refreshes': self.full_refreshes,
+            'partial_refreshes': self.partial_refreshes,
+            'refresh_ms': self.refresh_ms,
+            'ram_bytes': self.ram_bytes,
+        }
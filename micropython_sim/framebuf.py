@@ -0,0 +1,250 @@
+"""
+Simulated MicroPython `framebuf` module
+Same buffer layouts and drawing methods as the firmware, in plain Python.
+text() draws placeholder 8x8 glyphs (not the firmware font) so text still
+changes the right pixels. `calls` counts the drawing calls made, for
+benchmarks.
+"""
+
+
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+MVLSB = MONO_VLSB
+
+_BPP = {MONO_VLSB: 1, MONO_HLSB: 1, MONO_HMSB: 1, GS2_HMSB: 2, GS4_HMSB: 4, GS8: 8, RGB565: 16}
+
+
+def _glyph(ch):
+    """8 row bytes of a stand-in glyph (blank for space)"""
+    if ch == ' ':
+        return bytes(8)
+    h = (ord(ch) * 2654435761) & 0xFFFFFFFF
+    rows = bytearray(8)
+    for i in range(1, 7):
+        rows[i] = ((h >> (i * 4)) & 0x7E) | 0x42
+    return bytes(rows)
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        if format not in _BPP:
+            raise ValueError("invalid format")
+        self.buf = buffer
+        self.width = width
+        self.height = height
+        self.format = format
+        self.stride = stride if stride is not None else width
+        self.calls = {}
+        if format == MONO_HLSB or format == MONO_HMSB:
+            self.stride = (self.stride + 7) & ~7
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    # Pixel access
+
+    def _get(self, x, y):
+        f = self.format
+        if f == MONO_HLSB:
+            i = (x + y * self.stride) >> 3
+            return (self.buf[i] >> (7 - (x & 7))) & 1
+        if f == MONO_HMSB:
+            i = (x + y * self.stride) >> 3
+            return (self.buf[i] >> (x & 7)) & 1
+        if f == MONO_VLSB:
+            return (self.buf[(y >> 3) * self.stride + x] >> (y & 7)) & 1
+        if f == GS8:
+            return self.buf[x + y * self.stride]
+        if f == RGB565:
+            i = 2 * (x + y * self.stride)
+            return self.buf[i] | (self.buf[i + 1] << 8)
+        bpp = _BPP[f]
+        per = 8 // bpp
+        n = x + y * self.stride
+        shift = (n % per) * bpp
+        return (self.buf[n // per] >> shift) & ((1 << bpp) - 1)
+
+    def _set(self, x, y, c):
+        f = self.format
+        if f == MONO_HLSB:
+            i = (x + y * self.stride) >> 3
+            bit = 0x80 >> (x & 7)
+            self.buf[i] = (self.buf[i] | bit) if c & 1 else (self.buf[i] & ~bit)
+        elif f == MONO_HMSB:
+            i = (x + y * self.stride) >> 3
+            bit = 1 << (x & 7)
+            self.buf[i] = (self.buf[i] | bit) if c & 1 else (self.buf[i] & ~bit)
+        elif f == MONO_VLSB:
+            i = (y >> 3) * self.stride + x
+            bit = 1 << (y & 7)
+            self.buf[i] = (self.buf[i] | bit) if c & 1 else (self.buf[i] & ~bit)
+        elif f == GS8:
+            self.buf[x + y * self.stride] = c & 0xFF
+        elif f == RGB565:
+            i = 2 * (x + y * self.stride)
+            self.buf[i] = c & 0xFF
+            self.buf[i + 1] = (c >> 8) & 0xFF
+        else:
+            bpp = _BPP[f]
+            per = 8 // bpp
+            n = x + y * self.stride
+            shift = (n % per) * bpp
+            mask = ((1 << bpp) - 1) << shift
+            i = n // per
+            self.buf[i] = (self.buf[i] & ~mask) | ((c << shift) & mask)
+
+    def _fill_rect(self, x, y, w, h, c):
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self.width), min(y + h, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        if self.format == MONO_HLSB:
+            self._fill_rect_hlsb(x0, y0, x1, y1, c)
+            return
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def _fill_rect_hlsb(self, x0, y0, x1, y1, c):
+        """Row spans: partial bytes at the ends, whole bytes in between"""
+        fill = 0xFF if c & 1 else 0x00
+        b0, b1 = x0 >> 3, (x1 - 1) >> 3
+        if b0 == b1:
+            edge = (0xFF >> (x0 & 7)) & (0xFF << (7 - ((x1 - 1) & 7))) & 0xFF
+        else:
+            head = 0xFF >> (x0 & 7)
+            tail = (0xFF << (7 - ((x1 - 1) & 7))) & 0xFF
+        row = self.stride >> 3
+        buf = self.buf
+        for yy in range(y0, y1):
+            base = yy * row
+            if b0 == b1:
+                i = base + b0
+                buf[i] = (buf[i] & ~edge) | (fill & edge)
+                continue
+            i = base + b0
+            buf[i] = (buf[i] & ~head) | (fill & head)
+            i = base + b1
+            buf[i] = (buf[i] & ~tail) | (fill & tail)
+            if b1 - b0 > 1:
+                buf[base + b0 + 1:base + b1] = bytes([fill]) * (b1 - b0 - 1)
+
+    # Drawing methods (framebuf API)
+
+    def fill(self, c):
+        self._count('fill')
+        self._fill_rect(0, 0, self.width, self.height, c)
+
+    def pixel(self, x, y, c=None):
+        self._count('pixel')
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    def hline(self, x, y, w, c):
+        self._count('hline')
+        self._fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self._count('vline')
+        self._fill_rect(x, y, 1, h, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        self._count('fill_rect')
+        self._fill_rect(x, y, w, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        self._count('rect')
+        if f:
+            self._fill_rect(x, y, w, h, c)
+            return
+        self._fill_rect(x, y, w, 1, c)
+        self._fill_rect(x, y + h - 1, w, 1, c)
+        self._fill_rect(x, y, 1, h, c)
+        self._fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x0, y0, x1, y1, c):
+        self._count('line')
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            if 0 <= x0 < self.width and 0 <= y0 < self.height:
+                self._set(x0, y0, c)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=0xF):
+        """Ellipse (axis-aligned); the quadrant mask m is ignored"""
+        self._count('ellipse')
+        xr, yr = max(xr, 0), max(yr, 0)
+        for dy in range(-yr, yr + 1):
+            # Half-width of the ellipse on this row
+            if yr:
+                half = int(xr * (1 - (dy * dy) / (yr * yr)) ** 0.5 + 0.5)
+            else:
+                half = xr
+            if f:
+                self._fill_rect(x - half, y + dy, 2 * half + 1, 1, c)
+            else:
+                for xx in (x - half, x + half):
+                    if 0 <= xx < self.width and 0 <= y + dy < self.height:
+                        self._set(xx, y + dy, c)
+
+    def text(self, s, x, y, c=1):
+        self._count('text')
+        for n, ch in enumerate(s):
+            rows = _glyph(ch)
+            for r in range(8):
+                bits = rows[r]
+                for b in range(8):
+                    if bits & (0x80 >> b):
+                        px, py = x + n * 8 + b, y + r
+                        if 0 <= px < self.width and 0 <= py < self.height:
+                            self._set(px, py, c)
+
+    def scroll(self, xstep, ystep):
+        self._count('scroll')
+        pixels = [[self._get(xx, yy) for xx in range(self.width)] for yy in range(self.height)]
+        for yy in range(self.height):
+            sy = yy - ystep
+            if not 0 <= sy < self.height:
+                continue
+            for xx in range(self.width):
+                sx = xx - xstep
+                if 0 <= sx < self.width:
+                    self._set(xx, yy, pixels[sy][sx])
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        self._count('blit')
+        for yy in range(fbuf.height):
+            for xx in range(fbuf.width):
+                px, py = x + xx, y + yy
+                if not (0 <= px < self.width and 0 <= py < self.height):
+                    continue
+                c = fbuf._get(xx, yy)
+                if c == key:
+                    continue
+                if palette is not None:
+                    c = palette._get(c, 0)
+                self._set(px, py, c)
+
+
+def FrameBuffer1(buffer, width, height, stride=None):
+    return FrameBuffer(buffer, width, height, MONO_VLSB, stride)
@@ -0,0 +1,94 @@
+"""
+Simulated ICNT86 touch controller
+Answers the driver's I2C register reads (0x000A version, 0x1001 point
+count, 0x1002 point block), pulls the INT pin low whenever the touch
+state changes, and replays recorded touch traces on the utime clock.
+"""
+import utime
+
+
+REG_VERSION = 0x000A
+REG_COUNT = 0x1001
+REG_POINTS = 0x1002
+
+
+class SimTouchController:
+    """
+    Contacts are (id, raw_x, raw_y, pressure) in controller coordinates
+    attach() hooks it to an ICNT86's I2C bus and interrupt pin.
+    """
+
+    def __init__(self, version=b'\x01\x00\x86\x00'):
+        self.version = version
+        self.contacts = []
+        self.reg = 0
+        self.int_pin = None
+        self.reads = 0
+        self.interrupts = 0
+
+    def attach(self, tp):
+        tp.config.i2c.attach(tp.config.address, self)
+        self.int_pin = tp.config.int_pin
+        self.int_pin.drive(1)
+        return self
+
+    # I2C device interface
+
+    def write(self, data):
+        # Register address, optionally followed by a value (the 0x1001
+        # acknowledge); the points stay readable until they change
+        if len(data) >= 2:
+            self.reg = (data[0] << 8) | data[1]
+
+    def read_into(self, buf):
+        self.reads += 1
+        data = self._register(self.reg)
+        for i in range(len(buf)):
+            buf[i] = data[i] if i < len(data) else 0
+
+    def _register(self, reg):
+        if reg == REG_VERSION:
+            return self.version
+        if reg == REG_COUNT:
+            return bytes([len(self.contacts)])
+        if reg == REG_POINTS:
+            out = bytearray()
+            for cid, x, y, p in self.contacts:
+                out += bytes([cid, y & 0xFF, y >> 8, x & 0xFF, x >> 8, p, 0])
+            return bytes(out)
+        return b''
+
+    # Driving the simulation
+
+    def touch(self, contacts):
+        """Report a new set of contacts (empty when everything lifted) and interrupt"""
+        self.contacts = list(contacts)[:5]
+        self.interrupts += 1
+        if self.int_pin:
+            self.int_pin.drive(0)
+            self.int_pin.drive(1)
+
+    def replay(self, trace, between=None):
+        """
+        Play [(t_ms, contacts), ...] on the utime clock
+        between: called with (t_ms) before each report, e.g. to run the main loop
+        """
+        start = utime.ticks_ms()
+        for t_ms, contacts in trace:
+            due = start + t_ms
+            if utime.ticks_diff(due, utime.ticks_ms()) > 0:
+                utime.sleep_ms(utime.ticks_diff(due, utime.ticks_ms()))
+            if between:
+                between(t_ms)
+            self.touch(contacts)
+
+
+def line_trace(cid, start, end, steps, interval_ms=8, pressure=40):
+    """Trace of one contact moving from start to end (raw coordinates), then lifting"""
+    trace = []
+    for i in range(steps + 1):
+        x = start[0] + (end[0] - start[0]) * i // steps
+        y = start[1] + (end[1] - start[1]) * i // steps
+        trace.append((i * interval_ms, [(cid, x, y, pressure)]))
+    trace.append(((steps + 1) * interval_ms, []))
+    return trace
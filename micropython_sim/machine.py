@@ -0,0 +1,134 @@
+"""
+Simulated MicroPython `machine` module
+Lets the Pico e-paper code run on Linux: pins keep their level, SPI and
+I2C record what is written, and a trace hook sees every pin change and
+bus write in order (see set_trace).
+"""
+
+
+_trace = None
+
+
+def set_trace(fn):
+    """
+    Call fn(kind, bus_or_pin_id, data) for every pin change ('pin', id, level)
+    and SPI write ('spi', id, bytes); None to stop tracing
+    """
+    global _trace
+    _trace = fn
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self.level = 1 if pull == Pin.PULL_UP else 0
+        if value is not None:
+            self.level = 1 if value else 0
+        self.toggles = 0
+        self.handler = None
+        self.trigger = 0
+
+    def value(self, v=None):
+        if v is None:
+            return self.level
+        v = 1 if v else 0
+        if v != self.level:
+            self.level = v
+            self.toggles += 1
+            if _trace:
+                _trace('pin', self.id, v)
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING):
+        self.handler = handler
+        self.trigger = trigger
+
+    def drive(self, v):
+        """Set an input level from outside (button, busy line, interrupt), firing its irq"""
+        v = 1 if v else 0
+        old = self.level
+        self.level = v
+        if self.handler and old != v:
+            edge = Pin.IRQ_RISING if v else Pin.IRQ_FALLING
+            if self.trigger & edge:
+                self.handler(self)
+
+
+class SPI:
+    def __init__(self, id, baudrate=1_000_000, **kwargs):
+        self.id = id
+        self.baudrate = baudrate
+        self.reset_counters()
+
+    def init(self, baudrate=None, **kwargs):
+        if baudrate:
+            self.baudrate = baudrate
+
+    def reset_counters(self):
+        self.transactions = 0  # write() calls
+        self.bytes = 0
+
+    def write(self, buf):
+        self.transactions += 1
+        self.bytes += len(buf)
+        if _trace:
+            _trace('spi', self.id, bytes(buf))
+
+    @property
+    def bus_time_ms(self):
+        """Time the bytes written so far take on the wire"""
+        return self.bytes * 8 * 1000 / self.baudrate
+
+
+class I2C:
+    """
+    I2C bus; devices are attached with attach(addr, device), where device
+    has write(bytes) and read_into(buf). Unknown addresses read as zeros.
+    """
+
+    def __init__(self, id, scl=None, sda=None, freq=400_000):
+        self.id = id
+        self.freq = freq
+        self.devices = {}
+        self.transactions = 0
+
+    def attach(self, addr, device):
+        self.devices[addr] = device
+
+    def writeto(self, addr, buf, stop=True):
+        self.transactions += 1
+        device = self.devices.get(addr)
+        if device:
+            device.write(bytes(buf))
+        return len(buf)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        self.transactions += 1
+        device = self.devices.get(addr)
+        if device:
+            device.read_into(buf)
+        else:
+            for i in range(len(buf)):
+                buf[i] = 0
+
+    def readfrom(self, addr, n, stop=True):
+        buf = bytearray(n)
+        self.readfrom_into(addr, buf)
+        return bytes(buf)
@@ -0,0 +1,47 @@
+"""
+Simulated MicroPython `utime` module on a virtual clock
+sleep() advances the clock instead of waiting, so driver delays and
+busy-waits cost nothing on Linux while timing logic still sees them.
+"""
+import time as _time
+
+
+_now_us = 0
+
+
+def advance(us):
+    """Move the virtual clock forward by us microseconds"""
+    global _now_us
+    _now_us += int(us)
+
+
+def sleep(seconds):
+    advance(seconds * 1_000_000)
+
+
+def sleep_ms(ms):
+    advance(ms * 1000)
+
+
+def sleep_us(us):
+    advance(us)
+
+
+def ticks_ms():
+    return _now_us // 1000
+
+
+def ticks_us():
+    return _now_us
+
+
+def ticks_add(ticks, delta):
+    return ticks + delta
+
+
+def ticks_diff(end, start):
+    return end - start
+
+
+def time():
+    return _time.time()
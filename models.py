@@ -1,29 +1,281 @@
 """
 Data models for ABook application
 """
+import hashlib
 import pygame
-from config import DISPLAY_WIDTH, DISPLAY_HEIGHT
+from config import DISPLAY_WIDTH, DISPLAY_HEIGHT, CONTENT_HEIGHT, CANVAS_MODE
+from history import History, PackedLayer, ink_rect
+from templates import draw_background
+import gray_canvas
+
+
+# Layer canvas size - USE PORTRAIT DIMENSIONS
+# Portrait: 600 wide, 1024 tall (after rotation)
+LAYER_WIDTH = 600 - 80  # 600px portrait width - 80px toolbar
+LAYER_HEIGHT = 1024 * 5  # 5x portrait height for scrolling
+THUMBNAIL_SIZE = (46, 90)  # first screen of a page, scaled down
 
 
 class Layer:
-    """Represents a drawing layer in a notebook"""
-    def __init__(self, template_name="Blank"):
-        # Create a larger canvas for scrolling - USE PORTRAIT DIMENSIONS
-        # Portrait: 600 wide, 1024 tall (after rotation)
-        canvas_width = 600 - 80  # 600px portrait width - 80px toolbar
-        canvas_height = 1024 * 5  # 5x portrait height for scrolling
-        self.surf = pygame.Surface((canvas_width, canvas_height), pygame.SRCALPHA)
-        self.surf.fill((255, 255, 255, 0))  # Transparent white
+    """
+    Represents a drawing layer in a notebook
+    The canvas is allocated on first access. An optional painter(surf) fills
+    it at that point, so pre-made pages cost nothing until they are viewed.
+    gray: store an 8-bit coverage plane instead of RGBA (default CANVAS_MODE)
+    
+    `bounds` is a rect that contains all of the layer's ink. Drawing code
+    calls mark(rect) for the area it changed, so the rect is kept without
+    scanning the canvas; it can be larger than the ink after erasing
+    until tighten() is called.
+    """
+    def __init__(self, template_name="Blank", painter=None, gray=None):
+        self._surf = None
+        self.painter = painter
+        self._repaint = painter  # kept so an unmodified page can be freed and repainted
+        self.gray = CANVAS_MODE == 'gray' if gray is None else gray
+        self._bounds = pygame.Rect(0, 0, 0, 0) if painter is None else None  # None = not known
         self.visible = True
         self.modified = False
         self.template_name = template_name
         self.name = f"Layer"  # Can be renamed by user
+        
+        # Opaque layers (painted pages) hide everything below them
+        self.opaque = painter is not None
+    
+    @property
+    def surf(self):
+        if self._surf is None:
+            size = (LAYER_WIDTH, LAYER_HEIGHT)
+            if self.gray and self.painter is not None:
+                # Painters draw in colour (antialiased text); keep only the coverage
+                page = pygame.Surface(size)
+                self.painter(page)
+                self._surf = gray_canvas.from_surface(page)
+            elif self.gray:
+                self._surf = gray_canvas.new_plane(size)
+            else:
+                self._surf = pygame.Surface(size, pygame.SRCALPHA)
+                self._surf.fill((255, 255, 255, 0))  # Transparent white
+                if self.painter is not None:
+                    self.painter(self._surf)
+            self.painter = None
+        return self._surf
+    
+    @surf.setter
+    def surf(self, surface):
+        self._surf = surface
+        self.painter = None
+        self._repaint = None
+        if surface is not None:
+            self.gray = gray_canvas.is_plane(surface)
+        # A new canvas is scanned when its bounds are first needed
+        self._bounds = pygame.Rect(0, 0, 0, 0) if surface is None else None
+    
+    @property
+    def bounds(self):
+        """Rect containing all ink (zero-size if there is none)"""
+        if self._bounds is None:
+            if self.opaque:
+                # The paper of a painted page covers the whole canvas
+                self._bounds = pygame.Rect(0, 0, LAYER_WIDTH, LAYER_HEIGHT)
+            else:
+                self._bounds = ink_rect(self.surf)
+        return self._bounds
+    
+    @property
+    def empty(self):
+        bounds = self.bounds
+        return not (bounds.width and bounds.height)
+    
+    def mark(self, rect):
+        """Ink may have been added or removed inside rect"""
+        if self._bounds is None or not rect:
+            return
+        rect = pygame.Rect(rect).clip(0, 0, LAYER_WIDTH, LAYER_HEIGHT)
+        if not (rect.width and rect.height):
+            return
+        self._bounds = rect if self.empty else self._bounds.union(rect)
+    
+    def tighten(self):
+        """Shrink bounds to the ink (after erasing), scanning only inside them"""
+        if self.empty or self.opaque:
+            return
+        bounds = self._bounds
+        rect = ink_rect(self.surf.subsurface(bounds))
+        self._bounds = rect.move(bounds.topleft) if rect.width and rect.height else pygame.Rect(0, 0, 0, 0)
+    
+    def draw_onto(self, target, dest=(0, 0), area=None):
+        """Composite the layer (or its area) onto an RGB surface"""
+        if self.gray and not self.opaque:
+            gray_canvas.show(target, self.surf, dest, area)
+        else:
+            target.blit(self.surf, dest, area)
+    
+    @property
+    def loaded(self):
+        """True once the canvas has been allocated"""
+        return self._surf is not None
+    
+    def release(self):
+        """Free the canvas of an unmodified painted page; False if it has to be kept"""
+        if self._repaint is None or self.modified:
+            return False
+        self._surf = None
+        self.painter = self._repaint
+        self._bounds = None
+        return True
+
+
+class Page:
+    """
+    One page of a notebook: its layers, background template and undo history
+    Only the open page needs pixels. unload() frees them - drawn layers are
+    kept compressed, unmodified painted layers are repainted - and a page
+    read from storage gets its layers from loader(page) when first used.
+    
+    Kept while unloaded: bbox (ink bounds of all layers), thumbnail and
+    text_hash (of the text last recognised on the page).
+    """
+    def __init__(self, layers=None, template_name="Blank", loader=None):
+        self._layers = None if loader else ([Layer()] if layers is None else list(layers))
+        self.loader = loader
+        self.template_name = template_name
+        self._history = History()  # Undo/redo for strokes and layer changes
+        self.bbox = None  # as of the last unload
+        self.thumbnail = None
+        self.text_hash = None
+        self._packed = {}  # id(layer) -> PackedLayer, while unloaded
+    
+    @property
+    def layers(self):
+        if self._layers is None:
+            self._layers = self.loader(self)
+            self.loader = None
+        if self._packed:
+            for layer in self._layers:
+                packed = self._packed.pop(id(layer), None)
+                if packed:
+                    packed.unpack()
+            self._packed = {}
+        return self._layers
+    
+    @layers.setter
+    def layers(self, layers):
+        self.layers  # unpack the current ones (history may bring them back)
+        self._layers = layers
+    
+    @property
+    def history(self):
+        self.layers  # the edits write into the layers' pixels
+        return self._history
+    
+    @property
+    def loaded(self):
+        """True while any of the page's pixels are in memory"""
+        return (self._layers is not None and not self._packed
+                and any(layer.loaded for layer in self._layers))
+    
+    def visible_layers(self):
+        """Visible layers from the topmost opaque one up (the rest is hidden)"""
+        layers = [layer for layer in self.layers if layer.visible]
+        for i in range(len(layers) - 1, -1, -1):
+            if layers[i].opaque:
+                return layers[i:]
+        return layers
+    
+    def ink_bounds(self):
+        """Union of the layers' ink bounds"""
+        bbox = pygame.Rect(0, 0, 0, 0)
+        for layer in self.layers:
+            if not layer.empty:
+                bbox = layer.bounds.copy() if not (bbox.width and bbox.height) else bbox.union(layer.bounds)
+        return bbox
+    
+    def render_thumbnail(self):
+        """Scaled first screen of the page, from the layers already in memory"""
+        layers = self.visible_layers()
+        if not any(layer.loaded for layer in layers):
+            return self.thumbnail
+        area = pygame.Rect(0, 0, LAYER_WIDTH, CONTENT_HEIGHT)
+        page = pygame.Surface(area.size)
+        if not (layers and layers[0].opaque):
+            draw_background(page, self.template_name)
+        for layer in layers:
+            if layer.loaded:
+                layer.draw_onto(page, (0, 0), area)
+        return pygame.transform.smoothscale(page, THUMBNAIL_SIZE)
+    
+    def set_text(self, text):
+        """Remember which text was recognised on the page"""
+        self.text_hash = hashlib.sha1(text.encode('utf-8')).hexdigest() if text else None
+    
+    def unload(self):
+        """Free the page's pixels, keeping its metadata"""
+        if self._layers is None or self._packed:
+            return
+        self.bbox = self.ink_bounds()
+        if not self.loaded:
+            return
+        self.thumbnail = self.render_thumbnail()
+        for layer in self._layers:
+            if layer.loaded and not layer.release():
+                self._packed[id(layer)] = PackedLayer(layer)
 
 
 class Notebook:
-    """Represents a notebook with multiple layers"""
-    def __init__(self, name, folder='notes'):
+    """
+    A notebook or book: pages of layers, one page open at a time
+    layers, history and template_name are those of the open page; the
+    pages' histories share one undo budget.
+    """
+    def __init__(self, name, folder='notes', pages=None):
         self.name = name
         self.folder = folder  # 'notes' or 'books'
-        self.layers = [Layer()]
-        self.template_name = "Blank"  # Current template for new layers
\ No newline at end of file
+        self.pages = [Page()] if pages is None else pages
+        self.page_idx = 0
+        self.histories = []
+        for page in self.pages:
+            page._history.share(self.histories)
+    
+    @property
+    def page(self):
+        return self.pages[self.page_idx]
+    
+    @property
+    def layers(self):
+        return self.page.layers
+    
+    @layers.setter
+    def layers(self, layers):
+        self.page.layers = layers
+    
+    @property
+    def history(self):
+        return self.page.history
+    
+    @property
+    def template_name(self):
+        return self.page.template_name
+    
+    @template_name.setter
+    def template_name(self, name):
+        self.page.template_name = name
+    
+    def open_page(self, index):
+        """Make page index the open one, freeing the pixels of the previous one"""
+        index = max(0, min(index, len(self.pages) - 1))
+        if index != self.page_idx:
+            self.page.unload()
+            self.page_idx = index
+        return self.page
+    
+    def add_page(self):
+        """Insert a blank page (same template) after the open one and open it"""
+        page = Page(template_name=self.template_name)
+        page._history.share(self.histories)
+        self.pages.insert(self.page_idx + 1, page)
+        return self.open_page(self.page_idx + 1)
+    
+    def unload(self):
+        """Free the open page's pixels (the notebook is closed)"""
+        self.page.unload()
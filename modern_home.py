@@ -3,6 +3,7 @@ Modern Home View for ABook
 """
 import pygame
 from config import *
+from text_cache import render_text
 
 
 class ModernHomeView:
@@ -37,11 +38,11 @@ class ModernHomeView:
         
         # App name with modern styling
         title_y = 25
-        app_name = self.font_xl.render("ABook", True, COLOR_WHITE)
+        app_name = render_text(self.font_xl, "ABook", True, COLOR_WHITE)
         screen.blit(app_name, (30, title_y))
         
         # Tagline
-        tagline = self.font_s.render("Your Digital Notebook", True, COLOR_GRAY_300)
+        tagline = render_text(self.font_s, "Your Digital Notebook", True, COLOR_GRAY_300)
         screen.blit(tagline, (30, title_y + 35))
         
         # Stats bar
@@ -50,7 +51,7 @@ class ModernHomeView:
         total_books = len([n for n in notebooks if n.folder == 'books'])
         
         stats_text = f"{total_notes + total_books} Notebooks"
-        stats = self.font_s.render(stats_text, True, COLOR_GRAY_300)
+        stats = render_text(self.font_s, stats_text, True, COLOR_GRAY_300)
         screen.blit(stats, (30, stats_y))
         
         # Folder tabs - STACKED VERTICALLY for portrait
@@ -84,11 +85,11 @@ class ModernHomeView:
                 count_color = color
             
             # Tab label
-            label_surf = self.font_l.render(label, True, text_color)
+            label_surf = render_text(self.font_l, label, True, text_color)
             screen.blit(label_surf, (tab_rect.x + 20, tab_rect.y + 20))
             
             # Count badge
-            count_surf = self.font_l.render(str(count), True, count_color)
+            count_surf = render_text(self.font_l, str(count), True, count_color)
             screen.blit(count_surf, (tab_rect.right - 60, tab_rect.y + 20))
             
             self.folder_tabs[folder_id] = tab_rect
@@ -111,10 +112,10 @@ class ModernHomeView:
                            (icon_r.centerx - 15, icon_r.centery),
                            (icon_r.centerx + 15, icon_r.centery), 4)
             
-            msg = self.font_m.render("No notebooks yet", True, COLOR_GRAY_600)
+            msg = render_text(self.font_m, "No notebooks yet", True, COLOR_GRAY_600)
             screen.blit(msg, ((600 - msg.get_width())//2, empty_y + 80))
             
-            hint = self.font_s.render("Tap + to create", True, COLOR_GRAY_400)
+            hint = render_text(self.font_s, "Tap + to create", True, COLOR_GRAY_400)
             screen.blit(hint, ((600 - hint.get_width())//2, empty_y + 110))
         else:
             # Notebook cards - PORTRAIT
@@ -147,12 +148,12 @@ class ModernHomeView:
                     name = nb.name
                     col = COLOR_GRAY_800
                 
-                name_s = self.font_m.render(name, True, col)
+                name_s = render_text(self.font_m, name, True, col)
                 screen.blit(name_s, (card.x + 20, card.y + 20))
                 
-                # Layers
-                info = f"{len(nb.layers)} layer{'s' if len(nb.layers) != 1 else ''}"
-                info_s = self.font_s.render(info, True, COLOR_GRAY_500)
+                # Pages
+                info = f"{len(nb.pages)} page{'s' if len(nb.pages) != 1 else ''}"
+                info_s = render_text(self.font_s, info, True, COLOR_GRAY_500)
                 screen.blit(info_s, (card.x + 20, card.y + 50))
                 
                 # Delete
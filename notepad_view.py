@@ -1,15 +1,20 @@
 """
 Notepad view for ABook application - drawing interface with scrolling
 """
+import importlib.util
+import time
 import pygame
 from config import *
 from improved_ui_components import draw_improved_status_bar
+from text_cache import render_text
+from stroke_input import StrokeInput
+from brushes import BrushEngine
+from templates import draw_background
+from models import LAYER_WIDTH, LAYER_HEIGHT
 
-try:
-    from writing_assistant import get_writing_assistant
-    WRITING_ASSISTANT_AVAILABLE = True
-except ImportError:
-    WRITING_ASSISTANT_AVAILABLE = False
+# Only check that the module exists - it is imported on first use
+WRITING_ASSISTANT_AVAILABLE = importlib.util.find_spec('writing_assistant') is not None
+if not WRITING_ASSISTANT_AVAILABLE:
     print("[Info] Writing assistant not available - install: pip install pyspellchecker language-tool-python")
 
 
@@ -21,13 +26,19 @@ class NotepadView:
         # UI element rects
         self.back_btn = None
         self.pen_btn = None
+        self.highlighter_btn = None
         self.eraser_btn = None
+        self.undo_btn = None
+        self.redo_btn = None
         self.size_up = None
         self.size_down = None
         self.convert_btn = None
         self.template_btn = None
         self.layers_btn = None
         self.search_btn = None
+        self.prev_page_btn = None
+        self.next_page_btn = None
+        self.add_page_btn = None
         
         # Drawing state
         self.tool = 'pen'
@@ -35,14 +46,11 @@ class NotepadView:
         self.highlighter_size = 20  # Wide for highlighting
         self.eraser_size = 30
         self.drawing = False
-        self.last_pos = None
-        self.first_point = False  # Track if this is the first point of a stroke
+        self.stroke = StrokeInput()  # Smoothed samples of the current stroke
+        self.brush = BrushEngine((LAYER_WIDTH, LAYER_HEIGHT))
         
-        # Writing assistant
-        if WRITING_ASSISTANT_AVAILABLE:
-            self.writing_assistant = get_writing_assistant()
-        else:
-            self.writing_assistant = None
+        # Writing assistant (created on first use)
+        self._writing_assistant = None
         
         # Suggestion state
         self.show_suggestions = False
@@ -65,8 +73,22 @@ class NotepadView:
         self.show_definition = False
         self.current_word_definition = None
     
-    def draw(self, screen, notebook):
-        """Draw the notepad screen with left toolbar - BLACK AND WHITE THEME"""
+    @property
+    def writing_assistant(self):
+        """Writing assistant, or None if it is not installed"""
+        if self._writing_assistant is None and WRITING_ASSISTANT_AVAILABLE:
+            try:
+                from writing_assistant import get_writing_assistant
+                self._writing_assistant = get_writing_assistant()
+            except ImportError as e:
+                print(f"[Info] Writing assistant not available: {e}")
+        return self._writing_assistant
+    
+    def draw(self, screen, notebook, history=None):
+        """
+        Draw the notepad screen with left toolbar - BLACK AND WHITE THEME
+        history: the notebook's undo History (greys out Undo/Redo when empty)
+        """
         screen.fill(NOTEPAD_BG)  # Pure white background
         draw_improved_status_bar(screen, self.font_s)
         
@@ -78,18 +100,25 @@ class NotepadView:
         
         # Create a surface for the visible canvas area
         visible_canvas = pygame.Surface((canvas_width, visible_height))
-        visible_canvas.fill(NOTEPAD_BG)  # Pure white
         
-        # Draw all visible layers onto the visible canvas
-        for layer in notebook.layers:
-            if layer.visible:
-                # Blit the portion of the layer that should be visible
-                # accounting for scroll offset
-                source_rect = pygame.Rect(0, self.scroll_offset, canvas_width, visible_height)
-                visible_canvas.blit(layer.surf, (0, 0), source_rect)
+        # Draw visible layers, starting from the topmost opaque one -
+        # anything below it is hidden anyway (and may never be painted)
+        layers = notebook.page.visible_layers()
+        if not (layers and layers[0].opaque):
+            # Template background plane, only for the visible rows
+            draw_background(visible_canvas, notebook.template_name, self.scroll_offset)
+        for layer in layers:
+            # Blit the portion of the layer that should be visible
+            # accounting for scroll offset
+            source_rect = pygame.Rect(0, self.scroll_offset, canvas_width, visible_height)
+            layer.draw_onto(visible_canvas, (0, 0), source_rect)
+        
+        # Highlighter stroke in progress (composited into its layer on pen-up)
+        self.brush.draw_preview(visible_canvas, self.scroll_offset)
         
         # Draw the visible canvas to the screen
         screen.blit(visible_canvas, (self.toolbar_width, self.toolbar_start_y))
+        self.draw_page_bar(screen, notebook)
         
         # Draw left toolbar - Light gray - PORTRAIT HEIGHT
         portrait_height = 1024
@@ -108,7 +137,7 @@ class NotepadView:
         # Back button at top of toolbar - SMALLER
         self.back_btn = pygame.Rect(10, 35, 60, 35)
         pygame.draw.rect(screen, COLOR_UI_LIGHT, self.back_btn, border_radius=12)
-        back_text = self.font_s.render("←", True, COLOR_BLACK)
+        back_text = render_text(self.font_s, "←", True, COLOR_BLACK)
         screen.blit(back_text, (self.back_btn.centerx - 6, self.back_btn.centery - 8))
         
         # Tool selection buttons - HIGH POSITION for full visibility
@@ -151,7 +180,7 @@ class NotepadView:
                         (pen_cx + 3, pen_icon_y - 6), 2)
         
         # Pen label
-        pen_label = self.font_s.render("Pen", True, pen_color)
+        pen_label = render_text(self.font_s, "Pen", True, pen_color)
         screen.blit(pen_label, (pen_cx - pen_label.get_width()//2, self.pen_btn.y + 48))
         
         # === HIGHLIGHTER BUTTON ===
@@ -178,7 +207,7 @@ class NotepadView:
         pygame.draw.polygon(screen, hl_color, tip_points)
         
         # Highlighter label
-        hl_label = self.font_s.render("Mark", True, hl_color)
+        hl_label = render_text(self.font_s, "Mark", True, hl_color)
         screen.blit(hl_label, (hl_cx - hl_label.get_width()//2, self.highlighter_btn.y + 48))
         
         # === ERASER BUTTON ===
@@ -205,9 +234,21 @@ class NotepadView:
                         (eraser_cx + 13, eraser_icon_y - 9), 2)
         
         # Eraser label
-        eraser_label = self.font_s.render("Eraser", True, eraser_color)
+        eraser_label = render_text(self.font_s, "Eraser", True, eraser_color)
         screen.blit(eraser_label, (eraser_cx - eraser_label.get_width()//2, self.eraser_btn.y + 48))
         
+        # === UNDO / REDO ===
+        self.undo_btn = pygame.Rect(10, 334, 60, 40)
+        self.redo_btn = pygame.Rect(10, 389, 60, 40)
+        can_undo = history is not None and history.can_undo()
+        can_redo = history is not None and history.can_redo()
+        for btn, label, enabled in ((self.undo_btn, "Undo", can_undo),
+                                    (self.redo_btn, "Redo", can_redo)):
+            pygame.draw.rect(screen, COLOR_UI_LIGHT, btn, border_radius=8)
+            text_color = COLOR_BLACK if enabled else COLOR_UI_DARK
+            text = render_text(self.font_s, label, True, text_color)
+            screen.blit(text, (btn.centerx - text.get_width()//2, btn.centery - text.get_height()//2))
+        
         # Calculate all button positions for PORTRAIT 600x1024
         # Lots of vertical space! No need to cram buttons
         
@@ -231,7 +272,7 @@ class NotepadView:
         # Size up button - Nice and comfortable
         self.size_up = pygame.Rect(10, size_controls_start, 60, 40)
         pygame.draw.rect(screen, COLOR_UI_LIGHT, self.size_up, border_radius=5)
-        plus_text = self.font_l.render("+", True, COLOR_BLACK)
+        plus_text = render_text(self.font_l, "+", True, COLOR_BLACK)
         screen.blit(plus_text, (self.size_up.centerx - 10, self.size_up.centery - 12))
         
         # Current size indicator - Shows size for current tool
@@ -245,13 +286,13 @@ class NotepadView:
         size_y = size_controls_start + 45
         display_radius = min(current_size // 2, 20)  # Can be bigger
         pygame.draw.circle(screen, COLOR_BLACK, (40, size_y + 15), display_radius)
-        size_text = self.font_s.render(f"{current_size}", True, COLOR_BLACK)
+        size_text = render_text(self.font_s, f"{current_size}", True, COLOR_BLACK)
         screen.blit(size_text, (40 - size_text.get_width()//2, size_y + 35))
         
         # Size down button
         self.size_down = pygame.Rect(10, size_controls_start + 80, 60, 40)
         pygame.draw.rect(screen, COLOR_UI_LIGHT, self.size_down, border_radius=5)
-        minus_text = self.font_l.render("−", True, COLOR_BLACK)
+        minus_text = render_text(self.font_l, "−", True, COLOR_BLACK)
         screen.blit(minus_text, (self.size_down.centerx - 8, self.size_down.centery - 12))
         
         
@@ -266,7 +307,7 @@ class NotepadView:
         # Export PDF button - GRAYSCALE
         self.export_pdf_btn = pygame.Rect(10, y_pdf, 60, button_height)
         pygame.draw.rect(screen, (100, 100, 100), self.export_pdf_btn, border_radius=8)  # Medium grey
-        pdf_text = self.font_s.render("PDF", True, COLOR_WHITE)
+        pdf_text = render_text(self.font_s, "PDF", True, COLOR_WHITE)
         screen.blit(pdf_text, (self.export_pdf_btn.centerx - 12, self.export_pdf_btn.centery - 8))
         
         # Search button
@@ -282,7 +323,7 @@ class NotepadView:
         # Convert to text button - GRAYSCALE
         self.convert_btn = pygame.Rect(10, y_convert, 60, button_height)
         pygame.draw.rect(screen, (120, 120, 120), self.convert_btn, border_radius=8)  # Light grey
-        convert_text = self.font_m.render("Aa", True, COLOR_WHITE)
+        convert_text = render_text(self.font_m, "Aa", True, COLOR_WHITE)
         screen.blit(convert_text, (self.convert_btn.centerx - 10, self.convert_btn.centery - 10))
         
         # Spell Check button - ALWAYS SHOW (handle missing library gracefully)
@@ -296,7 +337,7 @@ class NotepadView:
         
         # Draw "ABC✓" icon
         icon_color = COLOR_WHITE
-        abc_text = self.font_s.render("ABC", True, icon_color)
+        abc_text = render_text(self.font_s, "ABC", True, icon_color)
         screen.blit(abc_text, (self.spell_check_btn.centerx - 15, self.spell_check_btn.centery - 12))
         
         # Draw checkmark
@@ -345,9 +386,31 @@ class NotepadView:
         
         # Scroll indicator if scrolled
         if self.scroll_offset > 0:
-            scroll_text = self.font_m.render("^", True, COLOR_UI_DARK)
+            scroll_text = render_text(self.font_m, "^", True, COLOR_UI_DARK)
             screen.blit(scroll_text, (35, DISPLAY_HEIGHT - 490))
     
+    def draw_page_bar(self, screen, notebook):
+        """Previous / next / add page controls at the bottom of the canvas"""
+        bar = pygame.Rect(0, 0, 260, 44)
+        bar.midbottom = (self.toolbar_width + (600 - self.toolbar_width) // 2, 1024 - 12)
+        pygame.draw.rect(screen, COLOR_UI_LIGHT, bar, border_radius=22)
+        pygame.draw.rect(screen, COLOR_UI_DARK, bar, 1, border_radius=22)
+        
+        self.prev_page_btn = pygame.Rect(bar.x, bar.y, 60, bar.height)
+        self.add_page_btn = pygame.Rect(bar.right - 110, bar.y, 50, bar.height)
+        self.next_page_btn = pygame.Rect(bar.right - 60, bar.y, 60, bar.height)
+        first = notebook.page_idx == 0
+        last = notebook.page_idx == len(notebook.pages) - 1
+        for btn, label, enabled in ((self.prev_page_btn, "<", not first),
+                                    (self.add_page_btn, "+", True),
+                                    (self.next_page_btn, ">", not last)):
+            text = render_text(self.font_m, label, True, COLOR_BLACK if enabled else COLOR_UI_DARK)
+            screen.blit(text, (btn.centerx - text.get_width()//2, btn.centery - text.get_height()//2))
+        
+        label = render_text(self.font_s, f"{notebook.page_idx + 1} / {len(notebook.pages)}", True, COLOR_BLACK)
+        label_x = (self.prev_page_btn.right + self.add_page_btn.left - label.get_width()) // 2
+        screen.blit(label, (label_x, bar.centery - label.get_height()//2))
+    
     def handle_click(self, pos):
         """
         Handle click events on notepad screen
@@ -395,6 +458,9 @@ class NotepadView:
             if hasattr(self, 'merge_all_btn') and self.merge_all_btn.collidepoint(pos):
                 return ('merge_all_layers', None)
             
+            if hasattr(self, 'merge_down_btn') and self.merge_down_btn.collidepoint(pos):
+                return ('merge_down', None)
+            
             # If clicked anywhere else in menu, do nothing (don't close)
             return (None, None)
         
@@ -439,6 +505,13 @@ class NotepadView:
         if self.eraser_btn and self.eraser_btn.collidepoint(pos):
             return ('select_eraser', None)
         
+        # Undo / redo
+        if self.undo_btn and self.undo_btn.collidepoint(pos):
+            return ('undo', None)
+        
+        if self.redo_btn and self.redo_btn.collidepoint(pos):
+            return ('redo', None)
+        
         # Size adjustment
         if self.size_up and self.size_up.collidepoint(pos):
             return ('increase_size', None)
@@ -475,12 +548,18 @@ class NotepadView:
         if hasattr(self, 'layers_btn') and self.layers_btn and self.layers_btn.collidepoint(pos):
             return ('toggle_layer_menu', None)
         
+        # Page bar (over the bottom of the canvas)
+        if self.prev_page_btn and self.prev_page_btn.collidepoint(pos):
+            return ('prev_page', None)
+        if self.next_page_btn and self.next_page_btn.collidepoint(pos):
+            return ('next_page', None)
+        if self.add_page_btn and self.add_page_btn.collidepoint(pos):
+            return ('add_page', None)
+        
         # Drawing area (right of toolbar, below status bar)
         if pos[0] > self.toolbar_width and pos[1] > self.toolbar_start_y:
-            # Adjust position for canvas coordinates (account for scroll and toolbar)
-            canvas_x = pos[0] - self.toolbar_width
-            canvas_y = pos[1] - self.toolbar_start_y + self.scroll_offset
-            return ('start_drawing', (canvas_x, canvas_y))
+            # Screen position - start_drawing converts it to canvas coordinates
+            return ('start_drawing', pos)
         
         return (None, None)
     
@@ -528,93 +607,59 @@ class NotepadView:
             else:
                 self.eraser_size = max(5, self.eraser_size - 5)
     
-    def start_drawing(self, pos):
+    def start_drawing(self, pos, t=None):
         """Start a drawing stroke"""
         self.drawing = True
         # Convert to canvas position immediately
         canvas_pos = self.adjust_pos_for_canvas(pos)
         if canvas_pos:
-            self.last_pos = canvas_pos
-            # Mark that this is the first point (don't draw line yet)
-            self.first_point = True
-        else:
-            self.last_pos = None
-            self.first_point = False
+            self.stroke.begin(canvas_pos, time.perf_counter() if t is None else t)
+            self.brush.begin(self.tool, self.current_brush_width())
     
-    def stop_drawing(self):
-        """Stop drawing"""
+    def stop_drawing(self, surface=None):
+        """
+        Stop drawing, finishing the stroke on surface
+        Returns the rect of the layer the stroke changed, or None.
+        """
         self.drawing = False
+        if not self.stroke.active:
+            return None
+        self.stroke.end()
+        if surface is None:
+            return None
+        self.render_stroke(surface)
+        return self.brush.end(surface)
     
-    def draw_stroke(self, surface, pos):
-        """Draw a stroke on the surface from last_pos to pos"""
-        if not self.drawing or not self.last_pos:
+    def current_brush_width(self):
+        """Stroke width of the selected tool"""
+        if self.tool == 'pen':
+            return self.pen_size
+        if self.tool == 'highlighter':
+            return self.highlighter_size
+        return self.eraser_size * 2  # eraser size is a radius
+    
+    def add_stroke_point(self, pos, t=None):
+        """Record one motion sample; it is drawn by the next render_stroke"""
+        if not self.drawing:
             return
-        
-        # Convert screen position to canvas position
         canvas_pos = self.adjust_pos_for_canvas(pos)
-        if not canvas_pos:
-            return
-        
-        # If this is the first point, just draw a dot/circle at that position
-        if self.first_point:
-            self.first_point = False
-            if self.tool == 'pen':
-                # Draw a small circle at the starting point
-                pygame.draw.circle(surface, COLOR_BLACK, canvas_pos, self.pen_size // 2)
-            elif self.tool == 'highlighter':
-                # Draw a semi-transparent circle
-                temp_surface = pygame.Surface((self.highlighter_size * 2, self.highlighter_size * 2), pygame.SRCALPHA)
-                pygame.draw.circle(temp_surface, (180, 180, 180, 100), 
-                                 (self.highlighter_size, self.highlighter_size), 
-                                 self.highlighter_size // 2)
-                surface.blit(temp_surface, (canvas_pos[0] - self.highlighter_size, 
-                                           canvas_pos[1] - self.highlighter_size))
-            else:  # eraser
-                pygame.draw.circle(surface, (0, 0, 0, 0), canvas_pos, self.eraser_size)
-            
-            self.last_pos = canvas_pos
-            return
-        
-        # Draw from last position to current position (normal stroke)
-        if self.tool == 'pen':
-            pygame.draw.line(
-                surface,
-                COLOR_BLACK,
-                self.last_pos,
-                canvas_pos,
-                self.pen_size
-            )
-        elif self.tool == 'highlighter':
-            # Light grey highlighter for grayscale display (like real highlighting)
-            # Create a temporary surface for transparency
-            temp_surface = pygame.Surface((abs(canvas_pos[0] - self.last_pos[0]) + self.highlighter_size,
-                                          abs(canvas_pos[1] - self.last_pos[1]) + self.highlighter_size),
-                                         pygame.SRCALPHA)
-            # Calculate relative positions on temp surface
-            offset_x = min(self.last_pos[0], canvas_pos[0]) - self.highlighter_size//2
-            offset_y = min(self.last_pos[1], canvas_pos[1]) - self.highlighter_size//2
-            rel_last = (self.last_pos[0] - offset_x, self.last_pos[1] - offset_y)
-            rel_pos = (canvas_pos[0] - offset_x, canvas_pos[1] - offset_y)
-            
-            # Draw semi-transparent light grey line (grayscale highlighter)
-            pygame.draw.line(
-                temp_surface,
-                (180, 180, 180, 100),  # Light grey with alpha=100 (semi-transparent)
-                rel_last,
-                rel_pos,
-                self.highlighter_size
-            )
-            # Blit to main surface
-            surface.blit(temp_surface, (offset_x, offset_y))
-        else:  # eraser
-            pygame.draw.circle(
-                surface,
-                (0, 0, 0, 0),
-                canvas_pos,
-                self.eraser_size
-            )
-        
-        self.last_pos = canvas_pos
+        if canvas_pos:
+            self.stroke.add(canvas_pos, time.perf_counter() if t is None else t)
+    
+    def render_stroke(self, surface):
+        """
+        Draw the stroke path collected since the last call
+        Called once per frame, so a whole batch of motion events costs
+        one polyline instead of one draw call per event.
+        Returns True if anything was drawn.
+        """
+        points = [(int(round(x)), int(round(y))) for x, y in self.stroke.take_points()]
+        # Drop repeated points (sub-pixel movement)
+        points = [p for i, p in enumerate(points) if i == 0 or p != points[i - 1]]
+        if not points:
+            return False
+        self.brush.add(surface, points)
+        return True
 
     def draw_template_menu(self, screen):
         """Draw template selection menu"""
@@ -634,7 +679,7 @@ class NotepadView:
         pygame.draw.rect(screen, COLOR_UI_DARK, panel, 2, border_radius=10)
         
         # Title
-        title = self.font_m.render("Templates", True, COLOR_BLACK)
+        title = render_text(self.font_m, "Templates", True, COLOR_BLACK)
         screen.blit(title, (panel_x + 10, panel_y + 10))
         
         # Template options
@@ -644,7 +689,7 @@ class NotepadView:
             rect = pygame.Rect(panel_x + 10, y, panel_width - 20, 40)
             pygame.draw.rect(screen, COLOR_UI_LIGHT, rect, border_radius=5)
             
-            name_text = self.font_s.render(template.name, True, COLOR_BLACK)
+            name_text = render_text(self.font_s, template.name, True, COLOR_BLACK)
             screen.blit(name_text, (rect.x + 10, rect.y + 12))
             
             self.template_options.append((rect, template.name))
@@ -674,7 +719,7 @@ class NotepadView:
         pygame.draw.rect(screen, (150, 150, 150), panel, 2, border_radius=15)
         
         # Title bar with close button
-        title = self.font_l.render("Layers", True, (40, 40, 40))
+        title = render_text(self.font_l, "Layers", True, (40, 40, 40))
         screen.blit(title, (panel_x + 20, panel_y + 15))
         
         # Close button (X) - IMPORTANT FIX
@@ -693,14 +738,14 @@ class NotepadView:
         # Add layer button
         self.add_layer_btn = pygame.Rect(panel_x + 20, panel_y + 60, 120, 38)
         pygame.draw.rect(screen, (80, 80, 80), self.add_layer_btn, border_radius=8)
-        add_text = self.font_m.render("+ Add Layer", True, (255, 255, 255))
+        add_text = render_text(self.font_m, "+ Add Layer", True, (255, 255, 255))
         screen.blit(add_text, (self.add_layer_btn.centerx - 42, self.add_layer_btn.centery - 10))
         
         # Delete layer button (if more than 1 layer exists)
         if len(notebook.layers) > 1:
             self.delete_layer_btn = pygame.Rect(panel_x + 155, panel_y + 60, 145, 38)
             pygame.draw.rect(screen, (160, 160, 160), self.delete_layer_btn, border_radius=8)
-            del_text = self.font_m.render("\u2212 Delete Current", True, (255, 255, 255))
+            del_text = render_text(self.font_m, "\u2212 Delete Current", True, (255, 255, 255))
             screen.blit(del_text, (self.delete_layer_btn.centerx - 60, self.delete_layer_btn.centery - 10))
         else:
             self.delete_layer_btn = None
@@ -749,11 +794,11 @@ class NotepadView:
             
             # Layer name and info
             name_text = f"Layer {i+1}"
-            name_surf = self.font_m.render(name_text, True, text_color)
+            name_surf = render_text(self.font_m, name_text, True, text_color)
             screen.blit(name_surf, (rect.x + 48, rect.y + 12))
             
             template_text = f"({layer.template_name})"
-            template_surf = self.font_s.render(template_text, True, detail_color)
+            template_surf = render_text(self.font_s, template_text, True, detail_color)
             screen.blit(template_surf, (rect.x + 48, rect.y + 38))
             
             # Action buttons (small) - Move up/down
@@ -797,9 +842,16 @@ class NotepadView:
         # Merge all visible button - GRAYSCALE
         merge_btn = pygame.Rect(ops_rect.x + 10, ops_rect.y + 8, 140, 24)
         pygame.draw.rect(screen, (140, 140, 140), merge_btn, border_radius=5)
-        merge_text = self.font_s.render("Merge All Visible", True, (255, 255, 255))
+        merge_text = render_text(self.font_s, "Merge All Visible", True, (255, 255, 255))
         screen.blit(merge_text, (merge_btn.centerx - 52, merge_btn.centery - 7))
         self.merge_all_btn = merge_btn
+        
+        # Merge active layer into the one below
+        self.merge_down_btn = pygame.Rect(ops_rect.x + 160, ops_rect.y + 8, 120, 24)
+        pygame.draw.rect(screen, (140, 140, 140), self.merge_down_btn, border_radius=5)
+        merge_down_text = render_text(self.font_s, "Merge Down", True, (255, 255, 255))
+        screen.blit(merge_down_text, (self.merge_down_btn.centerx - merge_down_text.get_width()//2,
+                                      self.merge_down_btn.centery - 7))
     
     def draw_suggestions_panel(self, screen):
         """Draw spell check suggestions panel"""
@@ -815,7 +867,7 @@ class NotepadView:
         pygame.draw.rect(screen, (150, 150, 150), panel_rect, 2, border_radius=10)
         
         # Title
-        title = self.font_m.render("Spelling Suggestions", True, COLOR_BLACK)
+        title = render_text(self.font_m, "Spelling Suggestions", True, COLOR_BLACK)
         screen.blit(title, (panel_x + 15, panel_y + 15))
         
         # Close button
@@ -833,7 +885,7 @@ class NotepadView:
         
         for i, error in enumerate(self.current_suggestions[:5]):  # Show max 5 errors
             # Error word
-            word_text = self.font_m.render(f'"{error["word"]}"', True, (150, 0, 0))
+            word_text = render_text(self.font_m, f'"{error["word"]}"', True, (150, 0, 0))
             screen.blit(word_text, (panel_x + 20, y))
             y += 30
             
@@ -846,14 +898,14 @@ class NotepadView:
                     pygame.draw.rect(screen, (180, 180, 180), btn, 1, border_radius=5)
                     
                     # Suggestion text
-                    sugg_text = self.font_s.render(suggestion, True, COLOR_BLACK)
+                    sugg_text = render_text(self.font_s, suggestion, True, COLOR_BLACK)
                     screen.blit(sugg_text, (btn.x + 10, btn.centery - 8))
                     
                     # Store button for click detection
                     self.suggestion_btns.append((btn, error['word'], suggestion, i))
                     y += 35
             else:
-                no_sugg = self.font_s.render("No suggestions", True, (100, 100, 100))
+                no_sugg = render_text(self.font_s, "No suggestions", True, (100, 100, 100))
                 screen.blit(no_sugg, (panel_x + 30, y))
                 y += 30
             
@@ -868,14 +920,14 @@ class NotepadView:
         # "Ignore All" button
         ignore_btn = pygame.Rect(panel_x + 20, btn_y, 120, 30)
         pygame.draw.rect(screen, (180, 180, 180), ignore_btn, border_radius=5)
-        ignore_text = self.font_s.render("Ignore All", True, COLOR_BLACK)
+        ignore_text = render_text(self.font_s, "Ignore All", True, COLOR_BLACK)
         screen.blit(ignore_text, (ignore_btn.centerx - 35, ignore_btn.centery - 8))
         self.ignore_all_btn = ignore_btn
         
         # "Re-check" button  
         recheck_btn = pygame.Rect(panel_x + 160, btn_y, 120, 30)
         pygame.draw.rect(screen, (100, 100, 100), recheck_btn, border_radius=5)
-        recheck_text = self.font_s.render("Re-check", True, COLOR_WHITE)
+        recheck_text = render_text(self.font_s, "Re-check", True, COLOR_WHITE)
         screen.blit(recheck_text, (recheck_btn.centerx - 32, recheck_btn.centery - 8))
         self.recheck_btn = recheck_btn
     
@@ -895,19 +947,19 @@ class NotepadView:
         pygame.draw.rect(screen, COLOR_UI_DARK, panel, 2, border_radius=10)
         
         # Title
-        title = self.font_l.render("Word Search", True, COLOR_BLACK)
+        title = render_text(self.font_l, "Word Search", True, COLOR_BLACK)
         screen.blit(title, (panel_x + 20, panel_y + 15))
         
         # Close button
         self.close_search_btn = pygame.Rect(panel_x + panel_width - 40, panel_y + 10, 30, 30)
         pygame.draw.rect(screen, COLOR_UI_LIGHT, self.close_search_btn, border_radius=5)
-        close_text = self.font_l.render("×", True, COLOR_BLACK)
+        close_text = render_text(self.font_l, "×", True, COLOR_BLACK)
         screen.blit(close_text, (self.close_search_btn.centerx - 8, self.close_search_btn.centery - 12))
         
         # Show extracted words or instructions
         if extracted_words and len(extracted_words) > 0:
             # Instructions
-            inst = self.font_s.render("Click a word to see its definition:", True, COLOR_BLACK)
+            inst = render_text(self.font_s, "Click a word to see its definition:", True, COLOR_BLACK)
             screen.blit(inst, (panel_x + 20, panel_y + 60))
             
             # Word buttons
@@ -918,15 +970,15 @@ class NotepadView:
                 word_rect = pygame.Rect(panel_x + 20, y, panel_width - 40, 35)
                 pygame.draw.rect(screen, COLOR_UI_LIGHT, word_rect, border_radius=5)
                 
-                word_text = self.font_m.render(word, True, COLOR_BLACK)
+                word_text = render_text(self.font_m, word, True, COLOR_BLACK)
                 screen.blit(word_text, (word_rect.x + 10, word_rect.y + 8))
                 
                 self.word_btns.append((word_rect, word))
                 y += 40
         else:
             # No words extracted yet
-            inst1 = self.font_m.render("Extracting text from your", True, COLOR_BLACK)
-            inst2 = self.font_m.render("notebook...", True, COLOR_BLACK)
+            inst1 = render_text(self.font_m, "Extracting text from your", True, COLOR_BLACK)
+            inst2 = render_text(self.font_m, "notebook...", True, COLOR_BLACK)
             screen.blit(inst1, (panel_x + 60, panel_y + 200))
             screen.blit(inst2, (panel_x + 100, panel_y + 230))
     
@@ -945,11 +997,11 @@ class NotepadView:
         # Back button
         self.dict_back_btn = pygame.Rect(panel_x + 10, panel_y + 10, 60, 30)
         pygame.draw.rect(screen, COLOR_UI_LIGHT, self.dict_back_btn, border_radius=5)
-        back_text = self.font_s.render("< Back", True, COLOR_BLACK)
+        back_text = render_text(self.font_s, "< Back", True, COLOR_BLACK)
         screen.blit(back_text, (self.dict_back_btn.x + 8, self.dict_back_btn.y + 8))
         
         # Word title
-        word_title = self.font_l.render(word.upper(), True, COLOR_BLACK)
+        word_title = render_text(self.font_l, word.upper(), True, COLOR_BLACK)
         screen.blit(word_title, (panel_x + 20, panel_y + 50))
         
         # Content area
@@ -958,40 +1010,40 @@ class NotepadView:
         if definition_data.get('found'):
             # Phonetic
             if definition_data.get('phonetic'):
-                phonetic_text = self.font_s.render(definition_data['phonetic'], True, COLOR_UI_DARK)
+                phonetic_text = render_text(self.font_s, definition_data['phonetic'], True, COLOR_UI_DARK)
                 screen.blit(phonetic_text, (panel_x + 20, y))
                 y += 30
             
             # Definitions
             for i, defn in enumerate(definition_data.get('definitions', [])[:3]):
                 # Part of speech
-                pos_text = self.font_m.render(f"{defn['pos']}", True, COLOR_ACCENT)
+                pos_text = render_text(self.font_m, f"{defn['pos']}", True, COLOR_ACCENT)
                 screen.blit(pos_text, (panel_x + 20, y))
                 y += 25
                 
                 # Definition (word wrap)
                 def_lines = self._wrap_text(defn['definition'], panel_width - 60, self.font_s)
                 for line in def_lines[:3]:  # Max 3 lines per definition
-                    def_surf = self.font_s.render(line, True, COLOR_BLACK)
+                    def_surf = render_text(self.font_s, line, True, COLOR_BLACK)
                     screen.blit(def_surf, (panel_x + 30, y))
                     y += 20
                 y += 10
             
             # Synonyms
             if definition_data.get('synonyms'):
-                syn_label = self.font_m.render("Synonyms:", True, COLOR_BLACK)
+                syn_label = render_text(self.font_m, "Synonyms:", True, COLOR_BLACK)
                 screen.blit(syn_label, (panel_x + 20, y))
                 y += 25
                 
                 syn_text = ", ".join(definition_data['synonyms'][:5])
                 syn_lines = self._wrap_text(syn_text, panel_width - 60, self.font_s)
                 for line in syn_lines[:2]:
-                    syn_surf = self.font_s.render(line, True, COLOR_UI_DARK)
+                    syn_surf = render_text(self.font_s, line, True, COLOR_UI_DARK)
                     screen.blit(syn_surf, (panel_x + 30, y))
                     y += 20
         else:
             # Not found
-            error_text = self.font_m.render("Word not found in dictionary", True, COLOR_BLACK)
+            error_text = render_text(self.font_m, "Word not found in dictionary", True, COLOR_BLACK)
             screen.blit(error_text, (panel_x + 60, y))
     
     def _wrap_text(self, text, max_width, font):
@@ -30,6 +30,10 @@
 from machine import Pin, SPI, I2C
 import framebuf
 import utime
+from epd_refresh import changed_window, RefreshScheduler
+import epd_raster
+from touch_ring import TouchReader, TouchTracker, DOWN, UP
+from touch_calibration import AffineCalibration, fit_affine
 
 # Display resolution
 EPD_WIDTH       = 128
@@ -79,6 +83,14 @@ WF_PARTIAL_2IN9_Wait = [
 0x22,0x17,0x41,0xB0,0x32,0x36,
 ]
 
+# Display option register (0x37) for partial refresh
+PARTIAL_OPTIONS = bytes([0x00, 0x00, 0x00, 0x00, 0x00, 0x40, 0x00, 0x00, 0x00, 0x00])
+
+# Touch calibration (affine matrix; calibration.txt is the old min/max format)
+CALIBRATION_FILE = "calibration.abcal"
+LEGACY_CALIBRATION_FILE = "calibration.txt"
+RAW_TOUCH_MAX = 4095
+
 # e-Paper
 RST_PIN         = 12
 DC_PIN          = 8
@@ -126,6 +138,10 @@ class config():
     def spi_writebyte(self, data):
         self.spi.write(bytearray(data))
 
+    def spi_writebuf(self, buf):
+        # One SPI transfer for a whole buffer (bytearray/bytes/memoryview)
+        self.spi.write(buf)
+
     def i2c_writebyte(self, reg, value):
         wbuf = [(reg>>8)&0xff, reg&0xff, value]
         self.i2c.writeto(self.address, bytearray(wbuf))
@@ -157,12 +173,19 @@ class EPD_2in9(framebuf.FrameBuffer):
         self.darkgray = 0xaa
         self.grayish = 0x55
 
-        self.lut = WF_PARTIAL_2IN9
-        self.lut_l = WF_PARTIAL_2IN9_Wait
+        self.lut = bytes(WF_PARTIAL_2IN9[:153])
+        self.lut_l = bytes(WF_PARTIAL_2IN9_Wait[:153])
 
-        self.buffer = bytearray(self.height * self.width // 8)
+        self.row_bytes = self.width // 8
+        self.buffer = bytearray(self.height * self.row_bytes)
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_HLSB)
 
+        # What the panel RAM holds (None until the first full update), and
+        # a scratch buffer to pack a partial window into one transfer
+        self.shown = None
+        self._window = bytearray(len(self.buffer))
+        self._cmd = bytearray(4)
+
     # Hardware reset
     def reset(self):
         self.config.digital_write(self.config.reset_pin, 1)
@@ -184,19 +207,31 @@ class EPD_2in9(framebuf.FrameBuffer):
         self.config.spi_writebyte([data])
         self.config.digital_write(self.config.cs_pin, 1)
 
+    def send_buffer(self, buf):
+        """Data bytes in a single transfer (one DC/CS cycle)"""
+        self.config.digital_write(self.config.dc_pin, 1)
+        self.config.digital_write(self.config.cs_pin, 0)
+        self.config.spi_writebuf(buf)
+        self.config.digital_write(self.config.cs_pin, 1)
+
+    def send_params(self, command, *params):
+        self.send_command(command)
+        cmd = self._cmd
+        for i, p in enumerate(params):
+            cmd[i] = p & 0xFF
+        self.send_buffer(memoryview(cmd)[:len(params)])
+
     def ReadBusy(self):
         while(self.config.digital_read(self.config.busy_pin) == 1):
             self.config.delay_ms(10)
 
     def TurnOnDisplay(self):
-        self.send_command(0x22)
-        self.send_data(0xF7)
+        self.send_params(0x22, 0xF7)
         self.send_command(0x20)
         self.ReadBusy()
 
     def TurnOnDisplay_Partial(self):
-        self.send_command(0x22)
-        self.send_data(0x0F)
+        self.send_params(0x22, 0x0F)
         self.send_command(0x20)
         self.ReadBusy()
 
@@ -205,32 +240,17 @@ class EPD_2in9(framebuf.FrameBuffer):
 
     def SendLut(self, isQuick):
         self.send_command(0x32)
-        if(isQuick):
-            for i in range(0, 153):
-                self.send_data(self.lut_l[i])
-        else:
-            for i in range(0, 153):
-                self.send_data(self.lut[i])
+        self.send_buffer(self.lut_l if isQuick else self.lut)
         self.ReadBusy()
 
     def SetWindow(self, x_start, y_start, x_end, y_end):
-        self.send_command(0x44)
-        self.send_data((x_start>>3) & 0xFF)
-        self.send_data((x_end>>3) & 0xFF)
-        
-        self.send_command(0x45)
-        self.send_data(y_start & 0xFF)
-        self.send_data((y_start >> 8) & 0xFF)
-        self.send_data(y_end & 0xFF)
-        self.send_data((y_end >> 8) & 0xFF)
+        self.send_params(0x44, x_start >> 3, x_end >> 3)
+        self.send_params(0x45, y_start, y_start >> 8, y_end, y_end >> 8)
 
     def SetCursor(self, x, y):
-        self.send_command(0x4E)
-        self.send_data(x & 0xFF)
-        
-        self.send_command(0x4F)
-        self.send_data(y & 0xFF)
-        self.send_data((y >> 8) & 0xFF)
+        # x is the RAM byte column (8 pixels), y the row
+        self.send_params(0x4E, x)
+        self.send_params(0x4F, y, y >> 8)
         self.ReadBusy()
 
     def init(self):
@@ -239,46 +259,64 @@ class EPD_2in9(framebuf.FrameBuffer):
         self.send_command(0x12)
         self.ReadBusy()   
 
-        self.send_command(0x01)
-        self.send_data(0x27)
-        self.send_data(0x01)
-        self.send_data(0x00)
+        self.send_params(0x01, 0x27, 0x01, 0x00)
 
-        self.send_command(0x11)
-        self.send_data(0x03)
+        self.send_params(0x11, 0x03)
 
         self.SetWindow(0, 0, self.width-1, self.height-1)
 
-        self.send_command(0x21)
-        self.send_data(0x00)
-        self.send_data(0x80)	
+        self.send_params(0x21, 0x00, 0x80)
 
         self.SetCursor(0, 0)
         self.ReadBusy()
         return 0
 
+    def FullWindow(self):
+        # display_Partial leaves a smaller RAM window behind
+        self.SetWindow(0, 0, self.width-1, self.height-1)
+        self.SetCursor(0, 0)
+
+    def _remember(self, image):
+        if self.shown is None:
+            self.shown = bytearray(len(self.buffer))
+        self.shown[:] = image
+
     def display(self, image):
-        if (image == None):
-            return            
+        if image is None:
+            return
+        self.FullWindow()
         self.send_command(0x24)
-        for i in range(0, self.height * int(self.width/8)):
-            self.send_data(image[i])   
+        self.send_buffer(image)
         self.TurnOnDisplay()
+        self._remember(image)
 
     def display_Base(self, image):
-        if (image == None):
-            return   
+        if image is None:
+            return
+        self.FullWindow()
         self.send_command(0x24)
-        for i in range(0, self.height * int(self.width/8)):
-            self.send_data(image[i])
+        self.send_buffer(image)
         self.send_command(0x26)
-        for i in range(0, self.height * int(self.width/8)):
-            self.send_data(image[i])
+        self.send_buffer(image)
         self.TurnOnDisplay()
-
-    def display_Partial(self, image):
-        if (image == None):
-            return
+        self._remember(image)
+
+    def display_Partial(self, image, window=None):
+        """
+        Partial refresh of the rows/byte columns that changed since the last
+        update; window (x0_byte, y0, x1_byte, y1) skips the diff.
+        Returns the window sent, or None if nothing changed.
+        """
+        if image is None:
+            return None
+        if window is None:
+            if self.shown is None:
+                window = (0, 0, self.row_bytes - 1, self.height - 1)
+            else:
+                window = changed_window(self.shown, image, self.row_bytes, self.height)
+                if window is None:
+                    return None
+        x0, y0, x1, y1 = window
 
         self.config.digital_write(self.config.reset_pin, 0)
         self.config.delay_ms(0.2)
@@ -286,38 +324,44 @@ class EPD_2in9(framebuf.FrameBuffer):
 
         self.SendLut(1)
         self.send_command(0x37)
-        self.send_data(0x00)
-        self.send_data(0x00)  
-        self.send_data(0x00)  
-        self.send_data(0x00) 
-        self.send_data(0x00)  	
-        self.send_data(0x40)  
-        self.send_data(0x00)  
-        self.send_data(0x00)   
-        self.send_data(0x00)  
-        self.send_data(0x00)
-
-        self.send_command(0x3C)
-        self.send_data(0x80)
-
-        self.send_command(0x22) 
-        self.send_data(0xC0)   
-        self.send_command(0x20) 
+        self.send_buffer(PARTIAL_OPTIONS)
+
+        self.send_params(0x3C, 0x80)
+
+        self.send_params(0x22, 0xC0)
+        self.send_command(0x20)
         self.ReadBusy()
 
-        self.SetWindow(0, 0, self.width - 1, self.height - 1)
-        self.SetCursor(0, 0)
+        self.SetWindow(x0 * 8, y0, x1 * 8 + 7, y1)
+        self.SetCursor(x0, y0)
 
         self.send_command(0x24)
-        for i in range(0, self.height * int(self.width/8)):
-            self.send_data(image[i])
+        self.send_buffer(self._window_bytes(image, x0, y0, x1, y1))
         self.TurnOnDisplay_Partial()
+        self._remember(image)
+        return window
+
+    def _window_bytes(self, image, x0, y0, x1, y1):
+        """The window's rows, packed back to back (no copy for full-width windows)"""
+        rb = self.row_bytes
+        if x0 == 0 and x1 == rb - 1:
+            return memoryview(image)[y0 * rb:(y1 + 1) * rb]
+        w = x1 - x0 + 1
+        out = self._window
+        n = 0
+        for y in range(y0, y1 + 1):
+            o = y * rb + x0
+            out[n:n + w] = image[o:o + w]
+            n += w
+        return memoryview(out)[:n]
 
     def Clear(self, color):
+        data = bytes([color & 0xFF]) * len(self.buffer)
+        self.FullWindow()
         self.send_command(0x24)
-        for i in range(0, self.height * int(self.width/8)):
-            self.send_data(color)
+        self.send_buffer(data)
         self.TurnOnDisplay()
+        self._remember(data)
 
     def sleep(self):
         self.send_command(0x10)
@@ -326,33 +370,12 @@ class EPD_2in9(framebuf.FrameBuffer):
         self.config.module_exit()
 
 
-class ICNT_Development():
-    def __init__(self):
-        self.Touch = 0
-        self.TouchGestureid = 0
-        self.TouchCount = 0
-
-        self.TouchEvenid = [0, 1, 2, 3, 4]
-        self.X = [0, 1, 2, 3, 4]
-        self.Y = [0, 1, 2, 3, 4]
-        self.P = [0, 1, 2, 3, 4]
-
-
 class ICNT86():
     def __init__(self):
         self.config = config(0x48)
-        # Touch calibration parameters
-        self.x_min = 0
-        self.x_max = 4095
-        self.y_min = 0
-        self.y_max = 4095
-        self.x_offset = 0
-        self.y_offset = 0
-        self.x_scale = 1.0
-        self.y_scale = 1.0
-        self.invert_x = False
-        self.invert_y = False
-        self.swap_xy = False
+        # Raw controller coordinates -> display pixels
+        self.calibration = AffineCalibration.from_ranges(
+            0, RAW_TOUCH_MAX, 0, RAW_TOUCH_MAX, (EPD_WIDTH, EPD_HEIGHT))
 
     def ICNT_Reset(self):
         self.config.digital_write(self.config.trst_pin, 1)
@@ -378,92 +401,8 @@ class ICNT86():
 
     def calibrate_touch(self, raw_x, raw_y):
         """Calibrate touch coordinates to match display"""
-        # Apply offset
-        calibrated_x = raw_x + self.x_offset
-        calibrated_y = raw_y + self.y_offset
-        
-        # Clamp to range
-        calibrated_x = max(self.x_min, min(calibrated_x, self.x_max))
-        calibrated_y = max(self.y_min, min(calibrated_y, self.y_max))
-        
-        # Normalize to 0-1 range
-        norm_x = (calibrated_x - self.x_min) / (self.x_max - self.x_min)
-        norm_y = (calibrated_y - self.y_min) / (self.y_max - self.y_min)
-        
-        # Apply inversion if needed
-        if self.invert_x:
-            norm_x = 1.0 - norm_x
-        if self.invert_y:
-            norm_y = 1.0 - norm_y
-            
-        # Scale to display coordinates (128x296)
-        display_x = int(norm_x * 127 * self.x_scale)
-        display_y = int(norm_y * 295 * self.y_scale)
-        
-        # Swap X and Y if needed
-        if self.swap_xy:
-            display_x, display_y = display_y, display_x
-            
-        # Clamp to display bounds
-        display_x = max(0, min(display_x, 127))
-        display_y = max(0, min(display_y, 295))
-        
-        return display_x, display_y
-
-    def ICNT_Scan(self, ICNT_Dev, ICNT_Old, debug=False):
-        buf = []
-        mask = 0x00
-
-        if ICNT_Dev.Touch == 1:
-            ICNT_Dev.Touch = 0
-            buf = self.ICNT_Read(0x1001, 1)
-
-            if buf[0] == 0x00:
-                self.ICNT_Write(0x1001, mask)
-                self.config.delay_ms(1)
-                if debug:
-                    print("No touch data")
-                return
-            else:
-                ICNT_Dev.TouchCount = buf[0]
-
-            if ICNT_Dev.TouchCount > 5 or ICNT_Dev.TouchCount < 1:
-                self.ICNT_Write(0x1001, mask)
-                ICNT_Dev.TouchCount = 0
-                if debug:
-                    print("Invalid touch count:", ICNT_Dev.TouchCount)
-                return
-
-            buf = self.ICNT_Read(0x1002, ICNT_Dev.TouchCount * 7)
-            self.ICNT_Write(0x1001, mask)
-
-            ICNT_Old.X[0] = ICNT_Dev.X[0]
-            ICNT_Old.Y[0] = ICNT_Dev.Y[0]
-            ICNT_Old.P[0] = ICNT_Dev.P[0]
-
-            for i in range(0, ICNT_Dev.TouchCount):
-                ICNT_Dev.TouchEvenid[i] = buf[6 + 7*i]
-                
-                # Read raw coordinates from touch controller
-                raw_x = ((buf[4 + 7*i] << 8) + buf[3 + 7*i])
-                raw_y = ((buf[2 + 7*i] << 8) + buf[1 + 7*i])
-                ICNT_Dev.P[i] = buf[5 + 7*i]
-                
-                # Calibrate the coordinates
-                display_x, display_y = self.calibrate_touch(raw_x, raw_y)
-                ICNT_Dev.X[i] = display_x
-                ICNT_Dev.Y[i] = display_y
-                
-                if debug:
-                    print(f"Raw: X={raw_x}, Y={raw_y} | Display: X={display_x}, Y={display_y}")
-
-            return
-        return
-
+        return self.calibration.apply(raw_x, raw_y)
 
-def touch_callback(pin):
-    """Callback for touch interrupt"""
-    icnt_dev.Touch = 1
 
 
 def get_key():
@@ -488,23 +427,23 @@ def draw_test_screen(epd):
     
     # Draw calibration points
     # Top-left corner
-    epd.fill_circle(10, 50, 3, 0x00)
+    epd_raster.fill_disc(epd, 10, 50, 3, 0x00)
     epd.text("TL", 15, 60, 0x00)
     
     # Top-right corner
-    epd.fill_circle(118, 50, 3, 0x00)
+    epd_raster.fill_disc(epd, 118, 50, 3, 0x00)
     epd.text("TR", 110, 60, 0x00)
     
     # Bottom-left corner
-    epd.fill_circle(10, 250, 3, 0x00)
+    epd_raster.fill_disc(epd, 10, 250, 3, 0x00)
     epd.text("BL", 15, 260, 0x00)
     
     # Bottom-right corner
-    epd.fill_circle(118, 250, 3, 0x00)
+    epd_raster.fill_disc(epd, 118, 250, 3, 0x00)
     epd.text("BR", 110, 260, 0x00)
     
     # Center
-    epd.fill_circle(64, 150, 3, 0x00)
+    epd_raster.fill_disc(epd, 64, 150, 3, 0x00)
     epd.text("CENTER", 45, 160, 0x00)
     
     # Instructions
@@ -535,7 +474,7 @@ def draw_sketch_screen(epd, last_point=None):
 
 def simple_sketch_mode():
     """Simple sketch mode with debug output"""
-    global icnt_dev, icnt_old, tp, epd
+    global touch, tp, epd
     
     print("\n=== Simple Sketch Mode ===")
     print("Touch the screen to draw")
@@ -546,11 +485,14 @@ def simple_sketch_mode():
     epd.fill(0xff)
     epd.text("Simple Sketch", 20, 10, 0x00)
     epd.text("Touch to draw", 25, 140, 0x00)
-    epd.display_Base(epd.buffer)
+    refresher = RefreshScheduler(epd)
+    refresher.full()
     
-    last_x = -1
-    last_y = -1
-    is_drawing = False
+    tracker = TouchTracker()
+    touch.ring.drain()  # touches from the menu
+    stroke_id = None    # contact that is drawing; other fingers are ignored
+    last = None
+    radius = 2
     
     while True:
         # Check for key presses
@@ -559,7 +501,7 @@ def simple_sketch_mode():
             epd.fill(0xff)
             epd.text("Simple Sketch", 20, 10, 0x00)
             epd.text("Touch to draw", 25, 140, 0x00)
-            epd.display_Base(epd.buffer)
+            refresher.full()
             print("Screen cleared")
             utime.sleep_ms(300)
             
@@ -567,77 +509,39 @@ def simple_sketch_mode():
             print("Exiting sketch mode")
             return
         
-        # Check for touch with debug enabled
-        tp.ICNT_Scan(icnt_dev, icnt_old, debug=True)
-        
-        if icnt_dev.TouchCount > 0:
-            x = icnt_dev.X[0]
-            y = icnt_dev.Y[0]
-            
-            # Print raw coordinates for debugging
-            print(f"Touch at: X={x}, Y={y}")
-            
-            # Draw a point at the touch location
+        # Every sample since the last iteration, in order
+        for kind, cid, x, y, p, t in tracker.update(touch.ring.drain()):
+            if stroke_id is None and kind == DOWN:
+                stroke_id = cid
+                print(f"Touch at: X={x}, Y={y}")
+            if cid != stroke_id:
+                continue
+
+            if kind == UP:
+                # Touch released: show the end of the stroke right away
+                stroke_id = None
+                last = None
+                refresher.flush()
+                continue
+
             if 0 <= x < 128 and 0 <= y < 296:
-                # Draw a small circle
-                radius = 2
-                for i in range(-radius, radius + 1):
-                    for j in range(-radius, radius + 1):
-                        if i*i + j*j <= radius*radius:
-                            px = x + i
-                            py = y + j
-                            if 0 <= px < 128 and 0 <= py < 296:
-                                epd.pixel(px, py, 0)
-                
-                # If we have a previous point, draw a line
-                if last_x != -1 and last_y != -1 and is_drawing:
-                    # Simple line drawing
-                    dx = abs(x - last_x)
-                    dy = abs(y - last_y)
-                    sx = 1 if last_x < x else -1
-                    sy = 1 if last_y < y else -1
-                    err = dx - dy
-                    
-                    while True:
-                        # Draw point
-                        for i in range(-radius, radius + 1):
-                            for j in range(-radius, radius + 1):
-                                if i*i + j*j <= radius*radius:
-                                    px = last_x + i
-                                    py = last_y + j
-                                    if 0 <= px < 128 and 0 <= py < 296:
-                                        epd.pixel(px, py, 0)
-                        
-                        if last_x == x and last_y == y:
-                            break
-                        
-                        e2 = 2 * err
-                        if e2 > -dy:
-                            err -= dy
-                            last_x += sx
-                        if e2 < dx:
-                            err += dx
-                            last_y += sy
-                
-                last_x = x
-                last_y = y
-                is_drawing = True
-                
-                # Update display
-                epd.display_Partial(epd.buffer)
-        else:
-            # Touch released
-            if is_drawing:
-                last_x = -1
-                last_y = -1
-                is_drawing = False
-        
+                # Round-capped segment from the previous point (a dot on touch-down)
+                if last:
+                    rect = epd_raster.thick_line(epd, last[0], last[1], x, y, radius, 0)
+                else:
+                    rect = epd_raster.fill_disc(epd, x, y, radius, 0)
+                last = (x, y)
+
+                # Batched into the next partial refresh
+                refresher.mark(*rect)
+
+        refresher.poll()
         utime.sleep_ms(10)
 
 
 def calibration_mode():
     """Calibration mode to fix touch coordinates"""
-    global icnt_dev, icnt_old, tp, epd
+    global touch, tp, epd
     
     print("\n=== Calibration Mode ===")
     print("Touch each of the 5 points on screen")
@@ -657,6 +561,11 @@ def calibration_mode():
     
     raw_points = []
     
+    # Collect raw controller coordinates (before calibration)
+    touch.calibrate = None
+    tracker = TouchTracker()
+    touch.ring.drain()
+    
     for i, (target_x, target_y) in enumerate(calibration_points):
         print(f"\nTouch point {i+1}: ({target_x}, {target_y})")
         print("Waiting for touch...")
@@ -664,55 +573,47 @@ def calibration_mode():
         # Wait for touch
         touched = False
         while not touched:
-            tp.ICNT_Scan(icnt_dev, icnt_old)
-            if icnt_dev.TouchCount > 0:
-                # Get raw coordinates (before calibration)
-                buf = tp.ICNT_Read(0x1002, 7)
-                raw_x = ((buf[4] << 8) + buf[3])
-                raw_y = ((buf[2] << 8) + buf[1])
-                
+            for kind, cid, raw_x, raw_y, p, t in tracker.update(touch.ring.drain()):
+                if kind != DOWN or touched:
+                    continue
                 print(f"Raw touch: X={raw_x}, Y={raw_y}")
                 raw_points.append((raw_x, raw_y, target_x, target_y))
                 
                 # Draw feedback
-                epd.fill_circle(target_x, target_y, 5, 0x00)
+                epd_raster.fill_disc(epd, target_x, target_y, 5, 0x00)
                 epd.display_Partial(epd.buffer)
                 
                 touched = True
-                utime.sleep_ms(500)  # Wait a bit
+            utime.sleep_ms(10)
         
-        utime.sleep_ms(100)
+        # Wait for the finger to lift before the next target
+        while tracker.contacts:
+            tracker.update(touch.ring.drain())
+            utime.sleep_ms(10)
     
-    # Calculate calibration parameters
-    if len(raw_points) >= 3:
-        # Find min/max raw values
-        raw_x_vals = [p[0] for p in raw_points]
-        raw_y_vals = [p[1] for p in raw_points]
-        
-        tp.x_min = min(raw_x_vals)
-        tp.x_max = max(raw_x_vals)
-        tp.y_min = min(raw_y_vals)
-        tp.y_max = max(raw_y_vals)
-        
+    touch.calibrate = tp.calibrate_touch
+    touch.ring.drain()  # anything left is in raw coordinates
+    tracker = TouchTracker()
+    
+    # Fit the affine map from the touched targets (least squares over all 5;
+    # also covers swapped or mirrored axes)
+    try:
+        cal = fit_affine(raw_points, (EPD_WIDTH, EPD_HEIGHT))
+    except ValueError as e:
+        print(f"Calibration failed: {e}")
+        cal = None
+    if cal:
+        tp.calibration = cal
         print(f"\nCalibration results:")
-        print(f"X range: {tp.x_min} to {tp.x_max}")
-        print(f"Y range: {tp.y_min} to {tp.y_max}")
-        
-        # Try to detect if coordinates are swapped
-        if abs(tp.x_max - tp.x_min) < abs(tp.y_max - tp.y_min):
-            print("Detected: X and Y might be swapped")
-            tp.swap_xy = True
+        print("x' = %.4f x + %.4f y + %.1f" % cal.coeffs[:3])
+        print("y' = %.4f x + %.4f y + %.1f" % cal.coeffs[3:])
+        print(f"RMS error: {cal.error(raw_points):.2f} px")
         
         # Save calibration to file
         try:
-            with open("calibration.txt", "w") as f:
-                f.write(f"x_min={tp.x_min}\n")
-                f.write(f"x_max={tp.x_max}\n")
-                f.write(f"y_min={tp.y_min}\n")
-                f.write(f"y_max={tp.y_max}\n")
-                f.write(f"swap_xy={tp.swap_xy}\n")
-            print("Calibration saved to calibration.txt")
-        except:
+            cal.save(CALIBRATION_FILE)
+            print(f"Calibration saved to {CALIBRATION_FILE}")
+        except OSError:
             print("Could not save calibration")
     
     print("\nCalibration complete!")
@@ -726,15 +627,15 @@ def calibration_mode():
     epd.display_Base(epd.buffer)
     
     for _ in range(100):  # Test for 100 iterations
-        tp.ICNT_Scan(icnt_dev, icnt_old, debug=True)
-        if icnt_dev.TouchCount > 0:
-            x = icnt_dev.X[0]
-            y = icnt_dev.Y[0]
+        events = [e for e in tracker.update(touch.ring.drain()) if e[0] != UP]
+        if events:
+            # Latest position in this batch
+            x, y = events[-1][2], events[-1][3]
             
             # Draw cursor at touch point
             epd.fill(0xff)
             epd.text("Calibration Test", 20, 10, 0x00)
-            epd.fill_circle(x, y, 3, 0x00)
+            epd_raster.fill_disc(epd, x, y, 3, 0x00)
             epd.text(f"X={x}", 10, 280, 0x00)
             epd.text(f"Y={y}", 70, 280, 0x00)
             epd.display_Partial(epd.buffer)
@@ -747,34 +648,36 @@ def calibration_mode():
 def load_calibration():
     """Load calibration from file"""
     try:
-        with open("calibration.txt", "r") as f:
-            lines = f.readlines()
-            for line in lines:
-                if line.startswith("x_min="):
-                    tp.x_min = int(line.split("=")[1])
-                elif line.startswith("x_max="):
-                    tp.x_max = int(line.split("=")[1])
-                elif line.startswith("y_min="):
-                    tp.y_min = int(line.split("=")[1])
-                elif line.startswith("y_max="):
-                    tp.y_max = int(line.split("=")[1])
-                elif line.startswith("swap_xy="):
-                    tp.swap_xy = line.split("=")[1].strip() == "True"
+        tp.calibration = AffineCalibration.load(CALIBRATION_FILE)
+        print("Calibration loaded from file")
+        return True
+    except (OSError, ValueError):
+        pass
+
+    # Older min/max calibration file
+    try:
+        values = {}
+        with open(LEGACY_CALIBRATION_FILE, "r") as f:
+            for line in f.readlines():
+                if "=" in line:
+                    key, value = line.split("=", 1)
+                    values[key.strip()] = value.strip()
+        tp.calibration = AffineCalibration.from_ranges(
+            int(values["x_min"]), int(values["x_max"]), int(values["y_min"]), int(values["y_max"]),
+            (EPD_WIDTH, EPD_HEIGHT), values.get("swap_xy") == "True")
         print("Calibration loaded from file")
         return True
-    except:
+    except (OSError, ValueError, KeyError, ZeroDivisionError):
         print("No calibration file found")
         return False
 
 
 def main():
-    global icnt_dev, icnt_old, tp, epd
+    global touch, tp, epd
     
     # Initialize display and touch
     epd = EPD_2in9()
     tp = ICNT86()
-    icnt_dev = ICNT_Development()
-    icnt_old = ICNT_Development()
     
     print("Initializing e-Paper Sketchbook...")
     epd.init()
@@ -782,8 +685,9 @@ def main():
     print("Initializing touch controller...")
     tp.ICNT_Init()
     
-    # Set up touch interrupt
-    tp.config.int_pin.irq(trigger=Pin.IRQ_FALLING, handler=touch_callback)
+    # Touch points are read on the interrupt into a ring buffer
+    touch = TouchReader(tp)
+    touch.start()
     
     # Try to load calibration
     load_calibration()
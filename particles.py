@@ -0,0 +1,113 @@
+"""
+Vectorized particle system for the ABook boot animation
+Particle state lives in NumPy arrays and is drawn straight into the display
+surface through surfarray, already rotated to the landscape panel.
+Particles are stamped as their own rounded discs (x² + y² <= r²), so they
+are close to, not pixel-identical with, pygame.draw.circle in a rotated
+portrait frame.
+"""
+import numpy as np
+import pygame
+
+
+def linear(t):
+    return t
+
+
+def ease_in_out_cubic(t):
+    t = np.asarray(t, dtype=np.float32)
+    return np.where(t < 0.5, 4 * t * t * t, 1 - (-2 * t + 2) ** 3 / 2)
+
+
+def ease_out_quad(t):
+    t = np.asarray(t, dtype=np.float32)
+    return 1 - (1 - t) * (1 - t)
+
+
+def _disc_offsets(radius):
+    """Pixel offsets of a filled disc of the given radius (x² + y² <= r²)"""
+    r = int(radius)
+    ys, xs = np.mgrid[-r:r + 1, -r:r + 1]
+    inside = xs * xs + ys * ys <= r * r
+    return np.stack([xs[inside], ys[inside]], axis=1).astype(np.int32)
+
+
+class ParticleField:
+    """
+    Particles that fly in to form a logo, hold, then disperse
+    Positions are computed in portrait coordinates (600x1024) from the
+    start/target/disperse arrays, so each frame is a handful of array ops.
+    """
+
+    def __init__(self, targets, count=800, radius=4, area=(600, 1024),
+                 disperse_distance=(300, 600), color=(0, 0, 0),
+                 formation=1.5, hold=1.0, disperse=1.0,
+                 formation_ease=ease_in_out_cubic, disperse_ease=ease_out_quad,
+                 seed=None):
+        rng = np.random.default_rng(seed)
+        width, height = area
+        self.area = area
+        self.radius = radius
+        self.color = color
+        self.formation = formation
+        self.hold = hold
+        self.disperse = disperse
+        self.formation_ease = formation_ease
+        self.disperse_ease = disperse_ease
+
+        targets = np.asarray(targets, dtype=np.float32).reshape(-1, 2)
+        if len(targets) == 0:
+            targets = np.array([[width / 2, height / 2]], dtype=np.float32)
+
+        self.target = targets[np.arange(count) % len(targets)]
+        self.start = rng.uniform((0, 0), (width, height), size=(count, 2)).astype(np.float32)
+
+        angle = rng.uniform(0, 2 * np.pi, count)
+        dist = rng.uniform(disperse_distance[0], disperse_distance[1], count)
+        self.scatter = self.target + np.stack([np.cos(angle), np.sin(angle)], axis=1).astype(np.float32) * dist[:, None]
+
+        self.pos = self.start.copy()
+        self._offsets = _disc_offsets(radius)
+
+    @property
+    def duration(self):
+        return self.formation + self.hold + self.disperse
+
+    def update(self, elapsed):
+        """Move every particle to its position at `elapsed` seconds"""
+        if elapsed < self.formation:
+            t = self.formation_ease(elapsed / self.formation)
+            self.pos = self.start + (self.target - self.start) * t
+        elif elapsed < self.formation + self.hold:
+            self.pos = self.target
+        else:
+            t = min(1.0, (elapsed - self.formation - self.hold) / self.disperse)
+            t = self.disperse_ease(t)
+            self.pos = self.target + (self.scatter - self.target) * t
+
+    def draw(self, surface, rotate=False):
+        """
+        Stamp every particle into surface
+        With rotate=True the surface is the landscape panel and portrait
+        centre (x, y) goes to (y, portrait_width - 1 - x), the same place a
+        90° counter-clockwise rotation of the portrait frame puts it (the
+        disc itself is the stamp's, not pygame.draw.circle's).
+        """
+        centers = np.rint(self.pos).astype(np.int32)
+        if rotate:
+            centers = np.stack([centers[:, 1], self.area[0] - 1 - centers[:, 0]], axis=1)
+
+        try:
+            pixels = pygame.surfarray.pixels2d(surface)
+        except (ValueError, pygame.error):
+            # Surfaces that can't be referenced as 2D arrays (e.g. 24-bit)
+            for x, y in centers:
+                pygame.draw.circle(surface, self.color, (int(x), int(y)), self.radius)
+            return
+
+        w, h = pixels.shape
+        pts = (centers[:, None, :] + self._offsets[None, :, :]).reshape(-1, 2)
+        xs, ys = pts[:, 0], pts[:, 1]
+        keep = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+        pixels[xs[keep], ys[keep]] = surface.map_rgb(self.color)
+        del pixels  # unlock the surface
@@ -9,6 +9,9 @@ from PIL import Image
 import io
 import os
 from datetime import datetime
+from templates import render_background
+from config import CONTENT_HEIGHT
+from models import LAYER_WIDTH, LAYER_HEIGHT
 
 
 class PDFExporter:
@@ -37,26 +40,44 @@ class PDFExporter:
         c.drawCentredString(width/2, height - 150, datetime.now().strftime('%B %d, %Y'))
         c.showPage()
         
-        # Export layers
-        for i, layer in enumerate(notebook.layers):
-            if layer.visible:
-                print(f"[PDF] Layer {i+1}/{len(notebook.layers)}")
-                self._add_layer(c, layer, width, height, i+1)
+        # One PDF page per notebook page, read into memory one at a time
+        for i, page in enumerate(notebook.pages):
+            print(f"[PDF] Page {i+1}/{len(notebook.pages)}")
+            keep = page is notebook.page or page.loaded
+            self._add_page(c, page, width, height, i+1)
+            if not keep:
+                page.unload()
         
         c.save()
         print(f"[PDF] ✓ Saved: {filepath}")
         return filepath
     
-    def _add_layer(self, c, layer, width, height, page_num):
-        """Add layer to PDF"""
-        # Convert surface to PIL
-        surf_w, surf_h = layer.surf.get_size()
-        raw_str = pygame.image.tostring(layer.surf, 'RGBA')
-        pil_img = Image.frombytes('RGBA', (surf_w, surf_h), raw_str)
-        
-        # White background
-        white_bg = Image.new('RGB', pil_img.size, 'white')
-        white_bg.paste(pil_img, mask=pil_img.split()[3])
+    def _page_area(self, layers):
+        """
+        Rows of the page to export: the first screen, down to the lowest ink
+        (the rest of the page is only the template repeating)
+        """
+        bottom = CONTENT_HEIGHT
+        for layer in layers:
+            if not layer.empty:
+                bottom = max(bottom, layer.bounds.bottom)
+        return pygame.Rect(0, 0, LAYER_WIDTH, min(bottom, LAYER_HEIGHT))
+    
+    def _add_page(self, c, page, width, height, page_num):
+        """Add a notebook page to the PDF"""
+        # Composite the visible layers' ink areas over the template background,
+        # for the used part of the page only
+        layers = page.visible_layers()
+        area = self._page_area(layers)
+        if layers and layers[0].opaque:
+            background = pygame.Surface(area.size)
+        else:
+            background = render_background(page.template_name, area.size)
+        surf_w, surf_h = background.get_size()
+        for layer in layers:
+            if not layer.empty:
+                layer.draw_onto(background, layer.bounds.topleft, layer.bounds)
+        white_bg = Image.frombytes('RGB', (surf_w, surf_h), pygame.image.tostring(background, 'RGB'))
         
         # Scale to fit
         scale = min((width - 100) / surf_w, (height - 150) / surf_h)
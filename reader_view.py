@@ -0,0 +1,130 @@
+"""
+Reader view for reflowable books (see book_reader)
+"""
+import pygame
+from config import *
+from improved_ui_components import draw_improved_status_bar
+from text_cache import render_text
+from book_reader import BookReader, PAGE_SIZE
+
+
+class ReaderView:
+    """
+    One page of a book at a time
+    Tapping the left third of the page goes back a page, anywhere else on
+    it goes forward. Font and size apply to every book opened after.
+    """
+
+    def __init__(self, fonts):
+        self.font_s, self.font_m, self.font_l = fonts
+        self.reader = None
+        self.font_index = READER_FONT_INDEX
+        self.size_index = READER_SIZE_INDEX
+
+        # UI elements
+        self.back_btn = None
+        self.font_btn = None
+        self.size_up_btn = None
+        self.size_down_btn = None
+        self.page_rect = pygame.Rect((40, 110), PAGE_SIZE)
+
+    def open(self, book):
+        """Show book at its reading position (lays out and renders one page)"""
+        self.close()
+        self.reader = BookReader(book, self.font_index, self.size_index)
+        print(f"[Reader] Opened {book.name} at page {self.reader.page + 1}")
+
+    def close(self):
+        """Remember the reading position and the page breaks found"""
+        if self.reader:
+            self.reader.save()
+            self.reader = None
+
+    def turn(self, delta):
+        if self.reader:
+            self.reader.turn(delta)
+
+    def change_font(self):
+        """Cycle to next font"""
+        self.font_index = (self.font_index + 1) % len(AVAILABLE_FONTS)
+        self.reader.set_layout(self.font_index, self.size_index)
+
+    def change_size(self, increase):
+        """Change font size"""
+        if increase and self.size_index < len(TEXT_SIZES) - 1:
+            self.size_index += 1
+        elif not increase and self.size_index > 0:
+            self.size_index -= 1
+        else:
+            return
+        self.reader.set_layout(self.font_index, self.size_index)
+
+    def prefetch(self):
+        """Background page work for this frame; True while there is more"""
+        return bool(self.reader) and self.reader.prefetch()
+
+    def draw(self, screen):
+        """Draw the reader view"""
+        screen.fill(COLOR_WHITE)
+        draw_improved_status_bar(screen, self.font_s)
+
+        # Toolbar
+        toolbar_height = 60
+        pygame.draw.rect(screen, COLOR_PAPER, (0, 25, 600, toolbar_height))
+
+        self.back_btn = pygame.Rect(10, 35, 70, 40)
+        pygame.draw.rect(screen, COLOR_UI_LIGHT, self.back_btn, border_radius=20)
+        back_text = render_text(self.font_s, "< Back", True, COLOR_BLACK)
+        screen.blit(back_text, (self.back_btn.centerx - back_text.get_width()//2,
+                                self.back_btn.centery - back_text.get_height()//2))
+
+        self.font_btn = pygame.Rect(90, 35, 110, 40)
+        pygame.draw.rect(screen, COLOR_UI_LIGHT, self.font_btn, border_radius=5)
+        font_name = AVAILABLE_FONTS[self.font_index][0].split()[0]
+        font_text = render_text(self.font_s, font_name, True, COLOR_BLACK)
+        screen.blit(font_text, (self.font_btn.centerx - font_text.get_width()//2,
+                                self.font_btn.centery - font_text.get_height()//2))
+
+        self.size_down_btn = pygame.Rect(210, 35, 40, 40)
+        self.size_up_btn = pygame.Rect(260, 35, 40, 40)
+        for btn, label in ((self.size_down_btn, "-"), (self.size_up_btn, "+")):
+            pygame.draw.rect(screen, COLOR_UI_LIGHT, btn, border_radius=5)
+            text = render_text(self.font_m, label, True, COLOR_BLACK)
+            screen.blit(text, (btn.centerx - text.get_width()//2, btn.centery - text.get_height()//2))
+        size_text = render_text(self.font_s, f"{TEXT_SIZES[self.size_index]}", True, COLOR_BLACK)
+        screen.blit(size_text, (310, 45))
+
+        if not self.reader:
+            return
+
+        # Page number (the count is known once the whole book is laid out)
+        count = self.reader.page_count
+        label = f"{self.reader.page + 1} / {count}" if count else f"Page {self.reader.page + 1}"
+        page_text = render_text(self.font_s, label, True, COLOR_UI_DARK)
+        screen.blit(page_text, (590 - page_text.get_width(), 45))
+
+        screen.blit(self.reader.current_surface(), self.page_rect)
+
+    def handle_click(self, pos):
+        """
+        Handle click events
+        Returns: (action, data) tuple
+        """
+        if self.back_btn and self.back_btn.collidepoint(pos):
+            return ('back', None)
+
+        if self.font_btn and self.font_btn.collidepoint(pos):
+            return ('change_font', None)
+
+        if self.size_up_btn and self.size_up_btn.collidepoint(pos):
+            return ('size_up', None)
+
+        if self.size_down_btn and self.size_down_btn.collidepoint(pos):
+            return ('size_down', None)
+
+        if pos[1] > 25 + 60:
+            if pos[0] < 200:
+                return ('prev_page', None)
+            return ('next_page', None)
+
+        return (None, None)
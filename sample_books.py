@@ -0,0 +1,289 @@
+"""
+Built-in sample books for ABook
+Pages are described declaratively. Study books are painted into their
+layer on first view (there is room to write on them); stories become
+reflowable books for the reader (see book_reader).
+"""
+from models import Layer, Page, Notebook
+from book_reader import Book
+from text_cache import get_font
+
+
+# Page styles: fonts are (name, size, bold)
+PAGE_STYLES = {
+    'study': {
+        'top': 50, 'line_spacing': 45, 'margin': 40, 'bottom': 100,
+        'body_font': ('Arial', 22, False), 'body_color': (0, 0, 0),
+        'title_font': ('Arial', 26, True), 'title_color': (0, 0, 0),
+        'center_titles': True,
+    },
+}
+
+
+def _study_title(line):
+    return line.isupper()
+
+
+def _story_title(line):
+    return line.isupper() or line.startswith("Chapter")
+
+
+def _adventure_title(line):
+    return line.startswith("Chapter") or line in ("THE DIGITAL ADVENTURE", "THE END", "Epilogue")
+
+
+# Atomic Habits study notebook with chapter structure
+ATOMIC_HABITS_PAGES = [
+    ["ATOMIC HABITS", "", "by James Clear", "", "", "", "A study notebook"],
+    ["", "INTRODUCTION", "", "The Surprising Power", "of Atomic Habits", "", "", "Notes:"],
+
+    # THE FUNDAMENTALS
+    ["", "PART I", "THE FUNDAMENTALS", "", "Why Tiny Changes", "Make a Big Difference"],
+    ["", "Chapter 1", "The Surprising Power", "of Atomic Habits", "", "", "Key Points:", ""],
+    ["", "Chapter 2", "How Your Habits", "Shape Your Identity", "(and Vice Versa)", "", "Key Points:", ""],
+    ["", "Chapter 3", "How to Build", "Better Habits", "in 4 Simple Steps", "", "Key Points:", ""],
+
+    # THE 1ST LAW: MAKE IT OBVIOUS
+    ["", "PART II", "THE 1ST LAW", "Make It Obvious", "", "", ""],
+    ["", "Chapter 4", "The Man Who Didn't", "Look Right", "", "Implementation", "Intentions", ""],
+    ["", "Chapter 5", "The Best Way to", "Start a New Habit", "", "Habit Stacking", "", ""],
+    ["", "Chapter 6", "Motivation Is", "Overrated;", "Environment Often", "Matters More", "", ""],
+    ["", "Chapter 7", "The Secret to", "Self-Control", "", "Make Bad Habits", "Invisible", ""],
+
+    # THE 2ND LAW: MAKE IT ATTRACTIVE
+    ["", "PART III", "THE 2ND LAW", "Make It Attractive", "", "", ""],
+    ["", "Chapter 8", "How to Make a", "Habit Irresistible", "", "Temptation", "Bundling", ""],
+    ["", "Chapter 9", "The Role of Family", "and Friends in", "Shaping Your Habits", "", "", ""],
+    ["", "Chapter 10", "How to Find and", "Fix the Causes", "of Your Bad Habits", "", "", ""],
+
+    # THE 3RD LAW: MAKE IT EASY
+    ["", "PART IV", "THE 3RD LAW", "Make It Easy", "", "", ""],
+    ["", "Chapter 11", "Walk Slowly, but", "Never Backward", "", "Two-Minute Rule", "", ""],
+    ["", "Chapter 12", "The Law of", "Least Effort", "", "Prime Your", "Environment", ""],
+    ["", "Chapter 13", "How to Stop", "Procrastinating by", "Using the", "Two-Minute Rule", "", ""],
+    ["", "Chapter 14", "How to Make Good", "Habits Inevitable", "and Bad Habits", "Impossible", "", ""],
+
+    # THE 4TH LAW: MAKE IT SATISFYING
+    ["", "PART V", "THE 4TH LAW", "Make It Satisfying", "", "", ""],
+    ["", "Chapter 15", "The Cardinal Rule", "of Behavior Change", "", "What Is Immediately", "Rewarded Is Repeated", ""],
+    ["", "Chapter 16", "How to Stick with", "Good Habits", "Every Day", "", "Habit Tracking", ""],
+    ["", "Chapter 17", "How an", "Accountability Partner", "Can Change", "Everything", "", ""],
+
+    # ADVANCED TACTICS
+    ["", "PART VI", "ADVANCED TACTICS", "", "How to Go from", "Being Merely Good", "to Being Truly Great"],
+    ["", "Chapter 18", "The Truth About", "Talent", "(When Genes Matter", "and When They Don't)", "", ""],
+    ["", "Chapter 19", "The Goldilocks Rule:", "How to Stay", "Motivated in Life", "and Work", "", ""],
+    ["", "Chapter 20", "The Downside of", "Creating Good Habits", "", "Keep Your Identity", "Small", ""],
+
+    # CONCLUSION
+    ["", "CONCLUSION", "", "The Secret to", "Results That Last", "", "", ""],
+
+    # Personal Notes Pages
+    ["", "MY HABITS", "TO BUILD", "", "", "", "", ""],
+    ["", "MY HABITS", "TO BREAK", "", "", "", "", ""],
+    ["", "HABIT TRACKER", "", "Month: _______", "", "", "", ""],
+    ["", "IDENTITY", "STATEMENT", "", "I am someone who...", "", "", ""],
+    ["", "KEY TAKEAWAYS", "", "", "", "", "", ""],
+    ["", "ACTION PLAN", "", "", "", "", "", ""],
+    ["", "PROGRESS NOTES", "", "", "", "", "", ""],
+    ["", "REFLECTIONS", "", "", "", "", "", ""],
+]
+
+# Short story for reading and highlighting - one string per page
+LITTLE_STAR_PAGES = [
+    # Title page
+    "THE LITTLE STAR\n\n\nA Tale of Dreams\nand Discovery",
+
+    # Chapter 1
+    "CHAPTER 1\nThe Lonely Sky\n\nHigh above the Earth, in the vast\nexpanse of space, there lived a little\nstar named Stella.\n\nUnlike the other stars who shone\nbrightly and confidently, Stella felt\nsmall and insignificant.",
+
+    "Every night, she watched the Moon\nglow softly, admired by everyone below.\n\nShe saw planets with their rings and\nmoons, celebrated for their beauty.\n\n\"What am I here for?\" Stella wondered,\nher light flickering softly. \"I'm just one\ntiny star among billions.\"",
+
+    # Chapter 2
+    "CHAPTER 2\nThe Wish\n\nOne clear night, a child named Luna sat\nby her window, gazing at the sky.\n\nShe had moved to a new city and felt\nlonely, far from her old friends.\n\n\"I wish I had someone to talk to,\"\nLuna whispered to the darkness.",
+
+    "Stella heard the wish. It traveled\nthrough space like a gentle melody,\nreaching her heart.\n\nFor the first time in her long existence,\nsomeone had noticed her light.\n\n\"Maybe I can be her friend,\" thought\nStella. She began to shine a little\nbrighter, sending her light toward Luna.",
+
+    "Luna noticed a star that seemed to\ntwinkle just for her.\n\nIt wasn't the brightest star, but there\nwas something special about it.\nSomething warm.\n\n\"Hello, little star,\" Luna said softly.\n\"Are you saying hello back?\"",
+
+    # Chapter 3
+    "CHAPTER 3\nThe Connection\n\nNight after night, Luna returned to her\nwindow. She would tell Stella about her\nday, her worries, her dreams.\n\nAnd Stella would listen, her light\nsteady and true.",
+
+    "Stella realized something wonderful:\nshe didn't need to be the biggest or\nbrightest.\n\nShe just needed to be there, constant\nand caring.\n\nHer purpose wasn't to outshine others,\nbut to provide comfort to one lonely girl.",
+
+    "\"You're my favorite star,\" Luna told her\none night. \"Not because you're the\nbrightest, but because you're mine.\"\n\nStella glowed with happiness.\n\nShe understood now that every star, no\nmatter how small, can light up someone's\ndarkness.",
+
+    # Chapter 4
+    "CHAPTER 4\nNew Friends\n\nAs weeks passed, Luna made friends at\nher new school.\n\nShe was less lonely now, but she never\nforgot to check on Stella each night.\n\n\"I have friends now,\" Luna told the star.\n\"But you're still special to me.\"",
+
+    "Stella noticed something else too.\nOther children had started looking at\nthe sky, following Luna's gaze.\n\nSoon, many people were looking up,\nfinding their own stars, making their\nown wishes.\n\nStella had inspired others simply by\nbeing herself.",
+
+    # Chapter 5  
+    "CHAPTER 5\nThe Truth\n\nYears passed. Luna grew up, but she\nnever stopped looking for her special\nstar.\n\nEven when life got busy, even when\nclouds covered the sky, she knew\nStella was there.",
+
+    "On Luna's eighteenth birthday, she sat\nby the same window, now with her own\ndaughter.\n\n\"See that star?\" Luna pointed. \"That's\nmy friend Stella. She taught me that\nI'm never alone.\"\n\nThe little girl's eyes widened.",
+
+    "\"Just look up and find one that speaks\nto your heart,\" Luna smiled.\n\nStella watched the scene, her light\nwarm with contentment.\n\nShe had found her purpose: to remind\nothers that they matter, that they're\nseen, that they're loved.",
+
+    # Epilogue
+    "EPILOGUE\n\n\nEvery star has a story.\n\nEvery heart has a light.\n\nAnd somewhere in the universe,\nthey find each other.\n\n\nTHE END",
+]
+
+# 50-page sample storybook
+DIGITAL_ADVENTURE_PAGES = [
+    # Page 1-5: Introduction
+    ["THE DIGITAL ADVENTURE", "", "By ABook", "", "", "A tale of technology", "and creativity"],
+    ["Chapter 1", "The Beginning", "", "Once upon a time,", "in a small town,", "there lived a student", "named Alex."],
+    ["Alex loved to take", "notes and draw,", "but traditional notebooks", "were getting expensive.", "", "One day, Alex discovered", "ABook!"],
+    ["It was perfect!", "Alex could write, draw,", "and organize everything", "in one place.", "", "This was the beginning", "of an amazing journey."],
+    ["Chapter 2", "Discovery", "", "Alex explored every", "feature.", "", "The pen tool felt natural,", "like real paper."],
+
+    # Page 6-10
+    ["Templates were amazing!", "Grid paper for math,", "lined paper for essays,", "blank pages for art.", "", "Each template made", "work easier."],
+    ["The layer system was", "brilliant.", "", "Alex could separate", "notes from diagrams,", "text from drawings.", "", "Very organized!"],
+    ["Chapter 3", "Creating", "", "Alex started creating", "more and more.", "", "Book reports,", "study guides,", "and sketches."],
+    ["The OCR feature was", "magical!", "", "Handwritten notes became", "searchable text", "instantly.", "", "No more retyping!"],
+    ["Templates helped Alex", "work faster.", "", "Math on graph paper,", "essays on lined paper,", "sketches on blank.", "", "Perfect every time."],
+
+    # Continue with more readable pages
+    ["Chapter 4", "Sharing", "", "Alex wanted to share", "work with classmates.", "", "The PDF export was", "perfect for this."],
+    ["Teachers were impressed.", "Clean, organized", "submissions.", "", "Easy to read", "and grade.", "", "Classmates asked", "for tips!"],
+    ["The database feature", "was genius.", "", "Automatic backups meant", "never losing work.", "", "Everything saved", "safely."],
+    ["Chapter 5", "Organization", "", "Alex organized notebooks", "into folders.", "", "Notes for daily work,", "Books for projects."],
+    ["Each notebook could", "have multiple layers.", "", "Rough drafts on one,", "final work on another.", "", "Perfect separation!"],
+
+    # More pages
+    ["The word search helped", "with vocabulary.", "", "Look up any word,", "see definitions and", "synonyms instantly.", "", "Learning was easier."],
+    ["Chapter 6", "Creativity", "", "Alex started drawing", "more.", "", "Sketches, diagrams,", "and comics."],
+    ["Different pen sizes", "for different effects.", "", "Thin lines for details,", "thick lines for bold.", "", "Every drawing looked", "great!"],
+    ["Colors stayed clean.", "Black ink on white,", "just like a real", "notebook.", "", "Simple, professional,", "beautiful."],
+    ["Templates inspired", "creativity.", "", "Graph paper for", "geometric art,", "blank pages for", "freeform drawing."],
+
+    # Pages 21-30
+    ["Chapter 7", "Advanced Features", "", "Alex discovered more.", "", "Layer merging,", "reordering,", "visibility controls."],
+    ["Moving layers changed", "the composition.", "", "Hide and show parts,", "perfect for", "presentations.", "", "So much control!"],
+    ["The search feature", "found anything", "instantly.", "", "Notes from months ago,", "specific topics.", "", "Everything findable."],
+    ["Chapter 8", "Productivity", "", "Alex became more", "productive.", "", "Work finished faster,", "quality improved."],
+    ["No more lost papers.", "No more messy erasures.", "No more running out", "of pages.", "", "Everything digital,", "everything perfect."],
+    ["Homework took less", "time.", "", "Notes were clearer.", "Studies were more", "effective.", "", "Grades improved!"],
+    ["Teachers noticed", "the change.", "", "Better organization,", "clearer submissions,", "more creativity.", "", "Alex was thriving."],
+    ["Chapter 9", "Helping Others", "", "Alex taught friends", "to use ABook.", "", "Showed them all", "the features."],
+    ["Study groups became", "better.", "", "Everyone had", "organized notes.", "Sharing was easier.", "", "Teams improved."],
+    ["The whole class", "improved.", "", "Better grades,", "better organization,", "better creativity.", "", "ABook helped everyone."],
+
+    # Pages 31-40
+    ["Chapter 10", "Achievement", "", "At the end of the year,", "Alex looked back.", "", "Hundreds of pages,", "dozens of projects."],
+    ["All in one place.", "All organized.", "All accessible.", "", "This was the power", "of digital notebooks.", "", "Truly amazing!"],
+    ["The science fair", "project was entirely", "in ABook.", "", "Research, diagrams,", "calculations,", "sketches."],
+    ["Alex won first place!", "", "The judges were", "impressed by the", "organization.", "", "ABook made it", "possible."],
+    ["Chapter 11", "The Future", "", "Alex planned to use", "ABook forever.", "", "High school, college,", "career."],
+    ["New features were", "coming.", "", "Cloud sync,", "collaboration tools,", "more templates.", "", "The future was bright."],
+    ["Mobile apps would", "arrive.", "", "Take notes anywhere,", "on phone or tablet.", "", "Perfect for", "on-the-go!"],
+    ["Alex dreamed of", "becoming a developer.", "", "Creating tools", "like ABook,", "helping others learn.", "", "Technology for good."],
+    ["Chapter 12", "Reflection", "", "What made ABook", "special?", "", "The freedom it gave", "to create and learn."],
+    ["Digital didn't mean", "impersonal.", "", "It meant powerful,", "flexible, accessible.", "", "Best of both worlds."],
+
+    # Pages 41-50
+    ["Alex wrote in ABook", "daily.", "", "Thoughts, ideas,", "dreams.", "", "Everything preserved,", "organized."],
+    ["Friends and family", "saw the transformation.", "", "More organized,", "more creative,", "more successful.", "", "Thanks to ABook."],
+    ["Chapter 13", "Gratitude", "", "Alex was grateful", "for discovering ABook.", "", "It changed", "everything."],
+    ["Every notebook told", "a story.", "", "Math problems solved,", "essays written,", "art created.", "", "All preserved forever."],
+    ["The journey continued.", "", "New notebooks,", "new layers,", "new pages every day.", "", "Always growing,", "always learning."],
+    ["Chapter 14", "Inspiration", "", "Alex inspired others.", "", "Teachers, students,", "artists.", "", "Everyone could benefit."],
+    ["ABook became", "essential.", "", "Not just for school,", "but for life.", "", "Planning, creating,", "organizing, dreaming."],
+    ["The Digital Adventure", "continued every day.", "", "New challenges,", "new projects,", "new achievements.", "", "All in ABook."],
+    ["Epilogue", "", "And so the story", "continues.", "", "With ABook,", "anything is possible.", "", "Your adventure awaits!"],
+    ["THE END", "", "", "Thank you for reading!", "", "", "Start your own", "Digital Adventure", "today!", "", "- ABook Team"]
+]
+
+SAMPLE_BOOKS = [
+    {'name': "Atomic Habits", 'style': 'study', 'title': _study_title, 'pages': ATOMIC_HABITS_PAGES},
+    {'name': "The Little Star", 'style': 'reflow', 'title': _story_title, 'pages': LITTLE_STAR_PAGES},
+    {'name': "The Digital Adventure", 'style': 'reflow', 'title': _adventure_title, 'pages': DIGITAL_ADVENTURE_PAGES},
+]
+
+
+def paint_page(surf, lines, style, is_title=None, page_num=None):
+    """Render one page of text onto a layer surface"""
+    surf.fill((255, 255, 255))
+
+    body_font = get_font(*style['body_font'])
+    title_font = get_font(*style['title_font']) if 'title_font' in style else body_font
+
+    # Page text is only ever drawn once, so it bypasses the shared text cache
+    if page_num is not None and style.get('page_numbers'):
+        page_text = get_font('Arial', 14).render(f"Page {page_num}", True, (150, 150, 150))
+        surf.blit(page_text, (surf.get_width() - 100, 25))
+
+    y = style['top']
+    limit = surf.get_height() - style['bottom']
+    for line in lines:
+        if line.strip():
+            if is_title and is_title(line):
+                text_surf = title_font.render(line, True, style['title_color'])
+                if style.get('center_titles'):
+                    x = (surf.get_width() - text_surf.get_width()) // 2
+                else:
+                    x = style['margin']
+            else:
+                text_surf = body_font.render(line, True, style['body_color'])
+                x = style['margin']
+            surf.blit(text_surf, (x, y))
+
+        y += style['line_spacing']
+        if y > limit:
+            break
+
+
+def _page_painter(lines, style, is_title, page_num):
+    def paint(surf):
+        paint_page(surf, lines, style, is_title, page_num)
+    return paint
+
+
+def book_markdown(spec):
+    """
+    A book's pages as markdown: title lines become headings (with the
+    line right after them, e.g. the chapter name), the other lines are
+    joined into paragraphs
+    """
+    blocks = []
+    for page in spec['pages']:
+        lines = page.split('\n') if isinstance(page, str) else page
+        paragraph, heading = [], None
+        for line in [line.strip() for line in lines] + ['']:
+            if heading is not None:
+                blocks.append(f"# {heading}: {line}" if line else f"# {heading}")
+                heading = None
+                if line:
+                    continue
+            if line and spec['title'](line):
+                if paragraph:
+                    blocks.append(' '.join(paragraph))
+                paragraph, heading = [], line
+            elif line:
+                paragraph.append(line)
+            elif paragraph:
+                blocks.append(' '.join(paragraph))
+                paragraph = []
+    return '\n\n'.join(blocks) + '\n'
+
+
+def build_sample_book(spec, folder='books'):
+    """Create a notebook whose pages are painted lazily on first access"""
+    style = PAGE_STYLES[spec['style']]
+    pages = []
+    for page_num, page in enumerate(spec['pages'], 1):
+        lines = page.split('\n') if isinstance(page, str) else page
+        layer = Layer("Blank", painter=_page_painter(lines, style, spec['title'], page_num))
+        pages.append(Page([layer]))
+    return Notebook(spec['name'], folder, pages)
+
+
+def create_sample_books():
+    """Create all built-in sample books (no page is rendered yet)"""
+    books = [Book(spec['name'], book_markdown(spec), markdown=True) if spec['style'] == 'reflow'
+             else build_sample_book(spec) for spec in SAMPLE_BOOKS]
+    pages = sum(len(b.pages) for b in books if isinstance(b, Notebook))
+    print(f"[Setup] Registered {len(books)} sample books ({pages} painted pages)")
+    return books
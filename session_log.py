@@ -0,0 +1,331 @@
+"""
+Input session recording and replay for ABook
+Records the pygame event stream (portrait-space positions, frame times and
+view changes) into a compact binary log, and feeds it back frame by frame,
+either in real time or as fast as possible.
+
+Log format (little-endian): b'ABSL', version byte, then records, each a
+kind byte followed by its fields:
+
+    FRAME   uint32 ms since start        - starts the events of one frame
+    DOWN/UP int16 x, int16 y, uint8 button
+    MOTION  int16 x, int16 y, uint8 buttons bitmask
+    WHEEL   int8 x, int8 y
+    KEYDOWN int32 key, uint16 mod, uint8 len + UTF-8 text
+    KEYUP   int32 key, uint16 mod
+    VIEW    uint8 len + UTF-8 view name  - app state after the frame
+    QUIT
+"""
+import struct
+import time
+import pygame
+
+
+MAGIC = b'ABSL'
+VERSION = 1
+
+FRAME, DOWN, UP, MOTION, WHEEL, KEYDOWN, KEYUP, VIEW, QUIT = range(9)
+
+_FIELDS = {
+    FRAME: struct.Struct('<I'),
+    DOWN: struct.Struct('<hhB'),
+    UP: struct.Struct('<hhB'),
+    MOTION: struct.Struct('<hhB'),
+    WHEEL: struct.Struct('<bb'),
+    KEYDOWN: struct.Struct('<iH'),
+    KEYUP: struct.Struct('<iH'),
+    VIEW: None,
+    QUIT: None,
+}
+_TEXT_KINDS = (KEYDOWN, VIEW)
+
+_EVENT_KINDS = {
+    pygame.MOUSEBUTTONDOWN: DOWN,
+    pygame.MOUSEBUTTONUP: UP,
+    pygame.MOUSEMOTION: MOTION,
+    pygame.MOUSEWHEEL: WHEEL,
+    pygame.KEYDOWN: KEYDOWN,
+    pygame.KEYUP: KEYUP,
+    pygame.QUIT: QUIT,
+}
+
+
+def _clamp(v, lo, hi):
+    return max(lo, min(hi, int(v)))
+
+
+def _identity(pos):
+    return pos
+
+
+class SessionRecorder:
+    """
+    Writes the events of each frame to a session log
+    to_portrait: maps window positions to portrait UI positions
+    """
+
+    def __init__(self, path, to_portrait=None):
+        self.path = path
+        self.to_portrait = to_portrait or _identity
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC + bytes([VERSION]))
+        self.start = None
+        self.last_view = None
+        self.frames = 0
+        self.events = 0
+
+    def _write(self, kind, *fields, text=None):
+        fmt = _FIELDS[kind]
+        self.file.write(bytes([kind]))
+        if fmt:
+            self.file.write(fmt.pack(*fields))
+        if kind in _TEXT_KINDS:
+            data = (text or '').encode('utf-8')[:255]
+            self.file.write(bytes([len(data)]) + data)
+
+    def frame(self, events):
+        """
+        Record the events handled in one frame (frames without input are skipped)
+        Each recorded event gets the recorded frame time as `session_time`,
+        so the live run sees exactly the times a replay will.
+        """
+        if self.file is None:
+            return
+        now = time.perf_counter()
+        if self.start is None:
+            self.start = now
+        events = [e for e in events if e.type in _EVENT_KINDS]
+        if not events:
+            return
+
+        t_ms = _clamp((now - self.start) * 1000, 0, 0xFFFFFFFF)
+        self._write(FRAME, t_ms)
+        self.frames += 1
+        for e in events:
+            e.session_time = t_ms / 1000
+            kind = _EVENT_KINDS[e.type]
+            if kind in (DOWN, UP):
+                x, y = self.to_portrait(e.pos)
+                self._write(kind, _clamp(x, -32768, 32767), _clamp(y, -32768, 32767), e.button & 0xFF)
+            elif kind == MOTION:
+                x, y = self.to_portrait(e.pos)
+                mask = sum(1 << i for i, pressed in enumerate(e.buttons) if pressed)
+                self._write(kind, _clamp(x, -32768, 32767), _clamp(y, -32768, 32767), mask)
+            elif kind == WHEEL:
+                self._write(kind, _clamp(e.x, -128, 127), _clamp(e.y, -128, 127))
+            elif kind == KEYDOWN:
+                self._write(kind, e.key, e.mod & 0xFFFF, text=getattr(e, 'unicode', ''))
+            elif kind == KEYUP:
+                self._write(kind, e.key, e.mod & 0xFFFF)
+            else:  # QUIT
+                self._write(kind)
+            self.events += 1
+
+        if any(e.type == pygame.QUIT for e in events):
+            self.close()
+
+    def view(self, name):
+        """Record the app state (view) at the end of a frame, when it changes"""
+        if self.file is None or name == self.last_view:
+            return
+        self.last_view = name
+        self._write(VIEW, text=name)
+
+    def close(self):
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        print(f"[Session] Recorded {self.frames} frames, {self.events} events to {self.path}")
+
+
+def read_session(path):
+    """All records of a session log as (kind, fields, text) tuples"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not an ABook session log")
+    if data[4] != VERSION:
+        raise ValueError(f"{path}: unsupported session log version {data[4]}")
+
+    records = []
+    i = 5
+    while i < len(data):
+        kind = data[i]
+        i += 1
+        fmt = _FIELDS[kind]
+        fields = ()
+        if fmt:
+            fields = fmt.unpack_from(data, i)
+            i += fmt.size
+        text = None
+        if kind in _TEXT_KINDS:
+            n = data[i]
+            text = data[i + 1:i + 1 + n].decode('utf-8')
+            i += 1 + n
+        records.append((kind, fields, text))
+    return records
+
+
+class SessionReplayer:
+    """
+    Feeds a recorded session back one frame of events at a time
+    realtime: wait until each frame is due (as recorded); otherwise replay
+    as fast as the app can handle it.
+    to_window: maps portrait positions back to window positions.
+    Events carry the recorded frame time (seconds) as `session_time`, so
+    time-based input handling does not depend on replay speed.
+    """
+
+    def __init__(self, path, to_window=None, realtime=True):
+        self.path = path
+        self.to_window = to_window or _identity
+        self.realtime = realtime
+        self.frames = self._group(read_session(path))
+        self.index = 0
+        self.start = None
+        self.expected_view = None
+        self.divergences = 0
+
+    def _group(self, records):
+        """[(t_ms, [records], view after the frame)]; leading VIEW records set the first view"""
+        frames = []
+        view = None
+        for kind, fields, text in records:
+            if kind == FRAME:
+                frames.append([fields[0], [], view])
+            elif kind == VIEW:
+                view = text
+                if frames:
+                    frames[-1][2] = view
+            elif frames:
+                frames[-1][1].append((kind, fields, text))
+        return frames
+
+    def _event(self, kind, fields, text, t):
+        if kind in (DOWN, UP):
+            x, y, button = fields
+            etype = pygame.MOUSEBUTTONDOWN if kind == DOWN else pygame.MOUSEBUTTONUP
+            return pygame.event.Event(etype, pos=self.to_window((x, y)), button=button, session_time=t)
+        if kind == MOTION:
+            x, y, mask = fields
+            buttons = tuple(bool(mask & (1 << i)) for i in range(3))
+            return pygame.event.Event(pygame.MOUSEMOTION, pos=self.to_window((x, y)), rel=(0, 0),
+                                      buttons=buttons, session_time=t)
+        if kind == WHEEL:
+            return pygame.event.Event(pygame.MOUSEWHEEL, x=fields[0], y=fields[1], flipped=False, session_time=t)
+        if kind == KEYDOWN:
+            return pygame.event.Event(pygame.KEYDOWN, key=fields[0], mod=fields[1], unicode=text,
+                                      scancode=0, session_time=t)
+        if kind == KEYUP:
+            return pygame.event.Event(pygame.KEYUP, key=fields[0], mod=fields[1], unicode='',
+                                      scancode=0, session_time=t)
+        return pygame.event.Event(pygame.QUIT, session_time=t)
+
+    @property
+    def done(self):
+        return self.index >= len(self.frames)
+
+    def next_frame(self):
+        """Events of the next recorded frame, or None when the session is over"""
+        if self.done:
+            return None
+        t_ms, records, view = self.frames[self.index]
+        self.index += 1
+
+        now = time.perf_counter()
+        if self.start is None:
+            self.start = now - t_ms / 1000
+        if self.realtime:
+            delay = self.start + t_ms / 1000 - now
+            if delay > 0:
+                time.sleep(delay)
+
+        self.expected_view = view
+        t = t_ms / 1000
+        return [self._event(kind, fields, text, t) for kind, fields, text in records]
+
+    def check_view(self, name):
+        """Compare the app state after a replayed frame with the recording"""
+        if self.expected_view is None or name == self.expected_view:
+            return True
+        self.divergences += 1
+        if self.divergences <= 5:
+            t_ms = self.frames[self.index - 1][0]
+            print(f"[Replay] Diverged at {t_ms / 1000:.3f}s: expected view "
+                  f"'{self.expected_view}', got '{name}'")
+        self.expected_view = None  # report each divergence once
+        return False
+
+    def report(self):
+        print(f"[Replay] {self.index}/{len(self.frames)} frames replayed from {self.path}, "
+              f"{self.divergences} view divergences")
+
+
+class EventSource:
+    """
+    Where an app loop gets its events: live input, optionally recorded,
+    or a replayed session
+    """
+
+    def __init__(self, recorder=None, replayer=None):
+        self.recorder = recorder
+        self.replayer = replayer
+
+    def get(self, live=None):
+        """
+        Events for the next frame
+        live: function returning live events (default pygame.event.get)
+        A finished replay ends with a QUIT event.
+        """
+        if self.replayer:
+            pygame.event.pump()  # keep the window responsive
+            events = self.replayer.next_frame()
+            if events is None:
+                self.replayer.report()
+                events = [pygame.event.Event(pygame.QUIT)]
+        else:
+            events = live() if live else pygame.event.get()
+        if self.recorder:
+            self.recorder.frame(events)
+        return events
+
+    def view(self, name):
+        """Report the current view at the end of a frame"""
+        if self.recorder:
+            self.recorder.view(name)
+        if self.replayer:
+            self.replayer.check_view(name)
+
+
+# Global event source
+_event_source = None
+
+
+def get_event_source():
+    """Get the global event source (live input unless configured)"""
+    global _event_source
+    if _event_source is None:
+        _event_source = EventSource()
+    return _event_source
+
+
+def tick(clock, fps):
+    """
+    Frame rate limit for a loop reading the global event source; a replay
+    is paced by the replayer instead (not at all when fast)
+    """
+    if get_event_source().replayer is None:
+        clock.tick(fps)
+
+
+def configure_session(record=None, replay=None, fast=False, to_portrait=None, to_window=None):
+    """Set up the global event source to record to and/or replay from a session log"""
+    global _event_source
+    recorder = SessionRecorder(record, to_portrait) if record else None
+    replayer = SessionReplayer(replay, to_window, realtime=not fast) if replay else None
+    if replayer:
+        print(f"[Replay] {len(replayer.frames)} frames from {replay} "
+              f"({'fast' if fast else 'real time'})")
+    _event_source = EventSource(recorder, replayer)
+    return _event_source
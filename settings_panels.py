@@ -6,6 +6,7 @@ All grayscale theme
 
 import pygame
 from config import *
+from text_cache import render_text
 import datetime
 
 
@@ -38,7 +39,7 @@ class SettingsPanel:
                         (x, y + 50), (x + width, y + 50), 2)
         
         # Title text
-        title_text = self.font_l.render(title, True, COLOR_BLACK)
+        title_text = render_text(self.font_l, title, True, COLOR_BLACK)
         screen.blit(title_text, (x + 15, y + 12))
         
         # Close button (X)
@@ -76,7 +77,7 @@ class WiFiPanel(SettingsPanel):
         
         # WiFi toggle
         toggle_y = content_y
-        toggle_label = self.font_m.render("WiFi", True, COLOR_BLACK)
+        toggle_label = render_text(self.font_m, "WiFi", True, COLOR_BLACK)
         screen.blit(toggle_label, (x + 20, toggle_y))
         
         # Toggle switch (grayscale)
@@ -95,7 +96,7 @@ class WiFiPanel(SettingsPanel):
         # Available networks (if enabled)
         if self.wifi_enabled:
             networks_y = content_y + 60
-            networks_label = self.font_m.render("Available Networks", True, COLOR_BLACK)
+            networks_label = render_text(self.font_m, "Available Networks", True, COLOR_BLACK)
             screen.blit(networks_label, (x + 20, networks_y))
             
             self.network_btns = []
@@ -114,7 +115,7 @@ class WiFiPanel(SettingsPanel):
                     pygame.draw.rect(screen, (180, 180, 180), btn, 1, border_radius=8)
                 
                 # Network name
-                name_text = self.font_m.render(network['name'], True, COLOR_BLACK)
+                name_text = render_text(self.font_m, network['name'], True, COLOR_BLACK)
                 screen.blit(name_text, (btn.x + 45, btn.y + 10))
                 
                 # Signal strength bars (grayscale)
@@ -137,14 +138,14 @@ class WiFiPanel(SettingsPanel):
                 
                 # Connected indicator
                 if network['connected']:
-                    conn_text = self.font_s.render("Connected", True, (80, 80, 80))
+                    conn_text = render_text(self.font_s, "Connected", True, (80, 80, 80))
                     screen.blit(conn_text, (btn.x + 45, btn.y + 30))
                 
                 self.network_btns.append((btn, network))
                 btn_y += 60
         else:
             # WiFi disabled message
-            disabled_text = self.font_m.render("WiFi is disabled", True, (150, 150, 150))
+            disabled_text = render_text(self.font_m, "WiFi is disabled", True, (150, 150, 150))
             screen.blit(disabled_text, (x + 20, content_y + 60))
     
     def handle_click(self, pos):
@@ -208,19 +209,19 @@ class BatteryPanel(SettingsPanel):
         pygame.draw.rect(screen, fill_color, fill_rect, border_radius=3)
         
         # Percentage text
-        percent_text = self.font_l.render(f"{self.battery_level}%", True, COLOR_BLACK)
+        percent_text = render_text(self.font_l, f"{self.battery_level}%", True, COLOR_BLACK)
         screen.blit(percent_text, (battery_x + 25, battery_y + 70))
         
         # Charging status
         if self.charging:
-            status_text = self.font_m.render("Charging", True, (80, 80, 80))
+            status_text = render_text(self.font_m, "Charging", True, (80, 80, 80))
         else:
-            status_text = self.font_m.render("Not Charging", True, (150, 150, 150))
+            status_text = render_text(self.font_m, "Not Charging", True, (150, 150, 150))
         screen.blit(status_text, (battery_x - 10, battery_y + 105))
         
         # Power save mode toggle
         toggle_y = content_y + 170
-        label = self.font_m.render("Power Save Mode", True, COLOR_BLACK)
+        label = render_text(self.font_m, "Power Save Mode", True, COLOR_BLACK)
         screen.blit(label, (x + 20, toggle_y))
         
         # Toggle switch
@@ -243,7 +244,7 @@ class BatteryPanel(SettingsPanel):
         ]
         
         for i, text in enumerate(info_texts):
-            info = self.font_s.render(text, True, (100, 100, 100))
+            info = render_text(self.font_s, text, True, (100, 100, 100))
             screen.blit(info, (x + 20, info_y + i * 25))
     
     def handle_click(self, pos):
@@ -279,19 +280,19 @@ class TimePanel(SettingsPanel):
         else:
             time_str = now.strftime("%I:%M:%S %p")
         
-        time_text = self.font_l.render(time_str, True, COLOR_BLACK)
+        time_text = render_text(self.font_l, time_str, True, COLOR_BLACK)
         time_x = x + (400 - time_text.get_width()) // 2
         screen.blit(time_text, (time_x, content_y))
         
         # Current date
         date_str = now.strftime("%A, %B %d, %Y")
-        date_text = self.font_m.render(date_str, True, (100, 100, 100))
+        date_text = render_text(self.font_m, date_str, True, (100, 100, 100))
         date_x = x + (400 - date_text.get_width()) // 2
         screen.blit(date_text, (date_x, content_y + 45))
         
         # Time format toggle
         toggle_y = content_y + 110
-        label = self.font_m.render("24-Hour Format", True, COLOR_BLACK)
+        label = render_text(self.font_m, "24-Hour Format", True, COLOR_BLACK)
         screen.blit(label, (x + 20, toggle_y))
         
         # Toggle switch
@@ -307,23 +308,23 @@ class TimePanel(SettingsPanel):
         
         # Timezone info
         info_y = toggle_y + 60
-        timezone_label = self.font_m.render("Timezone", True, COLOR_BLACK)
+        timezone_label = render_text(self.font_m, "Timezone", True, COLOR_BLACK)
         screen.blit(timezone_label, (x + 20, info_y))
         
-        timezone_value = self.font_m.render("Asia/Kolkata (IST)", True, (100, 100, 100))
+        timezone_value = render_text(self.font_m, "Asia/Kolkata (IST)", True, (100, 100, 100))
         screen.blit(timezone_value, (x + 20, info_y + 30))
         
         # Auto sync
         sync_y = info_y + 80
-        sync_label = self.font_s.render("Automatically sync time from internet", True, (100, 100, 100))
+        sync_label = render_text(self.font_s, "Automatically sync time from internet", True, (100, 100, 100))
         screen.blit(sync_label, (x + 20, sync_y))
         
         # Alarm info (placeholder)
         alarm_y = sync_y + 50
-        alarm_text = self.font_m.render("Alarms & Reminders", True, COLOR_BLACK)
+        alarm_text = render_text(self.font_m, "Alarms & Reminders", True, COLOR_BLACK)
         screen.blit(alarm_text, (x + 20, alarm_y))
         
-        no_alarms = self.font_s.render("No alarms set", True, (150, 150, 150))
+        no_alarms = render_text(self.font_s, "No alarms set", True, (150, 150, 150))
         screen.blit(no_alarms, (x + 20, alarm_y + 30))
     
     def handle_click(self, pos):
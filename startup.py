@@ -0,0 +1,137 @@
+"""
+Startup support for ABook
+Lazy module proxies, deferred initialization steps and a per-phase timing report
+"""
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Records how long each startup phase takes"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []  # (name, seconds)
+        self.marks = {}   # name -> seconds since start
+
+    @contextmanager
+    def phase(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - t))
+
+    def mark(self, name):
+        """Record a point in time (e.g. first lock screen frame)"""
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.start
+
+    def report(self):
+        """Print the timing report"""
+        print("[Startup] Phase timings:")
+        for name, seconds in self.phases:
+            print(f"[Startup]   {name:<28} {seconds * 1000:8.1f} ms")
+        for name, seconds in self.marks.items():
+            print(f"[Startup] {name}: {seconds * 1000:.0f} ms after start")
+
+
+# Shared profiler, created when this module is first imported
+_profiler = StartupProfiler()
+
+def get_startup_profiler():
+    return _profiler
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access
+    Use it for heavy modules that are only needed on some code paths.
+    An ImportError is raised at the point of use, not at startup.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            with _profiler.phase(f"import {self._name}"):
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name):
+    """Return a proxy for module `name` that imports it on first use"""
+    return LazyModule(name)
+
+
+class DeferredInit:
+    """
+    Initialization steps that run while the boot animation plays
+    Steps marked thread_safe (no pygame/SDL calls) run on a worker thread;
+    the rest run on the main thread in whatever time each frame leaves over.
+    """
+
+    def __init__(self, profiler=None):
+        self.profiler = profiler or _profiler
+        self._pending = []
+        self._background = []
+        self._thread = None
+
+    def add(self, name, func, thread_safe=False):
+        if thread_safe:
+            self._background.append((name, func))
+        else:
+            self._pending.append((name, func))
+
+    def _run_step(self, name, func):
+        try:
+            with self.profiler.phase(name):
+                func()
+        except Exception as e:
+            print(f"[Startup] Step '{name}' failed: {e}")
+
+    def start_background(self):
+        """Start the worker thread for thread-safe steps"""
+        if self._thread is not None or not self._background:
+            return
+
+        def worker():
+            while self._background:
+                self._run_step(*self._background.pop(0))
+
+        self._thread = threading.Thread(target=worker, name="abook-startup", daemon=True)
+        self._thread.start()
+
+    def run_for(self, budget):
+        """Run main-thread steps until `budget` seconds have been used"""
+        deadline = time.perf_counter() + budget
+        while self._pending and time.perf_counter() < deadline:
+            self._run_step(*self._pending.pop(0))
+
+    def drain(self):
+        """Finish every remaining step"""
+        self.start_background()
+        while self._pending:
+            self._run_step(*self._pending.pop(0))
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def done(self):
+        return not self._pending and not self._background and self._thread is None
@@ -0,0 +1,205 @@
+"""
+Stroke input pipeline for ABook
+Raw motion samples -> ring buffer -> one-euro filter -> Catmull-Rom path
+"""
+import math
+from array import array
+from config import FPS
+
+
+# Shortest time step the filter assumes between two samples
+MIN_SAMPLE_DT = 1.0 / 240
+
+# Samples sharing one timestamp (an event batch) are spread back over at
+# most this long: they were all queued during the last frame
+BATCH_SPAN = 1.0 / FPS
+
+# One-euro filter tuning, in pixels and seconds
+MIN_CUTOFF = 3.0   # Hz - smoothing of slow, jittery movement
+BETA = 0.02        # How fast the cutoff rises with speed (less lag on fast strokes)
+D_CUTOFF = 1.0     # Hz - smoothing of the speed estimate
+
+# Distance between interpolated path points
+PATH_SPACING = 2.0
+
+
+class SampleRing:
+    """Fixed-size ring buffer of raw (x, y, t) samples"""
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.x = array('f', bytes(4 * capacity))
+        self.y = array('f', bytes(4 * capacity))
+        self.t = array('d', bytes(8 * capacity))
+        self.count = 0  # total samples ever pushed
+
+    def push(self, x, y, t):
+        i = self.count % self.capacity
+        self.x[i] = x
+        self.y[i] = y
+        self.t[i] = t
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def latest(self, n=None):
+        """The last n samples (oldest first)"""
+        n = len(self) if n is None else min(n, len(self))
+        start = self.count - n
+        return [(self.x[i % self.capacity], self.y[i % self.capacity], self.t[i % self.capacity])
+                for i in range(start, self.count)]
+
+    def clear(self):
+        self.count = 0
+
+
+class OneEuroFilter:
+    """One-euro low-pass filter for one coordinate (Casiez et al.)"""
+
+    def __init__(self, min_cutoff=MIN_CUTOFF, beta=BETA, d_cutoff=D_CUTOFF):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.deriv = 0.0
+        self.last_t = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, t):
+        if self.value is None:
+            self.value = x
+            self.last_t = t
+            return x
+
+        dt = max(t - self.last_t, MIN_SAMPLE_DT)
+        self.last_t = t
+
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.deriv += a_d * ((x - self.value) / dt - self.deriv)
+
+        cutoff = self.min_cutoff + self.beta * abs(self.deriv)
+        self.value += self._alpha(cutoff, dt) * (x - self.value)
+        return self.value
+
+
+def catmull_rom(p0, p1, p2, p3, spacing=PATH_SPACING):
+    """Points on the Catmull-Rom curve from p1 (exclusive) to p2 (inclusive)"""
+    n = max(1, int(math.hypot(p2[0] - p1[0], p2[1] - p1[1]) / spacing))
+    points = []
+    for i in range(1, n + 1):
+        t = i / n
+        t2 = t * t
+        t3 = t2 * t
+        points.append(tuple(
+            0.5 * (2 * p1[k]
+                   + (p2[k] - p0[k]) * t
+                   + (2 * p0[k] - 5 * p1[k] + 4 * p2[k] - p3[k]) * t2
+                   + (3 * p1[k] - p0[k] - 3 * p2[k] + p3[k]) * t3)
+            for k in (0, 1)))
+    return points
+
+
+class StrokeInput:
+    """
+    Collects the samples of one stroke and hands out a smoothed path
+    add() is cheap and can be called for every motion event; take_points()
+    is called once per frame and returns the new part of the path,
+    starting at the last point handed out so consecutive pieces join up.
+    """
+
+    def __init__(self, capacity=1024):
+        self.samples = SampleRing(capacity)
+        self.fx = OneEuroFilter()
+        self.fy = OneEuroFilter()
+        self.active = False
+        self._ctrl = []      # last filtered control points
+        self._pending = []   # interpolated points not yet taken
+        self._last_taken = None
+        self._last_t = 0.0
+        self._batch = []     # positions that share the timestamp _batch_t
+        self._batch_t = 0.0
+
+    def _flush(self):
+        """
+        Filter the held batch, spread evenly up to its timestamp: the last
+        sample gets the batch's own time, so no sample is ahead of the clock
+        """
+        n = len(self._batch)
+        if not n:
+            return
+        t = self._batch_t
+        span = min(max(t - self._last_t, 0.0), BATCH_SPAN)
+        for k, pos in enumerate(self._batch, 1):
+            self._sample(pos, t - span * (n - k) / n)
+        self._batch = []
+        self._last_t = t
+
+    def _sample(self, pos, t):
+        self.samples.push(pos[0], pos[1], t)
+        p = (self.fx(pos[0], t), self.fy(pos[1], t))
+
+        last = self._ctrl[-1]
+        if abs(p[0] - last[0]) + abs(p[1] - last[1]) >= 0.5:
+            self._add_control(p)
+
+    def _add_control(self, p):
+        self._ctrl.append(p)
+        if len(self._ctrl) >= 4:
+            self._pending.extend(catmull_rom(*self._ctrl[-4:]))
+            del self._ctrl[:-3]
+
+    def begin(self, pos, t):
+        self.samples.clear()
+        self.fx.reset()
+        self.fy.reset()
+        self._last_t = t
+        self._batch = []
+        self.samples.push(pos[0], pos[1], t)
+        self.fx(pos[0], t)
+        self.fy(pos[1], t)
+
+        start = (float(pos[0]), float(pos[1]))
+        self._ctrl = [start, start]
+        self._pending = [start]
+        self._last_taken = None
+        self.active = True
+
+    def add(self, pos, t):
+        """Record a sample; samples with the same t are held until the time moves on"""
+        if not self.active:
+            return
+        if self._batch and t != self._batch_t:
+            self._flush()
+        self._batch.append(pos)
+        self._batch_t = t
+
+    def end(self):
+        """Finish the stroke at the last raw sample (the filter lags slightly)"""
+        if not self.active:
+            return
+        self._flush()
+        x, y, _ = self.samples.latest(1)[0]
+        final = (float(x), float(y))
+        self._add_control(final)
+        self._add_control(final)
+        self.active = False
+
+    def take_points(self):
+        """New path points since the last call (empty if nothing new)"""
+        self._flush()
+        if not self._pending:
+            return []
+        points = self._pending
+        if self._last_taken is not None:
+            points = [self._last_taken] + points
+        self._pending = []
+        self._last_taken = points[-1]
+        return points
@@ -1,12 +1,24 @@
 """
 Templates for different notebook page styles
+A template is the notebook's background plane: it is rendered once per
+(template, width) into tiles that repeat down the page, and drawn under
+the layers for the visible part of the page only.
 """
 import pygame
 from config import *
 
 
+# Minimum tile height - short patterns are stacked to reduce blits
+TILE_MIN_HEIGHT = 256
+
+# (template name, width) -> (head tile, repeat tile)
+_tile_cache = {}
+
+
 class Template:
     """Base template class"""
+    period = 1  # Pattern repeats every `period` pixels down the page
+    
     def __init__(self, name, description):
         self.name = name
         self.description = description
@@ -14,6 +26,38 @@ class Template:
     def draw(self, surface):
         """Draw the template on the surface"""
         pass
+    
+    def tiles(self, width):
+        """
+        (head, repeat) tiles for a page `width` pixels wide
+        head is the top of the page; every later tile-high band looks like
+        repeat. Both come from one draw() of a short strip, so they match
+        drawing the whole page exactly.
+        """
+        key = (self.name, width)
+        tiles = _tile_cache.get(key)
+        if tiles is None:
+            tile_h = self.period * -(-TILE_MIN_HEIGHT // self.period)
+            # Extra period at the bottom so lines straddling 2*tile_h are drawn
+            strip = pygame.Surface((width, 2 * tile_h + self.period))
+            self.draw(strip)
+            head = strip.subsurface((0, 0, width, tile_h)).copy()
+            repeat = strip.subsurface((0, tile_h, width, tile_h)).copy()
+            tiles = _tile_cache[key] = (head, repeat)
+        return tiles
+    
+    def draw_background(self, target, scroll_offset=0):
+        """Fill target with the page rows starting at scroll_offset"""
+        width = target.get_width()
+        head, repeat = self.tiles(width)
+        tile_h = head.get_height()
+        y = scroll_offset
+        end = scroll_offset + target.get_height()
+        while y < end:
+            band, row = divmod(y, tile_h)
+            tile = head if band == 0 else repeat
+            target.blit(tile, (0, y - scroll_offset), (0, row, width, tile_h - row))
+            y += tile_h - row
 
 
 class BlankTemplate(Template):
@@ -30,6 +74,7 @@ class SingleLineTemplate(Template):
     def __init__(self):
         super().__init__("Single Line", "Ruled notebook lines")
         self.line_spacing = 40  # Space between lines
+        self.period = self.line_spacing
         self.line_color = (200, 200, 255)  # Light blue
     
     def draw(self, surface):
@@ -54,6 +99,7 @@ class DoubleLineTemplate(Template):
         super().__init__("Double Line", "Double ruled lines")
         self.line_spacing = 50
         self.sub_line_spacing = 25
+        self.period = self.line_spacing
         self.dark_line_color = (180, 180, 220)
         self.light_line_color = (220, 220, 240)
     
@@ -85,6 +131,7 @@ class GraphTemplate(Template):
     def __init__(self):
         super().__init__("Graph", "Grid for diagrams")
         self.grid_size = 20  # Size of each grid square
+        self.period = self.grid_size * 5  # Every 5th line is darker
         self.main_line_color = (200, 200, 220)
         self.sub_line_color = (230, 230, 240)
     
@@ -119,6 +166,7 @@ class DottedTemplate(Template):
     def __init__(self):
         super().__init__("Dotted", "Dot grid pattern")
         self.dot_spacing = 25
+        self.period = self.dot_spacing
         self.dot_color = (200, 200, 220)
         self.dot_size = 2
     
@@ -152,4 +200,16 @@ def get_template_by_name(name):
     for template in TEMPLATES:
         if template.name == name:
             return template
-    return TEMPLATES[0]  # Return blank as default
\ No newline at end of file
+    return TEMPLATES[0]  # Return blank as default
+
+
+def draw_background(target, template_name, scroll_offset=0):
+    """Draw the named template for the page rows starting at scroll_offset"""
+    get_template_by_name(template_name).draw_background(target, scroll_offset)
+
+
+def render_background(template_name, size):
+    """Whole-page background surface, e.g. for export"""
+    surface = pygame.Surface(size)
+    draw_background(surface, template_name)
+    return surface
@@ -0,0 +1,38 @@
+"""
+Speed of epd_raster.thick_line against the old per-pixel disc stamping
+(not a test; run with: python tests/bench_epd_raster.py)
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'micropython_sim')]
+
+import framebuf
+import epd_raster
+from raster_reference import stamped_line
+
+
+def main():
+    segments = [(10 + (i * 37) % 100, 20 + (i * 53) % 250, 10 + (i * 61) % 100, 20 + (i * 29) % 250)
+                for i in range(200)]
+    for r in (1, 2, 4):
+        results = {}
+        images = {}
+        for name, draw in (('pixels', stamped_line), ('spans', epd_raster.thick_line)):
+            buf = bytearray(16 * 296)
+            fb = framebuf.FrameBuffer(buf, 128, 296, framebuf.MONO_HLSB)
+            start = time.perf_counter()
+            for s in segments:
+                draw(fb, *s, r, 1)
+            results[name] = (time.perf_counter() - start, sum(fb.calls.values()))
+            images[name] = buf
+        differ = sum(bin(a ^ b).count('1') for a, b in zip(images['pixels'], images['spans']))
+        print(f"r={r}: pixels {results['pixels'][0] * 1000:.1f} ms / {results['pixels'][1]} calls, "
+              f"spans {results['spans'][0] * 1000:.1f} ms / {results['spans'][1]} calls, "
+              f"{differ} pixels differ (edge pixels, see tests/test_epd_raster.py)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+"""
+Tests run from the repository root: python -m pytest tests
+The Pico modules import machine / framebuf / utime, so micropython_sim
+is on the path as well (it only adds modules CPython does not have).
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, 'micropython_sim')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
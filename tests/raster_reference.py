@@ -0,0 +1,32 @@
+"""Reference rasterizers for the epd_raster tests and benchmark"""
+
+
+def stamped_line(fb, x0, y0, x1, y1, r, c):
+    """The old sketch path: a disc stamped with pixel() at every Bresenham point"""
+    dx, dy = abs(x1 - x0), abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx - dy
+    while True:
+        for i in range(-r, r + 1):
+            for j in range(-r, r + 1):
+                if i * i + j * j <= r * r:
+                    fb.pixel(x0 + i, y0 + j, c)
+        if x0 == x1 and y0 == y1:
+            break
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x0 += sx
+        if e2 < dx:
+            err += dx
+            y0 += sy
+
+
+def segment_distance2(px, py, x0, y0, x1, y1):
+    """Squared distance from (px, py) to the segment"""
+    dx, dy = x1 - x0, y1 - y0
+    length2 = dx * dx + dy * dy
+    t = 0.0 if not length2 else max(0.0, min(1.0, ((px - x0) * dx + (py - y0) * dy) / length2))
+    ex, ey = x0 + t * dx - px, y0 + t * dy - py
+    return ex * ex + ey * ey
@@ -0,0 +1,28 @@
+"""DisplayTransform: to_landscape is the inverse of to_portrait"""
+from display import DisplayTransform
+from touch_calibration import AffineCalibration
+
+
+def test_rotation_round_trip():
+    t = DisplayTransform()
+    for pos in ((0, 0), (599, 1023), (294, 505), (10, 700)):
+        assert t.to_portrait(t.to_landscape(pos)) == pos
+    assert t.to_landscape((0, 0)) == (0, 599)
+
+
+def test_calibrated_round_trip():
+    t = DisplayTransform(calibration=AffineCalibration(1.05, 0, -20, 0, 1.05, -10))
+    # Every position a touch can produce replays to the same position
+    for wx in range(0, 1024, 7):
+        for wy in range(0, 600, 11):
+            pos = t.to_portrait((wx, wy))
+            assert t.to_portrait(t.to_landscape(pos)) == pos
+    assert t.to_portrait(t.to_landscape((294, 505))) == (294, 505)
+
+
+def test_shrinking_calibration_round_trip():
+    t = DisplayTransform(calibration=AffineCalibration(0.9, 0.02, 15, -0.01, 0.95, 8))
+    for wx in range(0, 1024, 13):
+        for wy in range(0, 600, 17):
+            pos = t.to_portrait((wx, wy))
+            assert t.to_portrait(t.to_landscape(pos)) == pos
@@ -0,0 +1,108 @@
+"""epd_raster: exact pixel coverage of discs, capsules and polylines (fake framebuf)"""
+import framebuf
+import pytest
+
+import epd_raster
+from raster_reference import stamped_line, segment_distance2
+
+W, H = 128, 296
+SEGMENTS = [(10 + (i * 37) % 100, 20 + (i * 53) % 250, 10 + (i * 61) % 100, 20 + (i * 29) % 250)
+            for i in range(40)] + [(20, 20, 80, 20), (40, 10, 40, 90), (10, 10, 60, 60), (5, 100, 6, 180)]
+
+
+def new_fb():
+    fb = framebuf.FrameBuffer(bytearray(W // 8 * H), W, H, framebuf.MONO_HLSB)
+    return fb
+
+
+def inked(fb):
+    return {(x, y) for y in range(H) for x in range(W) if fb._get(x, y)}  # _get: not counted in calls
+
+
+def within(points, r, segments):
+    """Pixels of the screen within r of any of the segments"""
+    return {(x, y) for x, y in points
+            if any(segment_distance2(x, y, *s) <= r * r + 1e-6 for s in segments)}
+
+
+def screen():
+    return [(x, y) for y in range(H) for x in range(W)]
+
+
+def in_rect(pixels, rect):
+    x, y, w, h = rect
+    return all(x <= px < x + w and y <= py < y + h for px, py in pixels)
+
+
+@pytest.mark.parametrize("r", [0, 1, 2, 3, 5, 8])
+def test_fill_disc_covers_exact_disc(r):
+    fb = new_fb()
+    rect = epd_raster.fill_disc(fb, 60, 100, r, 1)
+    expected = {(60 + dx, 100 + dy) for dy in range(-r, r + 1) for dx in range(-r, r + 1)
+                if dx * dx + dy * dy <= r * r}
+    assert inked(fb) == expected
+    assert rect == (60 - r, 100 - r, 2 * r + 1, 2 * r + 1)
+    if r:
+        assert fb.calls == {'hline': 2 * r + 1}
+
+
+@pytest.mark.parametrize("r", [1, 2, 4])
+def test_thick_line_is_exact_capsule(r):
+    """Every pixel within r of the segment, and no other, one hline per row"""
+    for seg in SEGMENTS:
+        fb = new_fb()
+        rect = epd_raster.thick_line(fb, *seg, r, 1)
+        x0, y0, x1, y1 = seg
+        box = [(x, y) for y in range(min(y0, y1) - r - 1, max(y0, y1) + r + 2)
+               for x in range(min(x0, x1) - r - 1, max(x0, x1) + r + 2)
+               if 0 <= x < W and 0 <= y < H]
+        pixels = inked(fb)
+        assert pixels == within(box, r, [seg]), seg
+        assert in_rect(pixels, rect)
+        assert fb.calls.get('hline', 0) <= abs(y1 - y0) + 2 * r + 1
+        assert 'pixel' not in fb.calls
+
+
+@pytest.mark.parametrize("r", [1, 2, 4])
+def test_thick_line_differs_from_stamping_only_at_the_edge(r):
+    """
+    The old stamped path reached up to half a pixel further out (its disc
+    centres are Bresenham points); all other pixels are the same
+    """
+    for seg in SEGMENTS:
+        old, new = new_fb(), new_fb()
+        stamped_line(old, *seg, r, 1)
+        epd_raster.thick_line(new, *seg, r, 1)
+        old_px, new_px = inked(old), inked(new)
+        limit = (r + 0.75) ** 2
+        for x, y in old_px ^ new_px:
+            assert segment_distance2(x, y, *seg) <= limit, (seg, x, y)
+        for x, y in old_px - new_px:
+            assert segment_distance2(x, y, *seg) > r * r
+
+
+@pytest.mark.parametrize("r", [1, 3])
+def test_polyline_joins_are_round(r):
+    points = [(20, 40), (70, 60), (30, 120), (100, 130), (100, 200)]
+    fb = new_fb()
+    rect = epd_raster.polyline(fb, points, r, 1)
+    segments = [points[i - 1] + points[i] for i in range(1, len(points))]
+    pixels = inked(fb)
+    assert pixels == within(screen(), r, segments)
+    # Each join holds the full disc around the shared point
+    for px, py in points[1:-1]:
+        assert {(px + dx, py + dy) for dy in range(-r, r + 1) for dx in range(-r, r + 1)
+                if dx * dx + dy * dy <= r * r} <= pixels
+    assert in_rect(pixels, rect)
+
+
+def test_polyline_single_point_and_empty():
+    fb = new_fb()
+    assert epd_raster.polyline(fb, [], 2, 1) == (0, 0, 0, 0)
+    assert epd_raster.polyline(fb, [(50, 50)], 2, 1) == (48, 48, 5, 5)
+
+
+def test_clipped_at_screen_edges():
+    fb = new_fb()
+    epd_raster.thick_line(fb, -10, 5, 140, 5, 3, 1)
+    assert inked(fb) == {(x, y) for y in range(2, 9) for x in range(W)}
@@ -0,0 +1,103 @@
+"""
+EPD_2in9 driver and RefreshScheduler against the simulated panel
+(micropython_sim: SimPanel decodes the SPI traffic into panel RAM)
+"""
+import pytest
+
+from epd_panel import SimPanel
+from epd_refresh import RefreshScheduler, changed_window
+from number_of_taps_counter import EPD_2in9
+import epd_raster
+
+
+@pytest.fixture
+def panel():
+    panel = SimPanel().attach()
+    yield panel
+    panel.detach()
+
+
+@pytest.fixture
+def epd(panel):
+    epd = EPD_2in9()
+    epd.init()
+    epd.fill(0xff)
+    epd.display_Base(epd.buffer)
+    assert panel.shows(epd.buffer)
+    return epd
+
+
+def test_changed_window():
+    old = bytearray(16 * 296)
+    new = bytearray(old)
+    assert changed_window(old, new, 16, 296) is None
+    new[10 * 16 + 3] = 1
+    new[20 * 16 + 7] = 1
+    assert changed_window(old, new, 16, 296) == (3, 10, 7, 20)
+    assert changed_window(old, new, 16, 296, first=15) == (7, 20, 7, 20)
+
+
+def test_partial_refresh_sends_window_only(panel, epd):
+    epd.fill_rect(16, 2, 100, 22, 0x00)
+    sent = panel.ram_bytes
+    assert epd.display_Partial(epd.buffer) == (2, 2, 14, 23)
+    assert panel.shows(epd.buffer)
+    assert panel.ram_bytes - sent == 13 * 22
+    assert epd.display_Partial(epd.buffer) is None
+
+
+def test_full_update_after_partial(panel, epd):
+    epd.fill_rect(16, 2, 100, 22, 0x00)
+    epd.display_Partial(epd.buffer, (2, 2, 14, 23))
+    epd.fill(0xff)
+    epd.text("full", 10, 100, 0x00)
+    epd.display(epd.buffer)
+    assert panel.shows(epd.buffer)
+    epd.display_Base(epd.buffer)
+    assert panel.shows(epd.buffer)
+
+
+def test_clear_after_partial(panel, epd):
+    epd.fill_rect(0, 40, 8, 8, 0x00)
+    epd.display_Partial(epd.buffer)
+    epd.Clear(0xff)
+    epd.fill(0xff)
+    assert panel.shows(epd.buffer)
+    assert epd.shown == epd.buffer
+
+
+def test_scheduler_forced_full_refreshes(panel, epd):
+    refresher = RefreshScheduler(epd, full_every=5)
+    fulls = 0
+    for i in range(200):
+        x, y = 10 + (i * 37) % 100, 20 + (i * 53) % 250
+        refresher.mark(*epd_raster.thick_line(epd, x, y, x + 7, y + 5, 2, 0x00))
+        if refresher.flush() == 'full':
+            fulls += 1
+            assert panel.shows(epd.buffer)
+    assert fulls and refresher.partial_count
+    assert panel.shows(epd.buffer)
+
+
+def test_scheduler_clear(panel, epd):
+    refresher = RefreshScheduler(epd)
+    refresher.mark(*epd_raster.fill_disc(epd, 64, 150, 3, 0x00))
+    refresher.flush()
+    # Sketch mode's KEY1: redraw the screen and refresh it in full
+    epd.fill(0xff)
+    epd.text("Simple Sketch", 20, 10, 0x00)
+    assert refresher.full() == 'full'
+    assert panel.shows(epd.buffer)
+    refresher.mark(*epd_raster.fill_disc(epd, 30, 200, 3, 0x00))
+    assert refresher.flush() == 'partial'
+    assert panel.shows(epd.buffer)
+
+
+def test_scheduler_rate_limit(epd):
+    refresher = RefreshScheduler(epd, interval_ms=250)
+    refresher.mark(*epd_raster.fill_disc(epd, 64, 150, 3, 0x00))
+    assert refresher.poll(now=0) == 'partial'
+    refresher.last_refresh = 0
+    refresher.mark(*epd_raster.fill_disc(epd, 70, 150, 3, 0x00))
+    assert refresher.poll(now=100) is None
+    assert refresher.poll(now=250) == 'partial'
@@ -0,0 +1,86 @@
+"""layer_ops: merging never changes what the page shows"""
+import numpy as np
+import pygame
+import pytest
+
+from models import Notebook, Page, Layer, LAYER_WIDTH
+import layer_ops
+
+
+@pytest.fixture(autouse=True)
+def display():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+def make_notebook(count, hidden=()):
+    """Layers with overlapping solid and half-covered squares, each a little further right"""
+    layers = []
+    for i in range(count):
+        layer = Layer()
+        rect = pygame.Rect(20 + 15 * i, 20, 40, 40)
+        layer.surf.fill(255 if layer.gray else (0, 0, 0, 255), rect)
+        half = pygame.Rect(30 + 15 * i, 100, 40, 40)  # antialiasing-like partial ink
+        layer.surf.fill(128 if layer.gray else (0, 0, 0, 128), half)
+        layer.mark(rect.union(half))
+        layer.visible = i not in hidden
+        layers.append(layer)
+    return Notebook("Test", pages=[Page(layers)]), layers
+
+
+def render(notebook):
+    page = pygame.Surface((LAYER_WIDTH, 200))
+    page.fill((255, 255, 255))
+    for layer in notebook.page.visible_layers():
+        layer.draw_onto(page, (0, 0), page.get_rect())
+    return pygame.surfarray.array3d(page).astype(np.int16)
+
+
+def same_page(a, b):
+    """Equal up to rounding (coverage is 8-bit)"""
+    return np.abs(a - b).max() <= 1
+
+
+def test_merge_selected_contiguous():
+    notebook, layers = make_notebook(4)
+    shown = render(notebook)
+    edit, index = layer_ops.merge_selected(notebook, [1, 2])
+    assert edit and index == 1
+    assert notebook.layers == [layers[0], layers[1], layers[3]]
+    assert same_page(render(notebook), shown)
+
+
+def test_merge_selected_refuses_visible_layer_between():
+    notebook, layers = make_notebook(3)
+    assert layer_ops.merge_selected(notebook, [0, 2]) == (None, None)
+    assert notebook.layers == layers
+
+
+def test_merge_across_hidden_layer_keeps_page():
+    notebook, layers = make_notebook(3, hidden={1})
+    shown = render(notebook)
+    edit, index = layer_ops.merge_selected(notebook, [0, 2])
+    assert notebook.layers == [layers[1], layers[0]] and index == 1
+    assert same_page(render(notebook), shown)
+
+
+def test_flatten_keeps_page_and_hidden_layers():
+    notebook, layers = make_notebook(4, hidden={1})
+    shown = render(notebook)
+    edit, index = layer_ops.flatten(notebook)
+    assert edit and layers[1] in notebook.layers and not layers[1].visible
+    assert same_page(render(notebook), shown)
+    edit.undo(notebook)
+    assert notebook.layers == layers
+    assert same_page(render(notebook), shown)
+
+
+def test_merge_down_skips_hidden_layers():
+    notebook, layers = make_notebook(3, hidden={1})
+    shown = render(notebook)
+    edit, index = layer_ops.merge_down(notebook, 2)
+    assert edit and layers[1] in notebook.layers
+    assert same_page(render(notebook), shown)
+    assert layer_ops.merge_down(notebook, notebook.layers.index(layers[1])) == (None, None)
@@ -0,0 +1,54 @@
+import pytest
+
+from stroke_input import StrokeInput, BATCH_SPAN
+
+
+def sample_times(stroke):
+    return [t for _, _, t in stroke.samples.latest()]
+
+
+def test_distinct_timestamps_are_kept():
+    stroke = StrokeInput()
+    stroke.begin((0, 0), 10.0)
+    for i in range(1, 6):
+        stroke.add((i * 3, 0), 10.0 + i * 0.001)
+    stroke.take_points()
+    assert sample_times(stroke) == pytest.approx([10.0 + i * 0.001 for i in range(6)])
+
+
+def test_batch_is_spread_up_to_its_own_time():
+    stroke = StrokeInput()
+    stroke.begin((0, 0), 1.0)
+    for i in range(1, 5):
+        stroke.add((i * 3, 0), 1.1)
+    stroke.take_points()
+    times = sample_times(stroke)[1:]
+    # Spread over the last frame before 1.1, ending on it
+    assert times == pytest.approx([1.1 - BATCH_SPAN * (4 - k) / 4 for k in range(1, 5)])
+    assert all(a < b for a, b in zip(times, times[1:]))
+
+
+def test_samples_never_run_ahead_of_later_timestamps():
+    stroke = StrokeInput()
+    stroke.begin((0, 0), 0.0)
+    t = 0.0
+    for frame in range(1, 20):
+        # Large batches at a short frame interval
+        t = frame * 0.004
+        for i in range(8):
+            stroke.add((frame * 10 + i, frame), t)
+        stroke.take_points()
+        times = sample_times(stroke)
+        assert max(times) == pytest.approx(t)
+        assert all(a < b for a, b in zip(times, times[1:]))
+
+
+def test_held_batch_is_drawn_by_end():
+    stroke = StrokeInput()
+    stroke.begin((0, 0), 0.0)
+    stroke.add((5, 0), 0.01)
+    stroke.add((10, 0), 0.01)
+    stroke.end()
+    points = stroke.take_points()
+    assert points[-1] == pytest.approx((10.0, 0.0))
+    assert sample_times(stroke)[-1] == pytest.approx(0.01)
@@ -0,0 +1,43 @@
+from word_completion import WordCompleter, USER_WORD_BOOST
+
+VOCABULARY = {'note': 50, 'notebook': 20, 'nothing': 30}
+
+
+def freq(completer, word):
+    return completer.freqs[completer.words.index(word)]
+
+
+def test_learned_words_survive_a_restart(tmp_path):
+    path = tmp_path / 'learned.txt'
+    completer = WordCompleter(dict(VOCABULARY), learned_file=str(path))
+    completer.add_text("Notebook notation notebook")
+
+    restarted = WordCompleter(dict(VOCABULARY), learned_file=str(path))
+    assert restarted.learned == {'notebook', 'notation'}
+    assert restarted.complete('not', 3) == ['notebook', 'notation', 'note']
+    assert freq(restarted, 'notebook') == 20 + USER_WORD_BOOST
+
+
+def test_words_are_saved_and_boosted_once(tmp_path):
+    path = tmp_path / 'learned.txt'
+    completer = WordCompleter(dict(VOCABULARY), learned_file=str(path))
+    completer.add_text("notebook")
+    completer.add_word("Notebook")
+    WordCompleter(dict(VOCABULARY), learned_file=str(path)).add_text("notebook")
+
+    assert path.read_text().split() == ['notebook']
+    assert freq(completer, 'notebook') == 20 + USER_WORD_BOOST
+
+
+def test_without_a_file_nothing_is_saved(tmp_path):
+    completer = WordCompleter(dict(VOCABULARY))
+    completer.add_text("notation")
+    assert 'notation' in completer
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_ocr_messages_are_not_learned(tmp_path):
+    path = tmp_path / 'learned.txt'
+    completer = WordCompleter(dict(VOCABULARY), learned_file=str(path))
+    assert completer.add_text("[OCR not available]") == 0
+    assert not path.exists()
@@ -0,0 +1,90 @@
+"""
+Text rendering cache for ABook
+Font registry plus an LRU cache of rendered text surfaces shared by all views
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces
+    Keyed by (font, text, antialias, color, background). Labels that are drawn
+    every frame are rendered once and then only blitted.
+
+    Cached surfaces are shared - callers must blit them, never draw on them.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """Same arguments as pygame.font.Font.render, but cached"""
+        key = (font, text, antialias, tuple(color),
+               tuple(background) if background is not None else None)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        if background is None:
+            surf = font.render(text, antialias, color)
+        else:
+            surf = font.render(text, antialias, color, background)
+
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def stats(self):
+        """Cache statistics"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+# Font registry: (name, size, bold, italic) -> Font
+_fonts = {}
+
+def get_font(name, size, bold=False, italic=False):
+    """Get a system font, resolving each (name, size, style) only once"""
+    key = (name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        try:
+            font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+        except Exception as e:
+            print(f"[Text] Could not load font {name} {size}: {e}")
+            font = pygame.font.SysFont(None, size, bold=bold, italic=italic)
+        _fonts[key] = font
+    return font
+
+
+# Singleton instance
+_text_cache = None
+
+def get_text_cache():
+    """Get or create the shared text surface cache"""
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextCache()
+    return _text_cache
+
+
+def render_text(font, text, antialias, color, background=None):
+    """Render text through the shared cache"""
+    return get_text_cache().render(font, text, antialias, color, background)
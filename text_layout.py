@@ -0,0 +1,104 @@
+"""
+Cached text layout for ABook
+Word wrapping measured with font.size, line surfaces rendered once
+"""
+import pygame
+
+
+class TextLayout:
+    """
+    Wraps text into lines and draws only the lines inside a scroll window
+    Line breaks are cached per (text, font, size, width) and line surfaces
+    are cached until the layout changes, so scrolling only blits.
+    """
+
+    def __init__(self, color=(0, 0, 0), max_layouts=8):
+        self.color = color
+        self.max_layouts = max_layouts
+
+        # (text, font_key, width) -> list of lines
+        self._layouts = {}
+        # font_key -> {word: width}
+        self._word_widths = {}
+
+        # Rendered surfaces for the current layout only
+        self._current_key = None
+        self._lines = []
+        self._surfaces = {}
+
+    def _measure(self, font, font_key, word):
+        """Width of a word, measured once per font"""
+        widths = self._word_widths.setdefault(font_key, {})
+        w = widths.get(word)
+        if w is None:
+            w = font.size(word)[0]
+            widths[word] = w
+        return w
+
+    def wrap(self, text, font, font_key, max_width):
+        """
+        Break text into lines no wider than max_width
+        Paragraph breaks (newlines) are kept; a single word wider than
+        the line is placed on its own line.
+        """
+        key = (text, font_key, max_width)
+        lines = self._layouts.get(key)
+        if lines is not None:
+            return lines
+
+        space = self._measure(font, font_key, ' ')
+        lines = []
+        for paragraph in text.split('\n'):
+            words = paragraph.split()
+            if not words:
+                lines.append('')
+                continue
+
+            current = [words[0]]
+            width = self._measure(font, font_key, words[0])
+            for word in words[1:]:
+                w = self._measure(font, font_key, word)
+                if width + space + w <= max_width:
+                    current.append(word)
+                    width += space + w
+                else:
+                    lines.append(' '.join(current))
+                    current = [word]
+                    width = w
+            lines.append(' '.join(current))
+
+        if len(self._layouts) >= self.max_layouts:
+            self._layouts.clear()
+        self._layouts[key] = lines
+        return lines
+
+    def content_height(self, font):
+        """Total height of the current layout in pixels"""
+        return len(self._lines) * font.get_linesize()
+
+    def draw(self, screen, text, font, font_key, x, y, max_width, max_height, scroll_offset):
+        """Draw the visible slice of the wrapped text"""
+        key = (text, font_key, max_width)
+        if key != self._current_key:
+            self._current_key = key
+            self._lines = self.wrap(text, font, font_key, max_width)
+            self._surfaces = {}
+
+        line_height = font.get_linesize()
+        first = max(0, scroll_offset // line_height)
+        last = min(len(self._lines), (scroll_offset + max_height) // line_height + 1)
+
+        # Drop cached surfaces that scrolled well out of view
+        if len(self._surfaces) > 3 * (last - first + 1):
+            self._surfaces = {i: s for i, s in self._surfaces.items()
+                              if first <= i < last}
+
+        old_clip = screen.get_clip()
+        screen.set_clip(pygame.Rect(x, y, max_width, max_height))
+        for i in range(first, last):
+            surf = self._surfaces.get(i)
+            if surf is None:
+                surf = font.render(self._lines[i], True, self.color)
+                self._surfaces[i] = surf
+            screen.blit(surf, (x, y + i * line_height - scroll_offset))
+        screen.set_clip(old_clip)
@@ -2,9 +2,15 @@
 Text processing module for handwriting recognition and summarization
 """
 import pygame
-from PIL import Image
 import sys
 import os
+from startup import lazy_import
+import gray_canvas
+
+# PIL is only needed once OCR actually runs
+Image = lazy_import('PIL.Image')
+
+OCR_MARGIN = 20  # White border kept around the ink area (same as the crop padding)
 
 class TextProcessor:
     """Handles OCR and text summarization"""
@@ -55,9 +61,11 @@ class TextProcessor:
         except ImportError:
             return False
     
-    def extract_text_from_surface(self, surface):
+    def extract_text_from_surface(self, surface, rect=None):
         """
         Extract text from a pygame surface using OCR
+        rect: area that holds all the ink (Layer.bounds); only that area,
+        plus a margin, is converted
         Returns: extracted text string
         """
         print(f"\n[OCR] Starting text extraction...")
@@ -67,6 +75,13 @@ class TextProcessor:
         if not self.ocr_available:
             return self._simple_placeholder_extraction()
         
+        if rect is not None:
+            if not (rect.width and rect.height):
+                print(f"[OCR] Layer is empty")
+                return "[No text detected]"
+            surface = surface.subsurface(rect.inflate(OCR_MARGIN * 2, OCR_MARGIN * 2).clip(surface.get_rect()))
+            print(f"[OCR] Ink area: {surface.get_size()}")
+        
         try:
             import pytesseract
             from PIL import ImageEnhance, ImageOps, ImageFilter
@@ -77,25 +92,29 @@ class TextProcessor:
             mode = 'RGBA'
             
             print(f"[OCR] Converting surface to PIL Image...")
-            # Get raw string buffer from surface
-            raw_str = pygame.image.tostring(surface, mode)
-            pil_image = Image.frombytes(mode, size, raw_str)
-            
-            # IMPORTANT: Create a white background and paste the drawing on top
-            print(f"[OCR] Creating white background for transparent image...")
-            white_bg = Image.new('RGB', pil_image.size, 'white')
-            
-            # If image has transparency, composite it onto white background
-            if pil_image.mode == 'RGBA':
-                white_bg.paste(pil_image, mask=pil_image.split()[3])  # Use alpha channel as mask
+            if gray_canvas.is_plane(surface):
+                # Grayscale canvas: the plane already is ink over white
+                pil_image = Image.fromarray(gray_canvas.luminance(surface), 'L')
             else:
-                white_bg.paste(pil_image)
-            
-            pil_image = white_bg
-            
-            # Convert to grayscale
-            print(f"[OCR] Converting to grayscale...")
-            pil_image = pil_image.convert('L')
+                # Get raw string buffer from surface
+                raw_str = pygame.image.tostring(surface, mode)
+                pil_image = Image.frombytes(mode, size, raw_str)
+                
+                # IMPORTANT: Create a white background and paste the drawing on top
+                print(f"[OCR] Creating white background for transparent image...")
+                white_bg = Image.new('RGB', pil_image.size, 'white')
+                
+                # If image has transparency, composite it onto white background
+                if pil_image.mode == 'RGBA':
+                    white_bg.paste(pil_image, mask=pil_image.split()[3])  # Use alpha channel as mask
+                else:
+                    white_bg.paste(pil_image)
+                
+                pil_image = white_bg
+                
+                # Convert to grayscale
+                print(f"[OCR] Converting to grayscale...")
+                pil_image = pil_image.convert('L')
             
             # Enhance contrast to make text darker
             print(f"[OCR] Enhancing image for better OCR...")
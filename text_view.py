@@ -4,6 +4,8 @@ Text view for displaying and editing converted handwriting
 import pygame
 from config import *
 from ui_components import draw_status_bar
+from text_layout import TextLayout
+from text_cache import render_text, get_font
 
 
 class TextView:
@@ -33,17 +35,18 @@ class TextView:
         
         # Scrolling
         self.scroll_offset = 0
+        self.max_scroll = 0
         self.line_height = 25
+        
+        # Cached word wrap and line surfaces
+        self.layout = TextLayout(COLOR_BLACK)
     
     def update_font(self):
         """Update the text rendering font"""
         font_name = AVAILABLE_FONTS[self.current_font_index][0]
         size = TEXT_SIZES[self.current_size_index]
         
-        try:
-            self.text_font = pygame.font.SysFont(font_name, size)
-        except:
-            self.text_font = pygame.font.SysFont('Arial', size)
+        self.text_font = get_font(font_name, size)
     
     def set_text(self, text):
         """Set the text content"""
@@ -85,14 +88,14 @@ class TextView:
         # Back button
         self.back_btn = pygame.Rect(10, 35, 70, 40)
         pygame.draw.rect(screen, COLOR_UI_LIGHT, self.back_btn, border_radius=20)
-        back_text = self.font_s.render("← Back", True, COLOR_BLACK)
+        back_text = render_text(self.font_s, "← Back", True, COLOR_BLACK)
         screen.blit(back_text, (15, 45))
         
         # Font selector
         self.font_btn = pygame.Rect(90, 35, 100, 40)
         pygame.draw.rect(screen, COLOR_UI_LIGHT, self.font_btn, border_radius=5)
         font_name = AVAILABLE_FONTS[self.current_font_index][0].split()[0]
-        font_text = self.font_s.render(font_name, True, COLOR_BLACK)
+        font_text = render_text(self.font_s, font_name, True, COLOR_BLACK)
         screen.blit(font_text, (self.font_btn.centerx - font_text.get_width()//2, 45))
         
         # Size controls
@@ -102,13 +105,13 @@ class TextView:
         pygame.draw.rect(screen, COLOR_UI_LIGHT, self.size_down_btn, border_radius=5)
         pygame.draw.rect(screen, COLOR_UI_LIGHT, self.size_up_btn, border_radius=5)
         
-        minus_text = self.font_m.render("−", True, COLOR_BLACK)
-        plus_text = self.font_m.render("+", True, COLOR_BLACK)
+        minus_text = render_text(self.font_m, "−", True, COLOR_BLACK)
+        plus_text = render_text(self.font_m, "+", True, COLOR_BLACK)
         screen.blit(minus_text, (self.size_down_btn.centerx - 6, 40))
         screen.blit(plus_text, (self.size_up_btn.centerx - 6, 40))
         
         # Size indicator
-        size_text = self.font_s.render(f"{TEXT_SIZES[self.current_size_index]}", True, COLOR_BLACK)
+        size_text = render_text(self.font_s, f"{TEXT_SIZES[self.current_size_index]}", True, COLOR_BLACK)
         screen.blit(size_text, (290, 45))
         
         # Summary toggle (if summary available)
@@ -117,7 +120,7 @@ class TextView:
             color = COLOR_ACCENT if self.show_summary else COLOR_UI_LIGHT
             pygame.draw.rect(screen, color, self.summarize_btn, border_radius=5)
             text_color = COLOR_WHITE if self.show_summary else COLOR_BLACK
-            summary_text = self.font_s.render("Summary", True, text_color)
+            summary_text = render_text(self.font_s, "Summary", True, text_color)
             screen.blit(summary_text, (self.summarize_btn.centerx - 30, 45))
         
         # Text content area
@@ -132,46 +135,24 @@ class TextView:
                                      DISPLAY_WIDTH - 40, content_height)
         else:
             # Placeholder
-            placeholder = self.font_m.render("No text converted yet", True, COLOR_UI_DARK)
+            placeholder = render_text(self.font_m, "No text converted yet", True, COLOR_UI_DARK)
             screen.blit(placeholder, (DISPLAY_WIDTH//2 - 100, DISPLAY_HEIGHT//2))
     
     def _render_wrapped_text(self, screen, text, x, y, max_width, max_height):
         """Render text with word wrapping and scrolling"""
-        words = text.split()
-        lines = []
-        current_line = []
-        
-        # Word wrap
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            test_surface = self.text_font.render(test_line, True, COLOR_BLACK)
-            
-            if test_surface.get_width() <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-        
-        # Calculate line height
-        line_height = self.text_font.get_linesize()
-        
-        # Render visible lines with scroll offset
-        y_pos = y - self.scroll_offset
-        
-        for line in lines:
-            if y_pos > y - line_height and y_pos < y + max_height:
-                line_surface = self.text_font.render(line, True, COLOR_BLACK)
-                screen.blit(line_surface, (x, y_pos))
-            y_pos += line_height
+        font_key = (AVAILABLE_FONTS[self.current_font_index][0],
+                    TEXT_SIZES[self.current_size_index])
+        
+        self.layout.draw(screen, text, self.text_font, font_key,
+                         x, y, max_width, max_height, self.scroll_offset)
+        
+        self.max_scroll = max(0, self.layout.content_height(self.text_font) - max_height)
+        self.scroll_offset = min(self.scroll_offset, self.max_scroll)
     
     def handle_scroll(self, y_delta):
         """Handle scroll events"""
         self.scroll_offset -= y_delta * 20
-        self.scroll_offset = max(0, self.scroll_offset)
+        self.scroll_offset = max(0, min(self.scroll_offset, self.max_scroll))
     
     def handle_click(self, pos):
         """
@@ -0,0 +1,174 @@
+"""
+Affine touch calibration (runs on MicroPython and CPython)
+Maps raw touch coordinates to screen coordinates with one 2x3 matrix,
+fitted by least squares from 3 or more touched targets. Points are mapped
+with Q16 fixed-point integer coefficients, so the per-sample cost is four
+integer multiplies.
+
+File format (text):
+
+    ABCAL 1
+    a b c d e f          x' = a*x + b*y + c,  y' = d*x + e*y + f
+    width height         clamp range, 0 0 for none
+"""
+
+
+MAGIC = "ABCAL"
+VERSION = 1
+Q = 16
+ONE = 1 << Q
+
+
+class AffineCalibration:
+    """
+    x' = a*x + b*y + c, y' = d*x + e*y + f
+    size: (width, height) to clamp results into, or None
+    """
+
+    def __init__(self, a=1.0, b=0.0, c=0.0, d=0.0, e=1.0, f=0.0, size=None):
+        self.coeffs = (float(a), float(b), float(c), float(d), float(e), float(f))
+        self.size = tuple(size) if size else None
+
+        # Fixed-point coefficients; the offsets include +0.5 so >> rounds
+        qa, qb, qc, qd, qe, qf = [int(round(v * ONE)) for v in self.coeffs]
+        self._q = (qa, qb, qc + ONE // 2, qd, qe, qf + ONE // 2)
+
+    @classmethod
+    def from_ranges(cls, x0, x1, y0, y1, size, swap_xy=False):
+        """
+        Linear map of raw x0..x1 / y0..y1 onto 0..width-1 / 0..height-1
+        (swap_xy: raw y drives screen x)
+        """
+        w, h = size
+        if swap_xy:
+            sx = (w - 1) / (y1 - y0)
+            sy = (h - 1) / (x1 - x0)
+            return cls(0, sx, -y0 * sx, sy, 0, -x0 * sy, size)
+        sx = (w - 1) / (x1 - x0)
+        sy = (h - 1) / (y1 - y0)
+        return cls(sx, 0, -x0 * sx, 0, sy, -y0 * sy, size)
+
+    def apply(self, x, y):
+        """Screen position of a raw point (integers)"""
+        qa, qb, qc, qd, qe, qf = self._q
+        sx = (qa * x + qb * y + qc) >> Q
+        sy = (qd * x + qe * y + qf) >> Q
+        if self.size:
+            w, h = self.size
+            sx = 0 if sx < 0 else (w - 1 if sx >= w else sx)
+            sy = 0 if sy < 0 else (h - 1 if sy >= h else sy)
+        return sx, sy
+
+    def __call__(self, pos):
+        return self.apply(pos[0], pos[1])
+
+    def then(self, other):
+        """Calibration that applies self, then other (size from other)"""
+        a, b, c, d, e, f = self.coeffs
+        oa, ob, oc, od, oe, of = other.coeffs
+        return AffineCalibration(
+            oa * a + ob * d, oa * b + ob * e, oa * c + ob * f + oc,
+            od * a + oe * d, od * b + oe * e, od * c + oe * f + of,
+            other.size)
+
+    def inverse(self, size=None):
+        """Calibration mapping screen positions back to raw ones"""
+        a, b, c, d, e, f = self.coeffs
+        det = a * e - b * d
+        if not det:
+            raise ValueError("calibration is not invertible")
+        ia, ib, id_, ie = e / det, -b / det, -d / det, a / det
+        return AffineCalibration(ia, ib, -(ia * c + ib * f), id_, ie, -(id_ * c + ie * f), size)
+
+    def error(self, points):
+        """RMS distance (pixels) between mapped raw points and their targets"""
+        total = 0.0
+        a, b, c, d, e, f = self.coeffs
+        for rx, ry, tx, ty in points:
+            dx = a * rx + b * ry + c - tx
+            dy = d * rx + e * ry + f - ty
+            total += dx * dx + dy * dy
+        return (total / len(points)) ** 0.5 if points else 0.0
+
+    # Storage
+
+    def dumps(self):
+        w, h = self.size or (0, 0)
+        return "%s %d\n%s\n%d %d\n" % (MAGIC, VERSION, " ".join(repr(v) for v in self.coeffs), w, h)
+
+    @classmethod
+    def loads(cls, text):
+        lines = text.split("\n")
+        header = lines[0].split()
+        if len(header) != 2 or header[0] != MAGIC:
+            raise ValueError("not a touch calibration file")
+        if int(header[1]) != VERSION:
+            raise ValueError("unsupported calibration version " + header[1])
+        coeffs = [float(v) for v in lines[1].split()]
+        if len(coeffs) != 6:
+            raise ValueError("calibration needs 6 coefficients")
+        size = None
+        if len(lines) > 2 and lines[2].strip():
+            w, h = [int(v) for v in lines[2].split()]
+            size = (w, h) if w and h else None
+        return cls(*coeffs, size=size)
+
+    def save(self, path):
+        with open(path, "w") as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.loads(f.read())
+
+
+def _solve3(m, v):
+    """Solve the 3x3 system m * x = v (Gaussian elimination, partial pivoting)"""
+    m = [list(row) + [v[i]] for i, row in enumerate(m)]
+    scale = max(abs(x) for row in m for x in row[:3]) or 1.0
+    for col in range(3):
+        pivot = max(range(col, 3), key=lambda r: abs(m[r][col]))
+        if abs(m[pivot][col]) < 1e-9 * scale:
+            raise ValueError("calibration points are collinear or repeated")
+        m[col], m[pivot] = m[pivot], m[col]
+        for r in range(3):
+            if r != col:
+                k = m[r][col] / m[col][col]
+                for c in range(col, 4):
+                    m[r][c] -= k * m[col][c]
+    return [m[i][3] / m[i][i] for i in range(3)]
+
+
+def fit_affine(points, size=None):
+    """
+    Least-squares affine calibration from (raw_x, raw_y, target_x, target_y)
+    points; exact for 3 points, averages out touch error for more
+    """
+    if len(points) < 3:
+        raise ValueError("need at least 3 calibration points")
+
+    # Normal equations (A^T A) p = A^T t with rows A = [x, y, 1]; raw
+    # values are centred first to keep the sums well conditioned
+    n = len(points)
+    mx = sum(p[0] for p in points) / n
+    my = sum(p[1] for p in points) / n
+    sxx = sxy = syy = sx = sy = 0.0
+    bx = [0.0, 0.0, 0.0]
+    by = [0.0, 0.0, 0.0]
+    for rx, ry, tx, ty in points:
+        x, y = rx - mx, ry - my
+        sxx += x * x
+        sxy += x * y
+        syy += y * y
+        sx += x
+        sy += y
+        for i, a in enumerate((x, y, 1.0)):
+            bx[i] += a * tx
+            by[i] += a * ty
+    ata = [[sxx, sxy, sx], [sxy, syy, sy], [sx, sy, float(n)]]
+    a, b, c = _solve3(ata, bx)
+    d, e, f = _solve3(ata, by)
+
+    # Undo the centring: x' = a*(x - mx) + b*(y - my) + c
+    return AffineCalibration(a, b, c - a * mx - b * my, d, e, f - d * mx - e * my, size)
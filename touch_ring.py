@@ -0,0 +1,187 @@
+"""
+Interrupt-driven touch acquisition for the ICNT86 (MicroPython)
+The touch interrupt schedules one read of the controller's point block;
+the points go into a preallocated ring buffer that the main loop drains
+in batches, so no samples are lost between loop iterations.
+"""
+from array import array
+import micropython
+import utime
+
+
+MAX_POINTS = 5          # Contacts the ICNT86 reports at once
+POINT_BYTES = 7
+NO_CONTACT = 0xFF       # id of the marker pushed for a report with no contacts
+RELEASE_TIMEOUT_MS = 120  # Contacts not reported for this long have lifted
+
+DOWN, MOVE, UP = 0, 1, 2
+
+
+class TouchRing:
+    """
+    Fixed-size ring of touch samples (x, y, pressure, id, ticks_ms, report)
+    `report` numbers the controller reads, so points reported together stay
+    together. When full, the oldest samples are overwritten (`dropped`).
+    """
+
+    def __init__(self, capacity=128):
+        self.capacity = capacity
+        self.x = array('h', [0] * capacity)
+        self.y = array('h', [0] * capacity)
+        self.p = array('B', [0] * capacity)
+        self.id = array('B', [0] * capacity)
+        self.t = array('I', [0] * capacity)
+        self.report = array('H', [0] * capacity)
+        self.head = 0   # next write
+        self.count = 0
+        self.dropped = 0
+
+    def push(self, x, y, p, id, t, report):
+        i = self.head
+        self.x[i] = x
+        self.y[i] = y
+        self.p[i] = p
+        self.id[i] = id
+        self.t[i] = t
+        self.report[i] = report & 0xFFFF
+        self.head = (i + 1) % self.capacity
+        if self.count == self.capacity:
+            self.dropped += 1
+        else:
+            self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def drain(self, max_samples=None):
+        """Oldest samples first, as (x, y, p, id, t, report) tuples"""
+        n = self.count if max_samples is None else min(self.count, max_samples)
+        start = (self.head - self.count) % self.capacity
+        out = []
+        for k in range(n):
+            i = (start + k) % self.capacity
+            out.append((self.x[i], self.y[i], self.p[i], self.id[i], self.t[i], self.report[i]))
+        self.count -= n
+        return out
+
+
+class TouchReader:
+    """
+    Reads the ICNT86 point block when its interrupt fires
+    tp: the ICNT86; calibrate: function (raw_x, raw_y) -> (x, y), or None to
+    store raw controller coordinates (default tp.calibrate_touch).
+    """
+
+    def __init__(self, tp, ring=None, calibrate=True):
+        self.tp = tp
+        self.i2c = tp.config.i2c
+        self.addr = tp.config.address
+        self.ring = ring or TouchRing()
+        self.calibrate = tp.calibrate_touch if calibrate is True else calibrate
+        self.reports = 0
+        self.overruns = 0  # interrupts that could not be scheduled
+
+        # Preallocated so neither the interrupt nor the read allocates
+        self._reg_count = bytearray([0x10, 0x01])
+        self._reg_points = bytearray([0x10, 0x02])
+        self._ack = bytearray([0x10, 0x01, 0x00])
+        self._count = bytearray(1)
+        self._block = bytearray(MAX_POINTS * POINT_BYTES)
+        self._pending = False
+        self._irq_time = 0
+        self._read_ref = self.read  # bound once; creating it in the IRQ would allocate
+
+    def start(self):
+        self.tp.config.int_pin.irq(trigger=self.tp.config.int_pin.IRQ_FALLING, handler=self.irq)
+
+    def stop(self):
+        self.tp.config.int_pin.irq(handler=None)
+
+    def irq(self, pin):
+        self._irq_time = utime.ticks_ms()
+        if self._pending:
+            return  # the scheduled read will pick up the latest points
+        self._pending = True
+        try:
+            micropython.schedule(self._read_ref, 0)
+        except RuntimeError:  # schedule queue full
+            self._pending = False
+            self.overruns += 1
+
+    def read(self, _=None):
+        """Read one report into the ring (runs from micropython.schedule)"""
+        self._pending = False
+        i2c, addr = self.i2c, self.addr
+        i2c.writeto(addr, self._reg_count)
+        i2c.readfrom_into(addr, self._count)
+        n = self._count[0]
+        t = self._irq_time
+        self.reports += 1
+        if n == 0 or n > MAX_POINTS:
+            i2c.writeto(addr, self._ack)
+            self.ring.push(0, 0, 0, NO_CONTACT, t, self.reports)
+            return
+
+        block = memoryview(self._block)[:n * POINT_BYTES]
+        i2c.writeto(addr, self._reg_points)
+        i2c.readfrom_into(addr, block)
+        i2c.writeto(addr, self._ack)
+
+        buf = self._block
+        for k in range(n):
+            o = k * POINT_BYTES
+            raw_y = (buf[o + 2] << 8) | buf[o + 1]
+            raw_x = (buf[o + 4] << 8) | buf[o + 3]
+            if self.calibrate:
+                x, y = self.calibrate(raw_x, raw_y)
+            else:
+                x, y = raw_x, raw_y
+            self.ring.push(x, y, buf[o + 5], buf[o], t, self.reports)
+
+
+class TouchTracker:
+    """
+    Turns drained samples into DOWN / MOVE / UP events per contact id
+    Each report lists every contact still down; a contact missing from a
+    report, or not reported for RELEASE_TIMEOUT_MS, has lifted.
+    """
+
+    def __init__(self, release_timeout_ms=RELEASE_TIMEOUT_MS):
+        self.release_timeout_ms = release_timeout_ms
+        self.contacts = {}  # id -> [x, y, p, t]
+        self.last_report = None
+
+    def _end_report(self, seen, t, events):
+        for cid in [c for c in self.contacts if c not in seen]:
+            x, y, p, _ = self.contacts.pop(cid)
+            events.append((UP, cid, x, y, p, t))
+
+    def update(self, samples, now=None):
+        """Events (kind, id, x, y, p, t) for a batch from TouchRing.drain()"""
+        events = []
+        report = None
+        seen = set()
+        t = None
+        for x, y, p, cid, st, rep in samples:
+            if rep != report:
+                if report is not None:
+                    self._end_report(seen, t, events)
+                report = rep
+                seen = set()
+                self.last_report = st
+            t = st
+            if cid == NO_CONTACT:
+                continue
+            seen.add(cid)
+            kind = MOVE if cid in self.contacts else DOWN
+            self.contacts[cid] = [x, y, p, t]
+            events.append((kind, cid, x, y, p, t))
+        if report is not None:
+            self._end_report(seen, t, events)
+
+        # Controllers do not always report the last lift
+        now = utime.ticks_ms() if now is None else now
+        if self.contacts and self.last_report is not None and \
+                utime.ticks_diff(now, self.last_report) > self.release_timeout_ms:
+            self._end_report((), now, events)
+        return events
@@ -4,6 +4,7 @@ UI Components for ABook application
 import pygame
 from datetime import datetime
 from config import *
+from text_cache import render_text
 
 
 def draw_status_bar(screen, font_s):
@@ -14,7 +15,7 @@ def draw_status_bar(screen, font_s):
     
     # Time - CENTERED in portrait width
     time_str = datetime.now().strftime("%H:%M")
-    time_surface = font_s.render(time_str, True, COLOR_BLACK)
+    time_surface = render_text(font_s, time_str, True, COLOR_BLACK)
     time_x = (bar_width - time_surface.get_width()) // 2  # Center properly
     screen.blit(time_surface, (time_x, 4))
     
@@ -81,7 +82,7 @@ class OnScreenKeyboard:
                 
                 # Draw key text
                 text_color = COLOR_WHITE if key == 'Done' else COLOR_BLACK
-                txt = self.font.render(key, True, text_color)
+                txt = render_text(self.font, key, True, text_color)
                 screen.blit(
                     txt,
                     (rect.centerx - txt.get_width() // 2,
@@ -0,0 +1,173 @@
+"""
+Word completion for ABook
+Frequency-weighted prefix completion over a sorted word index
+"""
+import os
+import re
+from bisect import bisect_left
+from heapq import nlargest
+from config import LEARNED_WORDS_FILE
+
+try:
+    from spellchecker import SpellChecker
+    SPELLCHECK_AVAILABLE = True
+except ImportError:
+    SPELLCHECK_AVAILABLE = False
+
+
+# Used when pyspellchecker is not installed
+FALLBACK_WORDS = [
+    'hello', 'world', 'python', 'programming', 'computer',
+    'notebook', 'drawing', 'writing', 'learning', 'education',
+    'science', 'mathematics', 'history', 'geography', 'literature',
+    'note', 'book', 'write', 'draw', 'learn', 'read', 'think', 'create'
+]
+
+# Words the user wrote themselves rank above dictionary words of similar frequency
+USER_WORD_BOOST = 1000
+
+WORD_PATTERN = re.compile(r"[a-zA-Z][a-zA-Z']*")
+
+
+class WordCompleter:
+    """
+    Prefix completion index
+    Words are kept in a sorted list so a prefix maps to one contiguous
+    slice (two bisects). The top-k of each queried prefix is memoized and
+    only the prefixes of a newly learned word are invalidated.
+    """
+
+    def __init__(self, vocabulary=None, max_cached_prefixes=4096, learned_file=None):
+        """
+        Args:
+            vocabulary: dict of word -> frequency. Defaults to the
+                        spellchecker dictionary (or a small fallback list)
+            learned_file: text file the learned words are kept in (one per
+                          line), so they survive a restart
+        """
+        if vocabulary is None:
+            vocabulary = self._load_vocabulary()
+
+        self.words = sorted(w for w in vocabulary if w)
+        self.freqs = [vocabulary[w] for w in self.words]
+
+        # Words the user already wrote (boosted once each)
+        self.learned = set()
+        self.learned_file = learned_file
+
+        # prefix -> list of completions (best first)
+        self._cache = {}
+        self.max_cached_prefixes = max_cached_prefixes
+        self.max_k = 10
+
+        for word in self._load_learned():
+            self._learn(word, USER_WORD_BOOST)
+
+    def _load_vocabulary(self):
+        """Load word frequencies from the spellchecker, or the fallback list"""
+        if SPELLCHECK_AVAILABLE:
+            try:
+                spell = SpellChecker()
+                return dict(spell.word_frequency.dictionary.items())
+            except Exception as e:
+                print(f"[Completion] Could not load spellchecker vocabulary: {e}")
+        return {w: 1 for w in FALLBACK_WORDS}
+
+    def _load_learned(self):
+        """Words learned in earlier sessions"""
+        if not self.learned_file or not os.path.exists(self.learned_file):
+            return []
+        try:
+            with open(self.learned_file, encoding='utf-8') as f:
+                return f.read().split()
+        except OSError as e:
+            print(f"[Completion] Could not read {self.learned_file}: {e}")
+            return []
+
+    def _save_learned(self, words):
+        """Append newly learned words to the learned file"""
+        if not self.learned_file or not words:
+            return
+        try:
+            with open(self.learned_file, 'a', encoding='utf-8') as f:
+                f.write(''.join(w + '\n' for w in words))
+        except OSError as e:
+            print(f"[Completion] Could not save learned words: {e}")
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        word = word.lower()
+        i = bisect_left(self.words, word)
+        return i < len(self.words) and self.words[i] == word
+
+    def complete(self, prefix, k=5):
+        """
+        Get the k most frequent words starting with prefix
+
+        Returns:
+            List of words, most frequent first
+        """
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+
+        cached = self._cache.get(prefix)
+        if cached is None:
+            lo = bisect_left(self.words, prefix)
+            hi = bisect_left(self.words, prefix + '\uffff', lo)
+            best = nlargest(self.max_k, range(lo, hi), key=self.freqs.__getitem__)
+            cached = [self.words[i] for i in best]
+
+            if len(self._cache) >= self.max_cached_prefixes:
+                self._cache.clear()
+            self._cache[prefix] = cached
+
+        return cached[:k]
+
+    def add_word(self, word, weight=USER_WORD_BOOST):
+        """Learn a word (or boost a known one); each word is boosted only once"""
+        word = word.lower()
+        if self._learn(word, weight):
+            self._save_learned([word])
+
+    def _learn(self, word, weight):
+        """Add a lower-case word to the index; False if it was already learned"""
+        if len(word) < 2 or word in self.learned:
+            return False
+        self.learned.add(word)
+
+        i = bisect_left(self.words, word)
+        if i < len(self.words) and self.words[i] == word:
+            self.freqs[i] += weight
+        else:
+            self.words.insert(i, word)
+            self.freqs.insert(i, weight)
+
+        # Only completions for this word's own prefixes can change
+        for end in range(1, len(word) + 1):
+            self._cache.pop(word[:end], None)
+        return True
+
+    def add_text(self, text):
+        """Learn every word in a block of text (e.g. OCR output)"""
+        if not text or text.startswith('['):
+            # Skip OCR placeholder / error messages
+            return 0
+
+        words = WORD_PATTERN.findall(text)
+        self._save_learned([w for w in map(str.lower, words) if self._learn(w, USER_WORD_BOOST)])
+        return len(words)
+
+
+# Singleton instance
+_completer = None
+
+def get_word_completer():
+    """Get or create the shared completion index"""
+    global _completer
+    if _completer is None:
+        _completer = WordCompleter(learned_file=LEARNED_WORDS_FILE)
+        print(f"[Completion] Indexed {len(_completer)} words ({len(_completer.learned)} learned)")
+    return _completer
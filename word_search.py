@@ -1,8 +1,11 @@
 """
 Dictionary and word search functionality
 """
-import requests
 import json
+from startup import lazy_import
+
+# Imported on the first dictionary lookup
+requests = lazy_import('requests')
 
 
 class WordSearcher:
@@ -96,22 +99,13 @@ class WordSearcher:
             'antonyms': list(set(antonyms))[:5]
         }
     
-    def get_suggestions(self, partial_word):
+    def get_suggestions(self, partial_word, k=5):
         """
-        Get word suggestions (simple implementation)
-        In a full app, this would use a proper word suggestion API
+        Get word completions for a partial word
+        Uses the shared frequency-ranked completion index
         """
-        # This is a simple placeholder
-        # In production, you'd use a proper spell-check/autocomplete API
-        common_words = [
-            'hello', 'world', 'python', 'programming', 'computer',
-            'notebook', 'drawing', 'writing', 'learning', 'education',
-            'science', 'mathematics', 'history', 'geography', 'literature'
-        ]
-        
-        partial = partial_word.lower()
-        suggestions = [w for w in common_words if w.startswith(partial)]
-        return suggestions[:5]
+        from word_completion import get_word_completer
+        return get_word_completer().complete(partial_word, k)
 
 
 class OfflineDictionary: